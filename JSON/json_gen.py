@@ -1,21 +1,25 @@
 import csv
+import hashlib
+import io
 import json
+import os
+import urllib.error
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 
 NASDAQ_URL = "https://www.nasdaqtrader.com/dynamic/symdir/nasdaqlisted.txt"
 OTHER_URL  = "https://www.nasdaqtrader.com/dynamic/symdir/otherlisted.txt"
 
+# ETag / Last-Modified of the last download of each URL, for conditional requests
+STATE_PATH = "symdir_state.json"
 
-def download_text(url: str) -> str:
-    with urllib.request.urlopen(url) as resp:
-        return resp.read().decode("utf-8", errors="replace")
 
-
-def parse_pipe_delimited(text: str):
-    lines = [ln for ln in text.splitlines() if ln.strip()]
-    lines = [ln for ln in lines if not ln.startswith("File Creation Time:")]
-    reader = csv.DictReader(lines, delimiter="|")
-    return list(reader)
+def parse_pipe_delimited(text):
+    """Yield one dict per row; `text` may be a string or any iterable of lines (e.g. a response stream)."""
+    lines = text.splitlines() if isinstance(text, str) else text
+    lines = (ln for ln in lines if ln.strip())
+    lines = (ln for ln in lines if not ln.startswith("File Creation Time:"))
+    yield from csv.DictReader(lines, delimiter="|")
 
 
 def is_common_stock(name: str) -> bool:
@@ -46,52 +50,153 @@ def clean_security_name(name: str) -> str:
     return out
 
 
-def main():
-    nasdaq_text = download_text(NASDAQ_URL)
-    other_text  = download_text(OTHER_URL)
-
-    nasdaq_rows = parse_pipe_delimited(nasdaq_text)
-    other_rows  = parse_pipe_delimited(other_text)
-
-    # ------------------------
-    # NASDAQ – common stocks + ETFs
-    # ------------------------
-    nasdaq_securities = [
+# ------------------------
+# NASDAQ – common stocks + ETFs
+# ------------------------
+def build_nasdaq(rows) -> list[dict]:
+    return [
         {
             "ticker": r["Symbol"].strip(),
             "name": clean_security_name(r.get("Security Name", "")),
             "exchange": "NASDAQ",
             "asset_type": "ETF" if is_etf_row(r) else "STOCK",
         }
-        for r in nasdaq_rows
+        for r in rows
         if r.get("Test Issue") == "N"
         and (is_common_stock(r.get("Security Name", "")) or is_etf_row(r))
     ]
 
-    # ------------------------
-    # NYSE – common stocks + ETFs
-    # ------------------------
-    nyse_securities = [
+
+# ------------------------
+# NYSE – common stocks + ETFs
+# ------------------------
+def build_nyse(rows) -> list[dict]:
+    return [
         {
             "ticker": r["ACT Symbol"].strip(),
             "name": clean_security_name(r.get("Security Name", "")),
             "exchange": "NYSE",
             "asset_type": "ETF" if is_etf_row(r) else "STOCK",
         }
-        for r in other_rows
+        for r in rows
         if r.get("Test Issue") == "N"
         and r.get("Exchange") == "N"
         and (is_common_stock(r.get("Security Name", "")) or is_etf_row(r))
     ]
 
-    with open("nasdaq.json", "w", encoding="utf-8") as f:
-        json.dump(nasdaq_securities, f, indent=2)
 
-    with open("nyse.json", "w", encoding="utf-8") as f:
-        json.dump(nyse_securities, f, indent=2)
+# ------------------------
+# Conditional download + write-if-changed
+# ------------------------
+def fetch_securities(url: str, build, validators: dict, timeout: float = 60):
+    """
+    Download `url` and build securities from it as the response streams in.
+
+    Sends If-None-Match / If-Modified-Since from `validators`. Returns
+    (securities, new_validators), or (None, validators) if the server
+    answered 304 Not Modified.
+    """
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as resp:
+            lines = io.TextIOWrapper(resp, encoding="utf-8", errors="replace", newline="")
+            securities = build(parse_pipe_delimited(lines))
+            new_validators = {
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+            }
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return None, validators
+        raise
+    return securities, {k: v for k, v in new_validators.items() if v}
+
+
+def write_if_changed(path: str, securities: list[dict]) -> bool:
+    """Write securities as JSON unless the file already has identical content. Returns True if written."""
+    content = json.dumps(securities, indent=2).encode("utf-8")
+    try:
+        with open(path, "rb") as f:
+            if hashlib.sha256(f.read()).digest() == hashlib.sha256(content).digest():
+                return False
+    except OSError:
+        pass
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+    return True
+
+
+def _load_state(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(path: str, state: dict) -> None:
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Failed to save {path}: {e}")
+
+
+def refresh(
+    nasdaq_url: str = NASDAQ_URL,
+    other_url: str = OTHER_URL,
+    out_dir: str = ".",
+    state_path: str = STATE_PATH,
+) -> dict:
+    """
+    Download both symbol directories concurrently and regenerate nasdaq.json /
+    nyse.json in out_dir. Unchanged files (304, or identical content) are not
+    rewritten. Returns {file name: {"status": ..., "count": ...}}.
+    """
+    state = _load_state(state_path)
+    jobs = [
+        (nasdaq_url, build_nasdaq, "nasdaq.json"),
+        (other_url, build_nyse, "nyse.json"),
+    ]
 
-    print(f"NASDAQ stocks+ETFs: {len(nasdaq_securities)}")
-    print(f"NYSE stocks+ETFs:   {len(nyse_securities)}")
+    def run(job):
+        url, build, name = job
+        path = os.path.join(out_dir, name)
+        # Without the output on disk a 304 would leave nothing to keep, so download unconditionally.
+        validators = state.get(url, {}) if os.path.exists(path) else {}
+        securities, validators = fetch_securities(url, build, validators)
+        if securities is None:
+            return url, validators, name, {"status": "not modified", "count": None}
+        written = write_if_changed(path, securities)
+        return url, validators, name, {"status": "updated" if written else "unchanged", "count": len(securities)}
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+        for url, validators, name, result in pool.map(run, jobs):
+            state[url] = validators
+            results[name] = result
+
+    _save_state(state_path, state)
+    return results
+
+
+def main():
+    results = refresh()
+    for name, label in (("nasdaq.json", "NASDAQ"), ("nyse.json", "NYSE")):
+        result = results[name]
+        count = result["count"] if result["count"] is not None else "-"
+        print(f"{label + ' stocks+ETFs:':<20}{count} ({result['status']})")
 
 
 if __name__ == "__main__":
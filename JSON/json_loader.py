@@ -1,20 +1,36 @@
+import hashlib
 import json
 import os
 import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from dotenv import load_dotenv
-from supabase import create_client
 
 load_dotenv()
 
 
-SUPABASE_URL = os.environ["SUPABASE_URL"]
-SUPABASE_KEY = os.environ["SUPABASE_PUBLISHABLE_KEY"]
+_supabase = None
+
+
+def get_supabase():
+    # Created on first use so the diff helpers work without credentials or the supabase package.
+    global _supabase
+    if _supabase is None:
+        from supabase import create_client
+        _supabase = create_client(os.environ["SUPABASE_URL"], os.environ["SUPABASE_PUBLISHABLE_KEY"])
+    return _supabase
 
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
 
 EXCLUDE_TICKER_RE = re.compile(r"\.(W|WS|WT|WTS|RT|R|U)$", re.IGNORECASE)
 
+LISTING_FIELDS = ("ticker", "exchange", "name", "asset_type")
+
+# Delta mode stamps delisted tickers here; the stocks table needs a nullable
+# timestamptz column of this name (NULL = listed).
+DELISTED_COLUMN = "delisted_at"
+
 def is_excluded_ticker(ticker: str) -> bool:
     return bool(EXCLUDE_TICKER_RE.search(ticker or ""))
 
@@ -22,15 +38,11 @@ def chunk_list(items, size=1000):
     for i in range(0, len(items), size):
         yield items[i:i + size]
 
-def upload_json_file(json_path: str, table_name: str = "stocks", batch_size: int = 1000):
-    with open(json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    now_iso = datetime.now(timezone.utc).isoformat()
-
+def prepare_listings(data) -> list[dict]:
+    """Keep well-formed, non-excluded listings, reduced to LISTING_FIELDS."""
     rows = []
     for item in data:
-        if not all(k in item for k in ("ticker", "exchange", "name", "asset_type")):
+        if not all(k in item for k in LISTING_FIELDS):
             continue
 
         ticker = str(item["ticker"]).strip()
@@ -42,31 +54,302 @@ def upload_json_file(json_path: str, table_name: str = "stocks", batch_size: int
             "exchange": str(item["exchange"]).strip(),
             "name": str(item["name"]).strip(),
             "asset_type": str(item["asset_type"]).strip(),
-            "price": 0,
-            "last_updated": now_iso,
         })
+    return rows
+
+# ------------------------
+# Parallel batch upload
+# ------------------------
+def checkpoint_path_for(json_path: str) -> str:
+    return f"{os.path.splitext(json_path)[0]}.checkpoint.json"
+
+def rows_fingerprint(rows: list[dict]) -> str:
+    return hashlib.sha256(json.dumps(rows, sort_keys=True).encode("utf-8")).hexdigest()
+
+def load_checkpoint(path: str, fingerprint: str, batch_size: int) -> set:
+    """Start offsets of batches already uploaded for these exact rows, or an empty set."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return set()
+    if checkpoint.get("fingerprint") != fingerprint or checkpoint.get("batch_size") != batch_size:
+        return set()
+    return {
+        offset
+        for start, end in checkpoint.get("done", [])
+        for offset in range(start, end, batch_size)
+    }
+
+def save_checkpoint(path: str, fingerprint: str, batch_size: int, done: set, total: int) -> None:
+    # Completed batches are stored as merged [start, end) row ranges.
+    ranges = []
+    for offset in sorted(done):
+        end = min(offset + batch_size, total)
+        if ranges and ranges[-1][1] == offset:
+            ranges[-1][1] = end
+        else:
+            ranges.append([offset, end])
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"fingerprint": fingerprint, "batch_size": batch_size, "done": ranges}, f)
+    os.replace(tmp_path, path)
+
+def upload_batches(
+    rows: list[dict],
+    table_name: str = "stocks",
+    batch_size: int = 1000,
+    concurrency: int = 4,
+    retries: int = 3,
+    backoff: float = 0.5,
+    checkpoint_path: str = None,
+    fingerprint: str = None,
+    client=None,
+) -> dict:
+    """
+    Upsert rows in batches with up to `concurrency` batches in flight. A failed
+    batch is retried `retries` times, waiting backoff * 2**attempt seconds in
+    between. With a checkpoint_path, completed batches are recorded so a
+    re-run with the same rows (same fingerprint) skips them; the checkpoint is
+    removed once everything is uploaded.
+
+    Raises RuntimeError naming the failed batches if any still fail after
+    retrying. Returns a summary with rows/sec throughput.
+    """
+    client = client or get_supabase()
+    fingerprint = fingerprint or rows_fingerprint(rows)
+    done = load_checkpoint(checkpoint_path, fingerprint, batch_size) if checkpoint_path else set()
+    pending = [offset for offset in range(0, len(rows), batch_size) if offset not in done]
+    if done:
+        print(f"Resuming: {len(done)} batches already uploaded, {len(pending)} to go")
+
+    def upload(offset: int) -> int:
+        batch = rows[offset:offset + batch_size]
+        for attempt in range(retries + 1):
+            try:
+                client.table(table_name).upsert(batch, on_conflict="ticker").execute()
+                return len(batch)
+            except Exception as e:
+                if attempt == retries:
+                    raise
+                delay = backoff * (2 ** attempt)
+                print(f"Batch at row {offset} failed ({e}); retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    started = time.perf_counter()
+    uploaded = 0
+    failed = {}
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = {pool.submit(upload, offset): offset for offset in pending}
+        for future in as_completed(futures):
+            offset = futures[future]
+            idx = offset // batch_size + 1
+            try:
+                count = future.result()
+            except Exception as e:
+                failed[idx] = e
+                print(f"Batch {idx} failed after {retries} retries: {e}")
+                continue
+            uploaded += count
+            done.add(offset)
+            if checkpoint_path:
+                save_checkpoint(checkpoint_path, fingerprint, batch_size, done, len(rows))
+            print(f"Uploaded batch {idx} ({count} rows)")
+
+    elapsed = time.perf_counter() - started
+    summary = {
+        "rows": uploaded,
+        "batches": len(pending) - len(failed),
+        "skipped_batches": len(range(0, len(rows), batch_size)) - len(pending),
+        "seconds": round(elapsed, 3),
+        "rows_per_sec": round(uploaded / elapsed, 1) if elapsed > 0 else float(uploaded),
+    }
+    print(f"{summary['rows']} rows in {summary['seconds']}s ({summary['rows_per_sec']} rows/sec)")
+
+    if failed:
+        first = next(iter(failed.values()))
+        raise RuntimeError(
+            f"Upload failed for batches {sorted(failed)}; re-run to resume from the checkpoint"
+        ) from first
+    if checkpoint_path and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    return summary
+
+def upload_json_file(
+    json_path: str,
+    table_name: str = "stocks",
+    batch_size: int = 1000,
+    concurrency: int = 4,
+    retries: int = 3,
+    checkpoint_path: str = None,
+    client=None,
+) -> dict:
+    with open(json_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    listings = prepare_listings(data)
+    now_iso = datetime.now(timezone.utc).isoformat()
+    rows = [dict(row, price=0, last_updated=now_iso) for row in listings]
 
     print(f"Prepared {len(rows)} rows from {json_path}")
 
-    for idx, batch in enumerate(chunk_list(rows, batch_size), start=1):
-        try:
+    # The fingerprint ignores last_updated so an interrupted load can resume later.
+    summary = upload_batches(
+        rows,
+        table_name=table_name,
+        batch_size=batch_size,
+        concurrency=concurrency,
+        retries=retries,
+        checkpoint_path=checkpoint_path or checkpoint_path_for(json_path),
+        fingerprint=rows_fingerprint(listings),
+        client=client,
+    )
+
+    print(f"✅ Finished uploading {json_path}\n")
+    return summary
+
+# ------------------------
+# Delta mode
+# ------------------------
+def snapshot_path_for(json_path: str) -> str:
+    return f"{os.path.splitext(json_path)[0]}.snapshot.json"
+
+def load_snapshot(path: str):
+    """Listings from the last successful delta upload, or None if there is no snapshot."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_snapshot(path: str, rows: list[dict]) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(rows, f, indent=2)
+    os.replace(tmp_path, path)
+
+def fetch_table_listings(client, table_name: str, exchanges, page_size: int = 1000) -> list[dict]:
+    """Currently listed rows of table_name for the given exchanges, read page by page."""
+    rows = []
+    for exchange in sorted(exchanges):
+        start = 0
+        while True:
             resp = (
-                supabase
-                .table(table_name)
-                .upsert(batch, on_conflict="ticker")
+                client.table(table_name)
+                .select(",".join(LISTING_FIELDS))
+                .eq("exchange", exchange)
+                .is_(DELISTED_COLUMN, "null")
+                .range(start, start + page_size - 1)
                 .execute()
             )
+            page = resp.data or []
+            rows.extend(page)
+            if len(page) < page_size:
+                break
+            start += page_size
+    return rows
+
+def diff_listings(previous: list[dict], current: list[dict]) -> dict:
+    """
+    Compare two listing snapshots by (ticker, exchange).
+    Returns {"added": [...], "changed": [...], "delisted": [...], "unchanged": count}.
+    """
+    def key(row):
+        return row["ticker"], row["exchange"]
+
+    before = {key(r): r for r in previous}
+    after = {key(r): r for r in current}
+
+    added, changed = [], []
+    unchanged = 0
+    for k, row in after.items():
+        old = before.get(k)
+        if old is None:
+            added.append(row)
+        elif any(old.get(f) != row[f] for f in LISTING_FIELDS):
+            changed.append(row)
+        else:
+            unchanged += 1
+    delisted = [row for k, row in before.items() if k not in after]
+    return {"added": added, "changed": changed, "delisted": delisted, "unchanged": unchanged}
+
+def upload_json_delta(
+    json_path: str,
+    table_name: str = "stocks",
+    batch_size: int = 1000,
+    snapshot_path: str = None,
+    client=None,
+) -> dict:
+    """
+    Upsert only listings that were added or changed since the previous
+    snapshot (or, without one, since the table's current contents), and stamp
+    DELISTED_COLUMN on tickers that disappeared. New listings get price 0,
+    as in the full upload; changed listings keep their price. Returns counts
+    of added / changed / delisted / unchanged rows.
+    """
+    client = client or get_supabase()
+    snapshot_path = snapshot_path or snapshot_path_for(json_path)
+
+    with open(json_path, "r", encoding="utf-8") as f:
+        current = prepare_listings(json.load(f))
+
+    previous = load_snapshot(snapshot_path)
+    if previous is None:
+        exchanges = {row["exchange"] for row in current}
+        print(f"No snapshot at {snapshot_path}; diffing against {table_name}")
+        previous = fetch_table_listings(client, table_name, exchanges, batch_size)
+
+    diff = diff_listings(previous, current)
+
+    # Added and changed rows go in separate batches: rows in one upsert must share
+    # columns, and changed rows must not carry price.
+    added = [dict(row, price=0, **{DELISTED_COLUMN: None}) for row in diff["added"]]
+    changed = [dict(row, **{DELISTED_COLUMN: None}) for row in diff["changed"]]
+    batches = list(chunk_list(added, batch_size)) + list(chunk_list(changed, batch_size))
+    for idx, batch in enumerate(batches, start=1):
+        try:
+            client.table(table_name).upsert(batch, on_conflict="ticker").execute()
         except Exception as e:
-            raise RuntimeError(f"Upload failed (batch {idx}) from {json_path}: {e}") from e
+            raise RuntimeError(f"Delta upsert failed (batch {idx}) from {json_path}: {e}") from e
 
-        returned = len(resp.data) if getattr(resp, "data", None) is not None else "unknown"
-        print(f"Uploaded batch {idx} ({len(batch)} rows) | returned {returned}")
+    now_iso = datetime.now(timezone.utc).isoformat()
+    delisted_by_exchange = {}
+    for row in diff["delisted"]:
+        delisted_by_exchange.setdefault(row["exchange"], []).append(row["ticker"])
+    for exchange, tickers in delisted_by_exchange.items():
+        for batch in chunk_list(tickers, batch_size):
+            try:
+                (
+                    client.table(table_name)
+                    .update({DELISTED_COLUMN: now_iso})
+                    .eq("exchange", exchange)
+                    .in_("ticker", batch)
+                    .execute()
+                )
+            except Exception as e:
+                raise RuntimeError(f"Marking delisted tickers failed for {json_path}: {e}") from e
 
-    print(f"✅ Finished uploading {json_path}\n")
+    save_snapshot(snapshot_path, current)
+
+    counts = {
+        "added": len(diff["added"]),
+        "changed": len(diff["changed"]),
+        "delisted": len(diff["delisted"]),
+        "unchanged": diff["unchanged"],
+    }
+    print(
+        f"✅ {json_path}: {counts['added']} added, {counts['changed']} changed, "
+        f"{counts['delisted']} delisted, {counts['unchanged']} unchanged\n"
+    )
+    return counts
 
 def main():
+    if "--delta" in sys.argv[1:]:
+        upload_json_delta("nasdaq.json")
+        upload_json_delta("nyse.json")
+        return
     upload_json_file("nasdaq.json")
     upload_json_file("nyse.json")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,150 @@
+"""
+Tests for json_gen.py, run against a local HTTP stand-in for nasdaqtrader.com.
+
+Run:
+    python -m pytest JSON/test_json_gen.py -v
+"""
+
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import json_gen
+
+
+NASDAQ_TXT = (
+    "Symbol|Security Name|Market Category|Test Issue|Financial Status|Round Lot Size|ETF|NextShares\r\n"
+    "AAPL|Apple Inc. - Common Stock|Q|N|N|100|N|N\r\n"
+    "QQQ|Invesco QQQ Trust, Series 1|G|N|N|100|Y|N\r\n"
+    "ZXZZT|NASDAQ TEST STOCK - Common Stock|G|Y|N|100|N|N\r\n"
+    "AAPLW|Apple Warrant|Q|N|N|100|N|N\r\n"
+    "File Creation Time: 0305202612:00||||||\r\n"
+)
+
+OTHER_TXT = (
+    "ACT Symbol|Security Name|Exchange|CQS Symbol|ETF|Round Lot Size|Test Issue|NASDAQ Symbol\r\n"
+    "IBM|International Business Machines Corporation Common Stock|N|IBM|N|100|N|IBM\r\n"
+    "SPY|SPDR S&P 500 ETF Trust|P|SPY|Y|100|N|SPY\r\n"
+    "KO|Coca-Cola Company (The) Common Stock|N|KO|N|100|N|KO\r\n"
+    "File Creation Time: 0305202612:00||||||||\r\n"
+)
+
+
+class StandIn:
+    """Serves the two symbol files with ETag / Last-Modified support."""
+
+    def __init__(self):
+        self.files = {"/nasdaqlisted.txt": NASDAQ_TXT, "/otherlisted.txt": OTHER_TXT}
+        self.etags = {path: '"v1"' for path in self.files}
+        self.delay = 0.0
+        self.requests = []
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stand_in.requests.append((self.path, self.headers.get("If-None-Match")))
+                time.sleep(stand_in.delay)
+                etag = stand_in.etags[self.path]
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                body = stand_in.files[self.path].encode()
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", "Thu, 05 Mar 2026 12:00:00 GMT")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stand_in():
+    s = StandIn()
+    yield s
+    s.close()
+
+
+@pytest.fixture
+def refresh(stand_in, tmp_path):
+    def run():
+        return json_gen.refresh(
+            nasdaq_url=f"{stand_in.base}/nasdaqlisted.txt",
+            other_url=f"{stand_in.base}/otherlisted.txt",
+            out_dir=str(tmp_path),
+            state_path=str(tmp_path / "state.json"),
+        )
+    return run
+
+
+def _load(tmp_path, name):
+    with open(tmp_path / name, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_first_run_writes_filtered_listings(refresh, tmp_path):
+    results = refresh()
+    assert results["nasdaq.json"] == {"status": "updated", "count": 2}
+    assert results["nyse.json"] == {"status": "updated", "count": 2}
+    assert _load(tmp_path, "nasdaq.json") == [
+        {"ticker": "AAPL", "name": "Apple Inc.", "exchange": "NASDAQ", "asset_type": "STOCK"},
+        {"ticker": "QQQ", "name": "Invesco QQQ Trust, Series 1", "exchange": "NASDAQ", "asset_type": "ETF"},
+    ]
+    assert [s["ticker"] for s in _load(tmp_path, "nyse.json")] == ["IBM", "KO"]
+
+
+def test_unchanged_files_answered_with_304(refresh, stand_in, tmp_path):
+    refresh()
+    mtime = os.path.getmtime(tmp_path / "nasdaq.json")
+    stand_in.requests.clear()
+    results = refresh()
+    assert {r["status"] for r in results.values()} == {"not modified"}
+    assert sorted(stand_in.requests) == [("/nasdaqlisted.txt", '"v1"'), ("/otherlisted.txt", '"v1"')]
+    assert os.path.getmtime(tmp_path / "nasdaq.json") == mtime
+
+
+def test_same_content_new_etag_not_rewritten(refresh, stand_in, tmp_path):
+    refresh()
+    mtime = os.path.getmtime(tmp_path / "nyse.json")
+    stand_in.etags["/otherlisted.txt"] = '"v2"'
+    results = refresh()
+    assert results["nyse.json"]["status"] == "unchanged"
+    assert os.path.getmtime(tmp_path / "nyse.json") == mtime
+
+
+def test_only_changed_output_rewritten(refresh, stand_in, tmp_path):
+    refresh()
+    stand_in.files["/nasdaqlisted.txt"] = NASDAQ_TXT.replace("AAPL|", "MSFT|", 1)
+    stand_in.etags["/nasdaqlisted.txt"] = '"v2"'
+    results = refresh()
+    assert results["nasdaq.json"]["status"] == "updated"
+    assert results["nyse.json"]["status"] == "not modified"
+    assert _load(tmp_path, "nasdaq.json")[0]["ticker"] == "MSFT"
+
+
+def test_missing_output_downloaded_unconditionally(refresh, stand_in, tmp_path):
+    refresh()
+    os.remove(tmp_path / "nyse.json")
+    assert refresh()["nyse.json"]["status"] == "updated"
+
+
+def test_downloads_run_concurrently(refresh, stand_in):
+    stand_in.delay = 0.4
+    start = time.perf_counter()
+    refresh()
+    assert time.perf_counter() - start < 0.75  # sequential would take 0.8s+
@@ -0,0 +1,242 @@
+"""
+Tests for json_loader.py's delta mode and parallel batch upload, using an
+in-memory stand-in for the Supabase table client.
+
+Run:
+    python -m pytest JSON/test_json_loader.py -v
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+import json_loader
+from json_loader import diff_listings, upload_batches, upload_json_delta, upload_json_file
+
+
+class FakeQuery:
+    def __init__(self, table, op, payload=None):
+        self.table, self.op, self.payload = table, op, payload
+        self.filters = []
+        self.window = None
+
+    def eq(self, column, value):
+        self.filters.append(lambda r: r.get(column) == value)
+        return self
+
+    def is_(self, column, value):
+        assert value == "null"
+        self.filters.append(lambda r: r.get(column) is None)
+        return self
+
+    def in_(self, column, values):
+        self.filters.append(lambda r: r.get(column) in values)
+        return self
+
+    def range(self, start, end):
+        self.window = (start, end)
+        return self
+
+    def execute(self):
+        if self.op == "upsert":
+            time.sleep(self.table.delay)
+            first = self.payload[0]["ticker"]
+            with self.table.lock:
+                self.table.calls.append((self.op, self.payload))
+                if self.table.failures.get(first, 0):
+                    self.table.failures[first] -= 1
+                    raise ConnectionError(f"transient error at {first}")
+                for row in self.payload:
+                    existing = self.table.rows.setdefault(row["ticker"], {})
+                    existing.update(row)
+            return type("Resp", (), {"data": self.payload})()
+        self.table.calls.append((self.op, self.payload))
+        matched = [r for r in self.table.rows.values() if all(f(r) for f in self.filters)]
+        if self.op == "update":
+            for r in matched:
+                r.update(self.payload)
+            return type("Resp", (), {"data": matched})()
+        data = [{k: r.get(k) for k in self.payload} for r in sorted(matched, key=lambda r: r["ticker"])]
+        if self.window:
+            data = data[self.window[0]:self.window[1] + 1]
+        return type("Resp", (), {"data": data})()
+
+
+class FakeTable:
+    def __init__(self, rows):
+        self.rows = {r["ticker"]: dict(r) for r in rows}
+        self.calls = []
+        self.lock = threading.Lock()
+        self.delay = 0.0
+        self.failures = {}  # first ticker of a batch -> times its upsert should fail
+
+    def select(self, columns):
+        return FakeQuery(self, "select", columns.split(","))
+
+    def upsert(self, rows, on_conflict=None):
+        return FakeQuery(self, "upsert", rows)
+
+    def update(self, values):
+        return FakeQuery(self, "update", values)
+
+
+class FakeClient:
+    def __init__(self, rows=()):
+        self.stocks = FakeTable(rows)
+
+    def table(self, name):
+        assert name == "stocks"
+        return self.stocks
+
+
+def listing(ticker, name=None, exchange="NASDAQ", asset_type="STOCK"):
+    return {"ticker": ticker, "name": name or f"{ticker} Inc.", "exchange": exchange, "asset_type": asset_type}
+
+
+@pytest.fixture
+def write_json(tmp_path):
+    def write(rows):
+        path = tmp_path / "nasdaq.json"
+        path.write_text(json.dumps(rows))
+        return str(path)
+    return write
+
+
+def test_diff_listings():
+    diff = diff_listings(
+        [listing("AAPL"), listing("MSFT"), listing("GONE")],
+        [listing("AAPL"), listing("MSFT", name="Microsoft Corp"), listing("NEW")],
+    )
+    assert [r["ticker"] for r in diff["added"]] == ["NEW"]
+    assert [r["ticker"] for r in diff["changed"]] == ["MSFT"]
+    assert [r["ticker"] for r in diff["delisted"]] == ["GONE"]
+    assert diff["unchanged"] == 1
+
+
+def test_first_run_diffs_against_table_and_keeps_prices(write_json):
+    client = FakeClient([
+        dict(listing("AAPL"), price=190.5, last_updated="2026-03-01", delisted_at=None),
+        dict(listing("GONE"), price=3.2, last_updated="2026-03-01", delisted_at=None),
+    ])
+    path = write_json([listing("AAPL"), listing("NEW"), listing("ABC.W")])
+
+    counts = upload_json_delta(path, client=client, batch_size=1)
+
+    assert counts == {"added": 1, "changed": 0, "delisted": 1, "unchanged": 1}
+    rows = client.stocks.rows
+    assert rows["AAPL"]["price"] == 190.5
+    assert rows["GONE"]["delisted_at"] is not None
+    assert rows["NEW"]["delisted_at"] is None
+    assert rows["NEW"]["price"] == 0
+    upserted = [r for op, batch in client.stocks.calls if op == "upsert" for r in batch]
+    assert [r["ticker"] for r in upserted] == ["NEW"]
+
+
+def test_second_run_uses_snapshot_and_writes_nothing_when_unchanged(write_json, tmp_path):
+    client = FakeClient()
+    path = write_json([listing("AAPL"), listing("MSFT")])
+    upload_json_delta(path, client=client)
+    assert (tmp_path / "nasdaq.snapshot.json").exists()
+
+    client.stocks.calls.clear()
+    counts = upload_json_delta(path, client=client)
+    assert counts == {"added": 0, "changed": 0, "delisted": 0, "unchanged": 2}
+    assert client.stocks.calls == []
+
+
+def test_changed_and_relisted(write_json):
+    client = FakeClient()
+    upload_json_delta(write_json([listing("AAPL"), listing("MSFT")]), client=client)
+    client.stocks.rows["AAPL"]["price"] = 190.5  # scraped since
+    upload_json_delta(write_json([listing("AAPL", name="Apple"), listing("NEW")]), client=client)
+    assert client.stocks.rows["AAPL"]["name"] == "Apple"
+    assert client.stocks.rows["AAPL"]["price"] == 190.5
+    assert client.stocks.rows["NEW"]["price"] == 0
+    # Rows in one upsert share their columns
+    for op, batch in client.stocks.calls:
+        if op == "upsert":
+            assert len({frozenset(r) for r in batch}) == 1
+    assert client.stocks.rows["MSFT"]["delisted_at"] is not None
+
+    counts = upload_json_delta(write_json([listing("AAPL", name="Apple"), listing("MSFT")]), client=client)
+    assert counts["added"] == 1
+    assert client.stocks.rows["MSFT"]["delisted_at"] is None
+
+
+def test_table_read_is_paginated():
+    client = FakeClient([listing(f"T{i:03d}") for i in range(25)])
+    rows = json_loader.fetch_table_listings(client, "stocks", {"NASDAQ"}, page_size=10)
+    assert len(rows) == 25
+    assert sum(1 for op, _ in client.stocks.calls if op == "select") == 3
+
+
+# ---------------------------------------------------------------------------
+# Parallel batch upload
+# ---------------------------------------------------------------------------
+
+ROWS = [listing(f"T{i:03d}") for i in range(80)]
+
+
+def test_batches_upload_concurrently():
+    client = FakeClient()
+    client.stocks.delay = 0.1
+    start = time.perf_counter()
+    summary = upload_batches(ROWS, batch_size=10, concurrency=4, client=client)
+    assert time.perf_counter() - start < 0.5  # 8 batches sequentially would take 0.8s
+    assert summary["rows"] == 80 and summary["batches"] == 8
+    assert summary["rows_per_sec"] > 0
+    assert len(client.stocks.rows) == 80
+
+
+def test_transient_failure_retried():
+    client = FakeClient()
+    client.stocks.failures = {"T020": 2}
+    summary = upload_batches(ROWS, batch_size=10, retries=3, backoff=0, client=client)
+    assert summary["rows"] == 80
+    assert len(client.stocks.rows) == 80
+
+
+def test_failed_load_resumes_from_checkpoint(tmp_path):
+    checkpoint = str(tmp_path / "nasdaq.checkpoint.json")
+    client = FakeClient()
+    client.stocks.failures = {"T030": 99}
+    with pytest.raises(RuntimeError, match=r"batches \[4\]"):
+        upload_batches(ROWS, batch_size=10, retries=1, backoff=0, checkpoint_path=checkpoint, client=client)
+    with open(checkpoint) as f:
+        assert json.load(f)["done"] == [[0, 30], [40, 80]]
+
+    client.stocks.failures = {}
+    client.stocks.calls.clear()
+    summary = upload_batches(ROWS, batch_size=10, backoff=0, checkpoint_path=checkpoint, client=client)
+    assert [batch[0]["ticker"] for _, batch in client.stocks.calls] == ["T030"]
+    assert summary["skipped_batches"] == 7
+    assert len(client.stocks.rows) == 80
+    assert not (tmp_path / "nasdaq.checkpoint.json").exists()
+
+
+def test_checkpoint_for_other_rows_ignored(tmp_path):
+    checkpoint = str(tmp_path / "nasdaq.checkpoint.json")
+    client = FakeClient()
+    client.stocks.failures = {"T030": 99}
+    with pytest.raises(RuntimeError):
+        upload_batches(ROWS, batch_size=10, retries=0, checkpoint_path=checkpoint, client=client)
+
+    client.stocks.failures = {}
+    summary = upload_batches(ROWS[:40], batch_size=10, checkpoint_path=checkpoint, client=client)
+    assert summary["batches"] == 4 and summary["skipped_batches"] == 0
+
+
+def test_upload_json_file_resumes_despite_new_timestamps(write_json, tmp_path):
+    path = write_json(ROWS)
+    client = FakeClient()
+    client.stocks.failures = {"T030": 99}
+    with pytest.raises(RuntimeError):
+        upload_json_file(path, batch_size=10, retries=0, client=client)
+
+    client.stocks.failures = {}
+    client.stocks.calls.clear()
+    summary = upload_json_file(path, batch_size=10, client=client)
+    assert summary["batches"] == 1
+    assert client.stocks.rows["T030"]["price"] == 0
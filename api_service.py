@@ -0,0 +1,380 @@
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+from urllib.parse import parse_qs
+
+from tracing import span
+
+# ---------------------------------------------------------------------------
+# Response cache with ETags and in-flight request coalescing
+# ---------------------------------------------------------------------------
+
+
+class CachedResponse:
+    __slots__ = ("value", "body", "etag", "expires")
+
+    def __init__(self, value: Any, ttl: float):
+        self.value = value
+        self.body = json.dumps(value, default=str).encode()
+        self.etag = '"' + hashlib.sha256(self.body).hexdigest()[:32] + '"'
+        self.expires = time.monotonic() + ttl
+
+
+class ResponseCache:
+    """
+    TTL + LRU cache of rendered JSON responses, keyed by normalized request.
+
+    Identical requests that arrive while the first is still being rendered
+    share its result instead of calling the backend again (coalescing); this
+    applies even when ttl is 0. A request that is cancelled (client went away)
+    doesn't cancel the render the others are waiting on. Failures are shared
+    by the waiting requests but never cached.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0, "not_modified": 0}
+
+    async def fetch(self, key: str, ttl: float, render: Callable[[], Awaitable[Any]]) -> tuple[CachedResponse, str]:
+        """Return (response, "hit" | "miss" | "coalesced")."""
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires > time.monotonic():
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry, "hit"
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self._stats["coalesced"] += 1
+            return await asyncio.shield(task), "coalesced"
+
+        self._stats["misses"] += 1
+        task = asyncio.ensure_future(self._render(key, ttl, render))
+        # Mark a failure as seen even if every waiting request was cancelled.
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._inflight[key] = task
+        return await asyncio.shield(task), "miss"
+
+    async def _render(self, key: str, ttl: float, render: Callable[[], Awaitable[Any]]) -> CachedResponse:
+        try:
+            entry = CachedResponse(await render(), ttl)
+        finally:
+            del self._inflight[key]
+        if ttl > 0:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def count_not_modified(self) -> None:
+        self._stats["not_modified"] += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {**self._stats, "size": len(self._entries), "inflight": len(self._inflight)}
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+# ---------------------------------------------------------------------------
+# Backend: news_tool / StockScrapper quotes / Database
+# ---------------------------------------------------------------------------
+
+
+class DefaultBackend:
+    """
+    The service's data sources. Sync Database calls run in worker threads so
+    they don't block the event loop. Quotes come from a live PriceHub (see
+    price_stream.py) when one is given, falling back to the stocks table that
+    StockScrapper.scrape_in_batches keeps up to date.
+    """
+
+    def __init__(self, price_hub=None):
+        self.price_hub = price_hub
+
+    async def news(self, ticker: str, max_articles: int) -> list[dict]:
+        from news_tool import get_stock_news_async
+
+        return await get_stock_news_async(ticker=ticker, max_articles=max_articles)
+
+    async def quotes(self, symbols: list[str]) -> list[dict]:
+        live = {}
+        if self.price_hub is not None:
+            live = {s: self.price_hub.latest[s] for s in symbols if s in self.price_hub.latest}
+        missing = [s for s in symbols if s not in live]
+        rows = []
+        if missing:
+            from db_functions import Database
+
+            rows = await asyncio.to_thread(Database.get_stock_prices, missing)
+        return list(live.values()) + rows
+
+    async def portfolios(self, email: str, password: str) -> list[dict]:
+        from db_functions import Database
+
+        return await self._as_user(Database.fetch_user_portfolios, email, password)
+
+    async def holdings(self, email: str, password: str, portfolio_id: str) -> list[dict]:
+        from db_functions import Database
+
+        return await self._as_user(Database.fetch_portfolio_holdings, email, password, portfolio_id)
+
+    async def close(self) -> None:
+        from news_tool import close_async_http_client
+
+        await close_async_http_client()
+
+    @staticmethod
+    async def _as_user(fn, *args):
+        # fn signs in on its own client, so concurrent users never share an auth session.
+        from db_functions import AuthError
+
+        try:
+            return await asyncio.to_thread(fn, *args)
+        except AuthError as e:
+            raise HttpError(401, str(e)) from None
+
+
+# ---------------------------------------------------------------------------
+# ASGI application
+# ---------------------------------------------------------------------------
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+DEFAULT_TTLS = {"news": 300.0, "quotes": 5.0, "portfolios": 30.0, "valuation": 5.0}
+
+def _split_symbols(value: str) -> list[str]:
+    return sorted({s.strip().upper() for s in value.split(",") if s.strip()})
+
+
+class ApiService:
+    """
+    ASGI app exposing news, quotes and portfolios as JSON endpoints:
+
+        GET /news?ticker=AAPL&max_articles=10
+        GET /quotes?symbols=AAPL,MSFT
+        GET /portfolios                          (HTTP Basic auth: email / password)
+        GET /portfolios/{portfolio_id}/valuation (HTTP Basic auth)
+        GET /health
+
+    Every response carries an ETag; a matching If-None-Match gets a 304.
+    Responses are cached per route for `ttls` seconds (per user on the
+    portfolio routes) and identical in-flight requests are coalesced.
+
+    Serve with any ASGI server, e.g. `uvicorn api_service:app`.
+    """
+
+    def __init__(self, backend=None, cache: Optional[ResponseCache] = None, ttls: Optional[dict] = None):
+        self.backend = backend or DefaultBackend()
+        self.cache = cache or ResponseCache()
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    close = getattr(self.backend, "close", None)
+                    if close is not None:
+                        await close()
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+
+        headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope.get("headers", [])}
+        query = {k: v[-1] for k, v in parse_qs(scope.get("query_string", b"").decode()).items()}
+        with span("api.request", method=scope["method"], path=scope["path"]) as s:
+            try:
+                if scope["method"] != "GET":
+                    raise HttpError(405, "method not allowed")
+                entry, source, cache_control = await self._route(scope["path"], query, headers)
+            except HttpError as e:
+                await self._send(send, e.status, json.dumps({"error": str(e)}).encode(), {"cache-control": "no-store"})
+                s.set_attribute("http.status_code", e.status)
+                return
+            except Exception as e:
+                await self._send(send, 502, json.dumps({"error": f"{type(e).__name__}: {e}"}).encode(),
+                                 {"cache-control": "no-store"})
+                s.set_attribute("http.status_code", 502)
+                return
+
+            extra = {"etag": entry.etag, "cache-control": cache_control, "x-cache": source}
+            if _etag_matches(headers.get("if-none-match"), entry.etag):
+                self.cache.count_not_modified()
+                await self._send(send, 304, b"", extra)
+                s.set_attribute("http.status_code", 304)
+                return
+            await self._send(send, 200, entry.body, extra)
+            s.set_attribute("http.status_code", 200)
+            s.set_attribute("cache", source)
+
+    async def _send(self, send, status: int, body: bytes, headers: dict) -> None:
+        raw = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        raw += [(k.encode(), v.encode()) for k, v in headers.items()]
+        await send({"type": "http.response.start", "status": status, "headers": raw})
+        await send({"type": "http.response.body", "body": body})
+
+    async def _route(self, path: str, query: dict, headers: dict) -> tuple[CachedResponse, str, str]:
+        parts = [p for p in path.split("/") if p]
+        if parts == ["health"]:
+            return CachedResponse({"status": "ok", "cache": self.cache.stats()}, 0), "miss", "no-store"
+        if parts == ["news"]:
+            return await self._news(query)
+        if parts == ["quotes"]:
+            return await self._quotes(query)
+        if parts == ["portfolios"]:
+            return await self._portfolios(headers)
+        if len(parts) == 3 and parts[0] == "portfolios" and parts[2] == "valuation":
+            return await self._valuation(headers, parts[1])
+        raise HttpError(404, "not found")
+
+    async def _cached(self, key: str, route: str, render, private: bool = False) -> tuple[CachedResponse, str, str]:
+        ttl = self.ttls[route]
+        entry, source = await self.cache.fetch(key, ttl, render)
+        return entry, source, f"{'private' if private else 'public'}, max-age={int(ttl)}"
+
+    async def _news(self, query: dict):
+        ticker = query.get("ticker", "").strip().upper()
+        if not ticker:
+            raise HttpError(400, "ticker is required")
+        try:
+            max_articles = min(max(int(query.get("max_articles", 10)), 1), 50)
+        except ValueError:
+            raise HttpError(400, "max_articles must be an integer") from None
+
+        async def render():
+            return {"ticker": ticker, "articles": await self.backend.news(ticker, max_articles)}
+
+        return await self._cached(f"news:{ticker}:{max_articles}", "news", render)
+
+    async def _quotes_for(self, symbols: list[str]):
+        # Shared by /quotes and valuations, so both hit and coalesce on the same entries.
+        async def render():
+            return {"quotes": await self.backend.quotes(symbols)}
+
+        return await self._cached("quotes:" + ",".join(symbols), "quotes", render)
+
+    async def _quotes(self, query: dict):
+        symbols = _split_symbols(query.get("symbols", ""))
+        if not symbols:
+            raise HttpError(400, "symbols is required")
+        if len(symbols) > 200:
+            raise HttpError(400, "at most 200 symbols per request")
+        return await self._quotes_for(symbols)
+
+    @staticmethod
+    def _credentials(headers: dict) -> tuple[str, str, str]:
+        """(email, password, cache key) from an HTTP Basic Authorization header."""
+        auth = headers.get("authorization", "")
+        scheme, _, token = auth.partition(" ")
+        if scheme.lower() != "basic" or not token:
+            raise HttpError(401, "HTTP Basic credentials required")
+        try:
+            email, _, password = base64.b64decode(token).decode().partition(":")
+        except ValueError:
+            raise HttpError(401, "malformed credentials") from None
+        if not email or not password:
+            raise HttpError(401, "HTTP Basic credentials required")
+        return email, password, hashlib.sha256(auth.encode()).hexdigest()
+
+    async def _portfolios(self, headers: dict):
+        email, password, user_key = self._credentials(headers)
+
+        async def render():
+            return {"portfolios": await self.backend.portfolios(email, password)}
+
+        return await self._cached(f"portfolios:{user_key}", "portfolios", render, private=True)
+
+    async def _valuation(self, headers: dict, portfolio_id: str):
+        email, password, user_key = self._credentials(headers)
+
+        async def render():
+            holdings = await self.backend.holdings(email, password, portfolio_id)
+            symbols = _split_symbols(",".join(h["symbol"] for h in holdings if h.get("symbol")))
+            prices = {}
+            if symbols:
+                entry, _, _ = await self._quotes_for(symbols)
+                prices = {q["ticker"].upper(): q.get("price") for q in entry.value["quotes"]}
+            return value_portfolio(portfolio_id, holdings, prices)
+
+        return await self._cached(f"valuation:{user_key}:{portfolio_id}", "valuation", render, private=True)
+
+
+def value_portfolio(portfolio_id: str, holdings: list[dict], prices: dict[str, Optional[float]]) -> dict:
+    """Mark holdings rows to the given prices: per-position and total market value, cost and P/L."""
+    positions = []
+    total_value = total_cost = 0.0
+    missing = set()
+    for h in holdings:
+        symbol = (h.get("symbol") or "").upper()
+        qty = float(h.get("quantity") or 0)
+        cost = qty * float(h.get("average_price") or 0)
+        price = prices.get(symbol)
+        value = None if price is None else qty * float(price)
+        if value is None:
+            missing.add(symbol)
+        else:
+            total_value += value
+        total_cost += cost
+        positions.append({
+            "symbol": symbol,
+            "quantity": qty,
+            "average_price": h.get("average_price"),
+            "price": price,
+            "market_value": None if value is None else round(value, 2),
+            "cost_basis": round(cost, 2),
+            "unrealized_pl": None if value is None else round(value - cost, 2),
+        })
+    return {
+        "portfolio_id": portfolio_id,
+        "positions": positions,
+        "total_value": round(total_value, 2),
+        "total_cost": round(total_cost, 2),
+        "missing_prices": sorted(missing),
+    }
+
+
+def create_app(backend=None, price_hub=None, ttls: Optional[dict] = None) -> ApiService:
+    return ApiService(backend or DefaultBackend(price_hub), ttls=ttls)
+
+
+app = create_app()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the FiscalIQ HTTP API (requires uvicorn).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("uvicorn is not installed: pip install uvicorn (or run `<asgi server> api_service:app`)")
+    uvicorn.run("api_service:app", host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
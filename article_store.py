@@ -0,0 +1,196 @@
+import re
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional, Union
+
+from news_tool import _parse_published_at, canonicalize_url
+
+# ---------------------------------------------------------------------------
+# Local article store (SQLite + FTS5)
+# ---------------------------------------------------------------------------
+
+DEFAULT_DB_PATH = "articles.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    url_key TEXT NOT NULL UNIQUE,
+    url TEXT NOT NULL,
+    headline TEXT NOT NULL DEFAULT '',
+    summary TEXT NOT NULL DEFAULT '',
+    published_at TEXT NOT NULL DEFAULT '',
+    published_utc TEXT,
+    source TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS articles_published_utc ON articles (published_utc);
+
+CREATE TABLE IF NOT EXISTS article_tickers (
+    article_id INTEGER NOT NULL REFERENCES articles (id) ON DELETE CASCADE,
+    ticker TEXT NOT NULL,
+    PRIMARY KEY (ticker, article_id)
+) WITHOUT ROWID;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5 (
+    headline, summary, content='articles', content_rowid='id'
+);
+
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts (rowid, headline, summary) VALUES (new.id, new.headline, new.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, headline, summary)
+    VALUES ('delete', old.id, old.headline, old.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, headline, summary)
+    VALUES ('delete', old.id, old.headline, old.summary);
+    INSERT INTO articles_fts (rowid, headline, summary) VALUES (new.id, new.headline, new.summary);
+END;
+"""
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_DATE_ONLY_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def _to_utc_iso(value: Union[str, datetime, None]) -> Optional[str]:
+    if value is None or value == "":
+        return None
+    dt = value if isinstance(value, datetime) else _parse_published_at(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    if dt.year == 1:  # _parse_published_at's "unparseable" sentinel
+        return None
+    return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _end_bound(value: Union[str, date, datetime]) -> tuple[str, Optional[str]]:
+    """(operator, UTC ISO bound) for a search's `end`: a date-only end covers that whole day."""
+    if isinstance(value, str) and _DATE_ONLY_RE.fullmatch(value.strip()):
+        value = date.fromisoformat(value.strip())
+    if isinstance(value, date) and not isinstance(value, datetime):
+        next_day = datetime.combine(value + timedelta(days=1), datetime.min.time(), timezone.utc)
+        return "<", _to_utc_iso(next_day)
+    return "<=", _to_utc_iso(value)
+
+
+def _fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query matching all words, immune to FTS syntax characters."""
+    return " ".join(f'"{token}"' for token in _TOKEN_RE.findall(text))
+
+
+class ArticleStore:
+    """
+    Persists normalized articles (headline, url, summary, published_at, source)
+    in SQLite with an FTS5 index over headline and summary.
+
+    Articles are keyed by canonical URL, so storing the same story again updates
+    it in place. Each article is linked to the tickers it was fetched for.
+    upsert(ticker, articles) matches NewsPoller's on_articles callback.
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA foreign_keys = ON")
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def upsert(self, ticker: str, articles: list[dict]) -> int:
+        """Insert or update articles for ticker. Returns the number of articles stored."""
+        ticker = ticker.strip().upper()
+        stored = 0
+        with self._lock, self._conn:
+            for a in articles:
+                url = a.get("url") or ""
+                url_key = canonicalize_url(url)
+                if not url_key:
+                    continue
+                published_at = a.get("published_at") or ""
+                row = self._conn.execute(
+                    """
+                    INSERT INTO articles (url_key, url, headline, summary, published_at, published_utc, source)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (url_key) DO UPDATE SET
+                        headline = excluded.headline,
+                        summary = excluded.summary,
+                        published_at = excluded.published_at,
+                        published_utc = excluded.published_utc,
+                        source = excluded.source
+                    RETURNING id
+                    """,
+                    (
+                        url_key,
+                        url,
+                        a.get("headline") or "",
+                        a.get("summary") or "",
+                        published_at,
+                        _to_utc_iso(published_at),
+                        a.get("source") or "",
+                    ),
+                ).fetchone()
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO article_tickers (article_id, ticker) VALUES (?, ?)",
+                    (row["id"], ticker),
+                )
+                stored += 1
+        return stored
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        ticker: Optional[str] = None,
+        start: Union[str, datetime, None] = None,
+        end: Union[str, date, datetime, None] = None,
+        limit: int = 50,
+    ) -> list[dict]:
+        """
+        Return stored articles matching every word of `query` (ranked by
+        relevance), optionally restricted to a ticker and a published_at range
+        [start, end]; a date-only end ("2024-05-01") includes that whole day.
+        Without a query, the newest articles come first.
+        """
+        joins = []
+        where = []
+        params: list = []
+
+        fts = _fts_query(query) if query else ""
+        if fts:
+            joins.append("JOIN articles_fts ON articles_fts.rowid = a.id")
+            where.append("articles_fts MATCH ?")
+            params.append(fts)
+        if ticker:
+            joins.append("JOIN article_tickers t ON t.article_id = a.id")
+            where.append("t.ticker = ?")
+            params.append(ticker.strip().upper())
+        if start is not None:
+            where.append("a.published_utc >= ?")
+            params.append(_to_utc_iso(start))
+        if end is not None:
+            op, bound = _end_bound(end)
+            where.append(f"a.published_utc {op} ?")
+            params.append(bound)
+
+        order = "bm25(articles_fts)" if fts else "a.published_utc DESC"
+        sql = (
+            "SELECT a.headline, a.url, a.summary, a.published_at, a.source FROM articles a "
+            + " ".join(joins)
+            + (" WHERE " + " AND ".join(where) if where else "")
+            + f" ORDER BY {order} LIMIT ?"
+        )
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(r) for r in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
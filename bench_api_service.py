@@ -0,0 +1,197 @@
+"""
+Load test for api_service.py.
+
+Drives a mixed workload (news, quotes, portfolio listing and valuation) with
+a fixed number of concurrent clients and reports requests/sec and latency
+percentiles per endpoint. By default the app runs in-process (httpx's ASGI
+transport) against a simulated backend with configurable latency, which
+also shows how many backend calls caching and coalescing saved. With --url
+it load-tests a running server instead (e.g. `uvicorn api_service:app`).
+In-process, clients and app share one CPU: once it saturates, cache misses
+queue behind hits and tail latency includes that queueing.
+
+A share of clients (--revalidate) resend the ETag they last saw, as a
+browser would, and get 304s while the data hasn't changed.
+
+Run:
+    python bench_api_service.py
+    python bench_api_service.py --concurrency 200 --requests 20000 --no-cache --json api.json
+    python bench_api_service.py --url http://127.0.0.1:8000 --email me@example.com --password ...
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+
+import httpx
+
+from api_service import ApiService
+
+TICKERS = ["AAPL", "MSFT", "NVDA", "TSLA", "AMZN", "GOOGL", "META", "NFLX", "AMD", "INTC"]
+
+
+class SimulatedBackend:
+    """Stands in for news providers / Supabase: each call sleeps latency_ms and is counted."""
+
+    def __init__(self, latency_ms: float, seed: int = 0):
+        self.latency = latency_ms / 1000
+        self.calls = Counter()
+        self.rng = random.Random(seed)
+
+    async def _wait(self, kind: str) -> None:
+        self.calls[kind] += 1
+        await asyncio.sleep(self.latency * self.rng.uniform(0.5, 1.5))
+
+    async def news(self, ticker, max_articles):
+        await self._wait("news")
+        return [{"headline": f"{ticker} headline {i}", "url": f"https://example.com/{ticker}/{i}"}
+                for i in range(max_articles)]
+
+    async def quotes(self, symbols):
+        await self._wait("quotes")
+        return [{"ticker": s, "exchange": "NASDAQ", "price": 100 + i} for i, s in enumerate(symbols)]
+
+    async def portfolios(self, email, password):
+        await self._wait("portfolios")
+        return [{"portfolio_id": "bench", "portfolio_name": "Bench"}]
+
+    async def holdings(self, email, password, portfolio_id):
+        await self._wait("holdings")
+        return [{"symbol": t, "quantity": 10, "average_price": 90} for t in TICKERS[:5]]
+
+
+def make_request(rng: random.Random, portfolio_id: str) -> tuple[str, str]:
+    """(endpoint label, path) drawn from the workload mix."""
+    roll = rng.random()
+    if roll < 0.4:
+        return "news", f"/news?ticker={rng.choice(TICKERS)}"
+    if roll < 0.8:
+        return "quotes", "/quotes?symbols=" + ",".join(rng.sample(TICKERS, 3))
+    if roll < 0.9:
+        return "portfolios", "/portfolios"
+    return "valuation", f"/portfolios/{portfolio_id}/valuation"
+
+
+def summarize(samples: list[float]) -> dict:
+    ms = sorted(s * 1000 for s in samples)
+
+    def pct(p):
+        return round(ms[min(len(ms) - 1, int(round(p / 100 * (len(ms) - 1))))], 3)
+
+    return {
+        "n": len(ms),
+        "mean_ms": round(statistics.fmean(ms), 3),
+        "p50_ms": pct(50),
+        "p95_ms": pct(95),
+        "p99_ms": pct(99),
+        "max_ms": round(ms[-1], 3),
+    }
+
+
+async def run_load(args) -> dict:
+    backend = app = None
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, limits=httpx.Limits(max_connections=args.concurrency))
+    else:
+        backend = SimulatedBackend(args.backend_latency_ms, args.seed)
+        ttls = {k: 0 for k in ("news", "quotes", "portfolios", "valuation")} if args.no_cache else None
+        app = ApiService(backend, ttls=ttls)
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+
+    auth = base64.b64encode(f"{args.email}:{args.password}".encode()).decode()
+    latencies: dict[str, list[float]] = defaultdict(list)
+    statuses: Counter = Counter()
+    remaining = args.requests
+
+    async def worker(worker_id: int):
+        nonlocal remaining
+        rng = random.Random(args.seed * 1000 + worker_id)
+        revalidates = rng.random() < args.revalidate
+        etags: dict[str, str] = {}
+        while remaining > 0:
+            remaining -= 1
+            label, path = make_request(rng, args.portfolio_id)
+            headers = {"Authorization": f"Basic {auth}"} if label in ("portfolios", "valuation") else {}
+            if revalidates and path in etags:
+                headers["If-None-Match"] = etags[path]
+            start = time.perf_counter()
+            try:
+                response = await client.get(path, headers=headers)
+                status = response.status_code
+                if "etag" in response.headers:
+                    etags[path] = response.headers["etag"]
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies[label].append(time.perf_counter() - start)
+            statuses[status] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+    await client.aclose()
+
+    total = sum(len(v) for v in latencies.values())
+    results = {
+        "meta": {
+            "benchmark": "api_service",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": {k: v for k, v in vars(args).items() if k != "password"},
+        },
+        "requests": total,
+        "elapsed_s": round(elapsed, 3),
+        "requests_per_sec": round(total / elapsed, 1),
+        "status_codes": {str(k): v for k, v in sorted(statuses.items(), key=str)},
+        "latency": summarize([x for v in latencies.values() for x in v]),
+        "endpoints": {label: summarize(samples) for label, samples in sorted(latencies.items())},
+    }
+    if backend is not None:
+        results["backend_calls"] = dict(backend.calls)
+        results["cache"] = app.cache.stats()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", help="load-test a running server instead of the in-process app")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--backend-latency-ms", type=float, default=50, help="simulated backend latency")
+    parser.add_argument("--no-cache", action="store_true", help="ttl 0 everywhere (coalescing only)")
+    parser.add_argument("--revalidate", type=float, default=0.5, help="share of clients sending If-None-Match")
+    parser.add_argument("--email", default="bench@example.com")
+    parser.add_argument("--password", default="bench")
+    parser.add_argument("--portfolio-id", default="bench")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", help="write machine-readable results here ('-' for stdout)")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_load(args))
+    out = sys.stderr if args.json_path == "-" else sys.stdout
+    print(f"{results['requests']:,} requests in {results['elapsed_s']:.2f}s: "
+          f"{results['requests_per_sec']:,.0f} req/s  statuses {results['status_codes']}", file=out)
+    for label, d in [("all", results["latency"]), *results["endpoints"].items()]:
+        print(f"  {label:<11}p50 {d['p50_ms']:8.2f} ms  p95 {d['p95_ms']:8.2f} ms  "
+              f"p99 {d['p99_ms']:8.2f} ms  (n={d['n']})", file=out)
+    if "backend_calls" in results:
+        print(f"  backend calls {results['backend_calls']}  cache {results['cache']}", file=out)
+
+    if args.json_path == "-":
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    elif args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Import-time benchmark for the FiscalIQ modules.
+
+Runs `python -X importtime -c "import <module>"` in fresh interpreters and
+reports each module's cumulative import time (best of --runs), its heaviest
+dependencies, and whether any heavy dependency that should load on first use
+(pandas, numpy, playwright, supabase) was pulled in at import.
+test_import_time.py enforces IMPORT_BUDGETS_MS and LAZY_DEPENDENCIES.
+
+Run:
+    python bench_import_time.py
+    python bench_import_time.py --runs 10 --json import_times.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Cumulative import time allowed per module, in milliseconds. Generous enough
+# for a slow CI machine; each module now measures well under half of it.
+IMPORT_BUDGETS_MS = {
+    "tracing": 100,
+    "news_tool": 400,
+    "db_functions": 250,
+    "api_service": 150,
+}
+
+# Imported on first use only; none may appear while importing the modules above.
+LAZY_DEPENDENCIES = ("pandas", "numpy", "playwright", "supabase")
+
+
+def parse_importtime(stderr: str) -> list[dict]:
+    """Parse -X importtime lines into [{"module", "self_us", "cumulative_us", "depth"}]."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append({
+            "module": name.strip(),
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+        })
+    return rows
+
+
+def import_once(module: str) -> list[dict]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(proc.stderr)
+
+
+def measure(module: str, runs: int = 5, top: int = 5) -> dict:
+    """Best-of-runs cumulative import time of module, with its heaviest imports."""
+    best = None
+    for _ in range(runs):
+        rows = import_once(module)
+        # Rows are in completion order, so the module's own imports are the
+        # rows just before its depth-0 line (interpreter startup comes earlier).
+        end = max(i for i, r in enumerate(rows) if r["module"] == module and r["depth"] == 0)
+        start = end
+        while start > 0 and rows[start - 1]["depth"] > 0:
+            start -= 1
+        total = rows[end]["cumulative_us"]
+        if best is None or total < best[0]:
+            best = (total, rows[start:end])
+
+    total_us, rows = best
+    loaded = {r["module"] for r in rows}
+    heaviest = sorted((r for r in rows if r["depth"] == 1), key=lambda r: r["cumulative_us"], reverse=True)[:top]
+    return {
+        "module": module,
+        "cumulative_ms": round(total_us / 1000, 1),
+        "budget_ms": IMPORT_BUDGETS_MS.get(module),
+        "heaviest": [{"module": r["module"], "cumulative_ms": round(r["cumulative_us"] / 1000, 1)} for r in heaviest],
+        "lazy_dependencies_loaded": sorted(
+            dep for dep in LAZY_DEPENDENCIES if any(m == dep or m.startswith(dep + ".") for m in loaded)
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("modules", nargs="*", default=list(IMPORT_BUDGETS_MS))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", dest="json_path", help="write machine-readable results here ('-' for stdout)")
+    args = parser.parse_args()
+
+    results = [measure(m, args.runs) for m in args.modules]
+    out = sys.stderr if args.json_path == "-" else sys.stdout
+    failed = False
+    for r in results:
+        over = r["budget_ms"] is not None and r["cumulative_ms"] > r["budget_ms"]
+        failed |= over or bool(r["lazy_dependencies_loaded"])
+        budget = f"/ {r['budget_ms']} ms budget" if r["budget_ms"] is not None else ""
+        print(f"{r['module']:<14}{r['cumulative_ms']:>8.1f} ms {budget}{'  OVER' if over else ''}", file=out)
+        for h in r["heaviest"]:
+            print(f"    {h['module']:<24}{h['cumulative_ms']:>8.1f} ms", file=out)
+        if r["lazy_dependencies_loaded"]:
+            print(f"    loaded at import: {', '.join(r['lazy_dependencies_loaded'])}", file=out)
+
+    report = {
+        "meta": {
+            "benchmark": "import_time",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "runs": args.runs,
+        },
+        "results": results,
+    }
+    if args.json_path == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    elif args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
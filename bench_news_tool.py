@@ -0,0 +1,341 @@
+"""
+Offline benchmark for news_tool.py.
+
+Replays the recorded newsdata.io / newsapi.org responses in bench_fixtures/
+from a local HTTP stand-in with configurable latency and error rates, and
+measures:
+  - resolve_inputs lookups/sec (by ticker and by company name)
+  - get_stock_news latency distribution, with newsdata errors forcing fallback
+  - cached get_stock_news hits
+  - add_news_to_notebooklm against a fake MCP client (cold and warm)
+
+Human-readable lines go to stdout; --json writes machine-readable results for
+regression tracking ("-" for stdout).
+
+Run:
+    python bench_news_tool.py
+    python bench_news_tool.py --latency-ms 50 --newsdata-error-rate 0.5 --json bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import news_tool
+
+FIXTURES = {
+    "newsdata": os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_fixtures", "newsdata_latest.json"),
+    "newsapi": os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_fixtures", "newsapi_everything.json"),
+}
+TICKERS = ["AAPL", "MSFT", "NVDA", "TSLA", "AMZN"]
+
+
+# ---------------------------------------------------------------------------
+# Replay stand-in
+# ---------------------------------------------------------------------------
+
+class ReplayServer:
+    """
+    Serves recorded provider responses at /<provider>, matched on the q
+    parameter (falling back to the first recording). Each request waits
+    latency_ms ± jitter_ms, and fails with a 429 at the provider's error rate.
+    """
+
+    def __init__(self, latency_ms: float = 20, jitter_ms: float = 5, error_rates=None, seed: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rates = error_rates or {}
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.counts = {name: {"requests": 0, "errors": 0} for name in FIXTURES}
+        self.recordings = {}
+        for name, path in FIXTURES.items():
+            with open(path, "r", encoding="utf-8") as f:
+                self.recordings[name] = [
+                    (r["query"].get("q"), r["status"], json.dumps(r["body"]).encode()) for r in json.load(f)
+                ]
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real APIs
+            # Headers and body go out as separate writes; with Nagle on, every
+            # pooled request would wait ~40 ms for the client's delayed ACK.
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                provider = parts.path.strip("/")
+                if provider not in server.recordings:
+                    self.send_error(404)
+                    return
+                status, body = server.respond(provider, parse_qs(parts.query).get("q", [None])[0])
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True)
+
+    def respond(self, provider: str, query):
+        with self.rng_lock:
+            delay = max(0.0, self.latency_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+            fail = self.rng.random() < self.error_rates.get(provider, 0.0)
+            self.counts[provider]["requests"] += 1
+            if fail:
+                self.counts[provider]["errors"] += 1
+        time.sleep(delay)
+        if fail:
+            return 429, b'{"status": "error", "message": "rate limited (injected)"}'
+        recordings = self.recordings[provider]
+        for q, status, body in recordings:
+            if q == query:
+                return status, body
+        return recordings[0][1], recordings[0][2]
+
+    def reset_counts(self) -> None:
+        for counts in self.counts.values():
+            counts.update(requests=0, errors=0)
+
+    def __enter__(self) -> "ReplayServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@contextmanager
+def providers_pointed_at(base_url: str):
+    """Send every provider's requests to the stand-in, with dummy API keys."""
+    originals = {name: p.BASE_URL for name, p in news_tool._PROVIDERS.items()}
+    saved_env = {k: os.environ.get(k) for k in ("NEWSDATA_API_KEY", "NEWSAPI_KEY")}
+    try:
+        for name, provider in news_tool._PROVIDERS.items():
+            provider.BASE_URL = f"{base_url}/{name}"
+        os.environ["NEWSDATA_API_KEY"] = os.environ["NEWSAPI_KEY"] = "bench"
+        yield
+    finally:
+        for name, provider in news_tool._PROVIDERS.items():
+            provider.BASE_URL = originals[name]
+        for k, v in saved_env.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+
+# ---------------------------------------------------------------------------
+# Measurements
+# ---------------------------------------------------------------------------
+
+def summarize(samples: list[float]) -> dict:
+    """Latency distribution in milliseconds."""
+    if not samples:
+        return {"n": 0}
+    ms = sorted(s * 1000 for s in samples)
+
+    def pct(p):
+        return round(ms[min(len(ms) - 1, int(round(p / 100 * (len(ms) - 1))))], 3)
+
+    return {
+        "n": len(ms),
+        "mean_ms": round(statistics.fmean(ms), 3),
+        "p50_ms": pct(50),
+        "p90_ms": pct(90),
+        "p99_ms": pct(99),
+        "max_ms": round(ms[-1], 3),
+    }
+
+
+def bench_resolve(iterations: int) -> dict:
+    names = [news_tool.resolve_inputs(t, None)[1] for t in TICKERS]
+    news_tool.resolve_inputs(TICKERS[0], None)  # warm up
+
+    start = time.perf_counter()
+    for i in range(iterations):
+        news_tool.resolve_inputs(TICKERS[i % len(TICKERS)], None)
+    by_ticker = iterations / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(iterations):
+        news_tool.resolve_inputs(None, names[i % len(names)])
+    by_name = iterations / (time.perf_counter() - start)
+
+    return {"iterations": iterations, "by_ticker_per_sec": round(by_ticker, 1), "by_name_per_sec": round(by_name, 1)}
+
+
+def bench_fallback(server: ReplayServer, calls: int) -> dict:
+    news_tool.disable_news_cache()
+    server.reset_counts()
+    samples, failures = [], 0
+    for i in range(calls):
+        start = time.perf_counter()
+        try:
+            news_tool.get_stock_news(ticker=TICKERS[i % len(TICKERS)], use_cache=False)
+        except RuntimeError:
+            failures += 1
+        samples.append(time.perf_counter() - start)
+    return {
+        **summarize(samples),
+        "failures": failures,
+        "fallbacks": server.counts["newsdata"]["errors"],
+        "provider_requests": {name: dict(c) for name, c in server.counts.items()},
+    }
+
+
+def bench_cache(calls: int) -> dict:
+    news_tool.configure_news_cache(ttl=3600)
+    try:
+        for ticker in TICKERS:
+            news_tool.get_stock_news(ticker=ticker)
+        samples = []
+        for i in range(calls):
+            start = time.perf_counter()
+            news_tool.get_stock_news(ticker=TICKERS[i % len(TICKERS)])
+            samples.append(time.perf_counter() - start)
+    finally:
+        news_tool.disable_news_cache()
+    return summarize(samples)
+
+
+class FakeMcpClient:
+    """Answers NotebookLM tool calls after latency_ms, like a remote MCP server."""
+
+    def __init__(self, latency_ms: float):
+        self.latency = latency_ms / 1000
+        self.calls = 0
+        self.notebooks = []
+
+    async def call_tool(self, tool_name: str, arguments: dict):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if tool_name == "notebook_list":
+            return {"notebooks": list(self.notebooks)}
+        if tool_name == "notebook_create":
+            self.notebooks.append({"id": "nb-bench", "title": arguments["title"]})
+            return {"id": "nb-bench"}
+        if tool_name == "source_add":
+            return {"status": "success", "source": {"id": f"src-{self.calls}"}}
+        if tool_name == "notebook_query":
+            return {"answer": "Benchmark summary."}
+        return {"status": "ok"}
+
+
+def bench_notebooklm(server: ReplayServer, iterations: int, mcp_latency_ms: float) -> dict:
+    articles = news_tool.get_stock_news(ticker="AAPL", max_articles=10, use_cache=False)
+
+    async def run(cold: bool) -> tuple[list[float], int]:
+        client = FakeMcpClient(mcp_latency_ms)
+        samples = []
+        for _ in range(iterations):
+            if cold:
+                news_tool.configure_notebook_id_cache()
+                news_tool.configure_source_ledger(":memory:")
+                news_tool.configure_summary_cache()
+            start = time.perf_counter()
+            await news_tool.add_news_to_notebooklm(articles, "AAPL", "Apple Inc.", client)
+            samples.append(time.perf_counter() - start)
+        return samples, client.calls
+
+    news_tool.configure_notebook_shards()
+    cold, cold_calls = asyncio.run(run(cold=True))
+    news_tool.configure_notebook_id_cache()
+    news_tool.configure_source_ledger(":memory:")
+    news_tool.configure_summary_cache()
+    warm, warm_calls = asyncio.run(run(cold=False))
+    return {
+        "articles": len(articles),
+        "mcp_latency_ms": mcp_latency_ms,
+        "cold": {**summarize(cold), "mcp_calls": cold_calls},
+        "warm": {**summarize(warm), "mcp_calls": warm_calls},
+    }
+
+
+def run_benchmarks(args) -> dict:
+    results = {
+        "meta": {
+            "benchmark": "news_tool",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": vars(args),
+        }
+    }
+    results["resolve_inputs"] = bench_resolve(args.resolve_iterations)
+    with ReplayServer(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rates={"newsdata": args.newsdata_error_rate, "newsapi": args.newsapi_error_rate},
+        seed=args.seed,
+    ) as server, providers_pointed_at(server.base_url):
+        results["get_stock_news_fallback"] = bench_fallback(server, args.calls)
+        results["get_stock_news_cache_hit"] = bench_cache(args.calls)
+        results["add_news_to_notebooklm"] = bench_notebooklm(server, args.notebook_iterations, args.mcp_latency_ms)
+    return results
+
+
+def print_report(results: dict, out=sys.stdout) -> None:
+    r = results["resolve_inputs"]
+    print(f"resolve_inputs:            {r['by_ticker_per_sec']:>12,.0f} lookups/s by ticker, "
+          f"{r['by_name_per_sec']:,.0f} by name", file=out)
+
+    def line(label, d):
+        print(f"{label:<27}p50 {d['p50_ms']:8.2f} ms  p90 {d['p90_ms']:8.2f} ms  "
+              f"p99 {d['p99_ms']:8.2f} ms  (n={d['n']})", file=out)
+
+    f = results["get_stock_news_fallback"]
+    line("get_stock_news (fallback):", f)
+    print(f"{'':<27}{f['fallbacks']} fallbacks to newsapi, {f['failures']} failures", file=out)
+    line("get_stock_news (cache hit):", results["get_stock_news_cache_hit"])
+    n = results["add_news_to_notebooklm"]
+    line("add_news_to_notebooklm cold:", n["cold"])
+    line("add_news_to_notebooklm warm:", n["warm"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=200, help="get_stock_news calls per scenario")
+    parser.add_argument("--resolve-iterations", type=int, default=2000)
+    parser.add_argument("--notebook-iterations", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=20, help="stand-in response latency")
+    parser.add_argument("--jitter-ms", type=float, default=5)
+    parser.add_argument("--newsdata-error-rate", type=float, default=0.2)
+    parser.add_argument("--newsapi-error-rate", type=float, default=0.0)
+    parser.add_argument("--mcp-latency-ms", type=float, default=20, help="fake MCP call latency")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", help="write machine-readable results here ('-' for stdout)")
+    args = parser.parse_args()
+
+    json_path = args.json_path
+    results = run_benchmarks(args)
+    print_report(results, out=sys.stderr if json_path == "-" else sys.stdout)
+    if json_path == "-":
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    elif json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+Load test for price_stream.py.
+
+Starts a PriceStreamServer on a free local port, connects thousands of
+simulated dashboard subscribers (SSE, plus a share over WebSocket and a share
+that stop reading), publishes synthetic quotes at a fixed rate, and reports
+delivery latency, coalescing and how many stalled clients were dropped.
+
+Subscribers run in --client-procs worker processes so their parsing doesn't
+compete with the server's event loop (0 keeps them in the server process).
+
+Run:
+    python bench_price_stream.py
+    python bench_price_stream.py --subscribers 5000 --rate 5000 --json stream.json
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import platform
+import random
+import socket
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+from price_stream import WS_TEXT, PriceHub, PriceStreamServer, read_ws_frame
+
+
+class Subscriber:
+    def __init__(self, kind: str, tickers: list[str]):
+        self.kind = kind
+        self.tickers = tickers
+        self.messages = 0
+        self.quotes = 0
+        self.latencies: list[float] = []
+        self.writer = None
+
+    def record(self, data: bytes) -> None:
+        now = time.time()
+        batch = json.loads(data)["quotes"]
+        self.messages += 1
+        self.quotes += len(batch)
+        self.latencies.extend(now - q["ts"] for q in batch)
+
+    async def connect(self, port: int) -> None:
+        sock = socket.socket()
+        if self.kind == "slow":
+            # A small receive window makes the stall reach the server quickly.
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        sock.setblocking(False)
+        await asyncio.get_running_loop().sock_connect(sock, ("127.0.0.1", port))
+        reader, self.writer = await asyncio.open_connection(sock=sock)
+        # Stalled clients watch every ticker, like a market overview left open in a background tab.
+        query = "*" if self.kind == "slow" else ",".join(self.tickers)
+        if self.kind == "ws":
+            key = base64.b64encode(os.urandom(16)).decode()
+            self.writer.write(
+                f"GET /ws?tickers={query} HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\n"
+                f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n".encode()
+            )
+        else:
+            self.writer.write(f"GET /stream?tickers={query} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        await reader.readuntil(b"\r\n\r\n")
+        self.reader = reader
+        if self.kind == "slow":
+            self.writer.transport.pause_reading()
+
+    async def consume(self) -> None:
+        if self.kind == "slow":
+            return
+        try:
+            while True:
+                if self.kind == "ws":
+                    _, opcode, payload = await read_ws_frame(self.reader)
+                    if opcode == WS_TEXT:
+                        self.record(payload)
+                else:
+                    event = await self.reader.readuntil(b"\n\n")
+                    for line in event.split(b"\n"):
+                        if line.startswith(b"data: "):
+                            self.record(line[len(b"data: "):])
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.transport.abort()
+
+
+async def _run_clients(port: int, specs: list[tuple[str, list[str]]]) -> dict:
+    subscribers = [Subscriber(kind, tickers) for kind, tickers in specs]
+    for i in range(0, len(subscribers), 200):
+        await asyncio.gather(*(s.connect(port) for s in subscribers[i:i + 200]))
+    # Readers end when the server closes their stream; stalled ones are then cut off.
+    await asyncio.gather(*(s.consume() for s in subscribers if s.kind != "slow"))
+    for s in subscribers:
+        s.close()
+    live = [s for s in subscribers if s.kind != "slow"]
+    return {
+        "messages": sum(s.messages for s in live),
+        "quotes": sum(s.quotes for s in live),
+        "latencies": [x for s in live for x in s.latencies],
+    }
+
+
+def run_clients(port: int, specs: list[tuple[str, list[str]]]) -> dict:
+    """Worker-process entry point: connect specs [(kind, tickers)] and read until the server closes."""
+    return asyncio.run(_run_clients(port, specs))
+
+
+def summarize(samples: list[float]) -> dict:
+    if not samples:
+        return {"n": 0}
+    ms = sorted(s * 1000 for s in samples)
+
+    def pct(p):
+        return round(ms[min(len(ms) - 1, int(round(p / 100 * (len(ms) - 1))))], 3)
+
+    return {
+        "n": len(ms),
+        "mean_ms": round(statistics.fmean(ms), 3),
+        "p50_ms": pct(50),
+        "p95_ms": pct(95),
+        "p99_ms": pct(99),
+        "max_ms": round(ms[-1], 3),
+    }
+
+
+async def run_load(args) -> dict:
+    rng = random.Random(args.seed)
+    universe = [f"T{i:04d}" for i in range(args.tickers)]
+    hub = PriceHub(min_interval=args.min_interval, max_lag=args.max_lag)
+    server = PriceStreamServer(hub, port=0, send_timeout=args.send_timeout, send_buffer=args.send_buffer)
+    port = await server.start()
+
+    specs = []
+    for _ in range(args.subscribers):
+        roll = rng.random()
+        kind = "slow" if roll < args.slow_fraction else "ws" if roll < args.slow_fraction + args.ws_fraction else "sse"
+        specs.append((kind, rng.sample(universe, min(args.per_client, len(universe)))))
+
+    loop = asyncio.get_running_loop()
+    pool = ProcessPoolExecutor(args.client_procs) if args.client_procs > 0 else None
+    start = time.perf_counter()
+    if pool is None:
+        clients = [asyncio.ensure_future(_run_clients(port, specs))]
+    else:
+        clients = [
+            loop.run_in_executor(pool, run_clients, port, specs[i::args.client_procs])
+            for i in range(args.client_procs)
+        ]
+    while hub.subscriber_count < len(specs):
+        await asyncio.sleep(0.01)
+    connect_s = time.perf_counter() - start
+
+    # Publish in 10 ms ticks at the target rate.
+    published = offered = 0
+    tick = 0.01
+    start = time.perf_counter()
+    deadline = start + args.duration
+    while time.perf_counter() < deadline:
+        target = int((time.perf_counter() - start) * args.rate)
+        while published < target:
+            offered += hub.publish({"ticker": rng.choice(universe), "price": round(rng.uniform(10, 500), 2)})
+            published += 1
+        await asyncio.sleep(tick)
+    publish_s = time.perf_counter() - start
+    await asyncio.sleep(max(0.5, args.min_interval * 3))  # let the last batches flush
+
+    stats = hub.stats()
+    await server.close()
+    results = await asyncio.gather(*clients)
+    if pool is not None:
+        pool.shutdown()
+
+    delivered = sum(r["quotes"] for r in results)
+    return {
+        "meta": {
+            "benchmark": "price_stream",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": vars(args),
+        },
+        "subscribers": {
+            "sse": sum(kind == "sse" for kind, _ in specs),
+            "ws": sum(kind == "ws" for kind, _ in specs),
+            "slow": sum(kind == "slow" for kind, _ in specs),
+            "connect_s": round(connect_s, 3),
+        },
+        "published": published,
+        "publish_rate": round(published / publish_s, 1),
+        "fanout_offered": offered,
+        "delivered_quotes": delivered,
+        "messages": sum(r["messages"] for r in results),
+        "coalesced_ratio": round(1 - delivered / offered, 4) if offered else 0.0,
+        "dropped_subscribers": stats["dropped_subscribers"],
+        "latency": summarize([x for r in results for x in r["latencies"]]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--subscribers", type=int, default=2000)
+    parser.add_argument("--tickers", type=int, default=200, help="size of the ticker universe")
+    parser.add_argument("--per-client", type=int, default=5, help="tickers each subscriber follows")
+    parser.add_argument("--ws-fraction", type=float, default=0.2)
+    parser.add_argument("--slow-fraction", type=float, default=0.01, help="subscribers that stop reading")
+    parser.add_argument("--rate", type=float, default=2000, help="quotes published per second")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--min-interval", type=float, default=0.1, help="per-client coalescing window")
+    parser.add_argument("--max-lag", type=float, default=2.0)
+    parser.add_argument("--send-timeout", type=float, default=2.0)
+    parser.add_argument("--send-buffer", type=int, default=16 * 1024, help="per-connection SO_SNDBUF")
+    parser.add_argument("--client-procs", type=int, default=2, help="subscriber processes (0 = in-process)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", help="write machine-readable results here ('-' for stdout)")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_load(args))
+    out = sys.stderr if args.json_path == "-" else sys.stdout
+    subs, lat = results["subscribers"], results["latency"]
+    print(f"subscribers:      {subs['sse']} SSE, {subs['ws']} WebSocket, {subs['slow']} stalled "
+          f"(connected in {subs['connect_s']:.2f}s)", file=out)
+    print(f"published:        {results['published']:,} quotes at {results['publish_rate']:,.0f}/s "
+          f"-> {results['fanout_offered']:,} subscriber updates", file=out)
+    print(f"delivered:        {results['delivered_quotes']:,} quotes in {results['messages']:,} messages "
+          f"({results['coalesced_ratio']:.1%} coalesced)", file=out)
+    if lat["n"]:
+        print(f"latency:          p50 {lat['p50_ms']:.1f} ms  p95 {lat['p95_ms']:.1f} ms  "
+              f"p99 {lat['p99_ms']:.1f} ms  max {lat['max_ms']:.1f} ms", file=out)
+    print(f"dropped stalled:  {results['dropped_subscribers']}", file=out)
+
+    if args.json_path == "-":
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    elif args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,24 +2,68 @@ import asyncio
 import re
 import os
 import time
-from typing import Dict, Optional, List, Tuple
+from typing import TYPE_CHECKING, Dict, Optional, List, Tuple
 from datetime import datetime, timezone
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
-import pandas as pd
-from supabase import create_client, Client
 from dotenv import load_dotenv
+from tracing import span, traced
 
-load_dotenv() 
+if TYPE_CHECKING:
+    import pandas as pd
+    from supabase import Client
+
+# Playwright, pandas and supabase are imported on first use, and the .env file
+# is read and the Supabase client created on the first database call, so
+# importing this module (e.g. for Database in a CLI or a test) stays cheap.
+_supabase: Optional["Client"] = None
+
+
+def _new_client() -> "Client":
+    from supabase import create_client
+
+    load_dotenv()
+    return create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_PUBLISHABLE_KEY"))
+
+
+def get_supabase() -> "Client":
+    """Return the shared Supabase client, creating it on first use."""
+    global _supabase
+    if _supabase is None:
+        _supabase = _new_client()
+    return _supabase
+
+
+class AuthError(Exception):
+    """Sign-in was rejected (bad email/password)."""
+
+
+def sign_in_user(email, password) -> Tuple["Client", str]:
+    """
+    Sign in on a fresh client and return (client, user_id).
+
+    A client holds one auth session, so the shared get_supabase() client must
+    not be signed into by concurrent requests for different users (api_service
+    runs these calls in worker threads). Each caller gets its own client here.
+    """
+    client = _new_client()
+    try:
+        auth_res = client.auth.sign_in_with_password({"email": email, "password": password})
+    except Exception as e:
+        from supabase import AuthApiError
+
+        if isinstance(e, AuthApiError):
+            raise AuthError(str(e)) from e
+        raise
+    if not auth_res.user:
+        raise AuthError("Login failed. Check credentials.")
+    return client, auth_res.user.id
 
-DB_URL = os.getenv("SUPABASE_URL") 
-PUBLIC_KEY = os.getenv("SUPABASE_PUBLISHABLE_KEY")
-supabase: Client = create_client(DB_URL, PUBLIC_KEY)
 
 class Database:
     # creates new user into database along with custom portfolio
     @staticmethod
+    @traced("db.create_new_user")
     def create_new_user(email, password, custom_portfolio_name):
-        response = supabase.auth.sign_up({
+        response = get_supabase().auth.sign_up({
             "email": email,
             "password": password,
             "options": {
@@ -36,8 +80,9 @@ class Database:
 
     # deletes a user and related data
     @staticmethod
+    @traced("db.delete_user")
     def delete_user(email, password):
-        auth_res = supabase.auth.sign_in_with_password({"email": email, "password": password})
+        auth_res = get_supabase().auth.sign_in_with_password({"email": email, "password": password})
 
         if not auth_res.user:
             print("Login failed. Check credentials.")
@@ -49,7 +94,9 @@ class Database:
             return False
 
         try:
-            admin_client: Client = create_client(DB_URL, service_role_key)
+            from supabase import create_client
+
+            admin_client = create_client(os.getenv("SUPABASE_URL"), service_role_key)
             admin_client.auth.admin.delete_user(auth_res.user.id)
             print(f"Deleted auth user: {auth_res.user.email}")
             return True
@@ -59,9 +106,10 @@ class Database:
 
     # creates another portfolio associated with user
     @staticmethod
+    @traced("db.create_additional_portfolio")
     def create_additional_portfolio(email, password, new_portfolio_name):
         # 1. Login to get the user's session
-        auth_res = supabase.auth.sign_in_with_password({"email": email, "password": password})
+        auth_res = get_supabase().auth.sign_in_with_password({"email": email, "password": password})
 
         if auth_res.user:
             user_id = auth_res.user.id
@@ -75,7 +123,7 @@ class Database:
             }
 
             try:
-                res = supabase.table("portfolios").insert(new_portfolio).execute()
+                res = get_supabase().table("portfolios").insert(new_portfolio).execute()
 
                 if res.data:
                     print(f"✅ Successfully created portfolio: '{new_portfolio_name}'")
@@ -89,8 +137,9 @@ class Database:
 
     # deletes a portfolio associated with a user
     @staticmethod
+    @traced("db.delete_portfolio")
     def delete_portfolio(email, password, portfolio_name=None, portfolio_id=None):
-        auth_res = supabase.auth.sign_in_with_password({"email": email, "password": password})
+        auth_res = get_supabase().auth.sign_in_with_password({"email": email, "password": password})
 
         if not auth_res.user:
             print("Login failed. Check credentials.")
@@ -102,7 +151,7 @@ class Database:
             print("Please provide portfolio_name or portfolio_id.")
             return False
 
-        query = supabase.table("portfolios").select("portfolio_id", "portfolio_name").eq("user_id", user_id)
+        query = get_supabase().table("portfolios").select("portfolio_id", "portfolio_name").eq("user_id", user_id)
 
         if portfolio_id:
             query = query.eq("portfolio_id", portfolio_id)
@@ -116,7 +165,7 @@ class Database:
                 return False
 
             target = found.data[0]
-            supabase.table("portfolios").delete().eq("portfolio_id", target["portfolio_id"]).eq("user_id", user_id).execute()
+            get_supabase().table("portfolios").delete().eq("portfolio_id", target["portfolio_id"]).eq("user_id", user_id).execute()
             print(f"Deleted portfolio '{target['portfolio_name']}' (ID: {target['portfolio_id']}).")
             return True
         except Exception as e:
@@ -125,14 +174,15 @@ class Database:
 
     # retrieves all portfolios associated with a user
     @staticmethod
+    @traced("db.get_user_portfolios")
     def get_user_portfolios(email, password):
-        auth_res = supabase.auth.sign_in_with_password({"email": email, "password": password})
+        auth_res = get_supabase().auth.sign_in_with_password({"email": email, "password": password})
 
         if auth_res.user:
             print(f"Logged in as {auth_res.user.email}")
 
             try:
-                res = supabase.table("portfolios").select("*").eq("user_id", auth_res.user.id).execute()
+                res = get_supabase().table("portfolios").select("*").eq("user_id", auth_res.user.id).execute()
 
                 if res.data:
                     print(f"Found {len(res.data)} portfolio(s):")
@@ -150,17 +200,79 @@ class Database:
             print("Login failed. Check credentials.")
             return []
 
+    # retrieves all holdings rows for one of the user's portfolios
+    @staticmethod
+    @traced("db.get_portfolio_holdings")
+    def get_portfolio_holdings(email, password, portfolio_id):
+        auth_res = get_supabase().auth.sign_in_with_password({"email": email, "password": password})
+
+        if not auth_res.user:
+            print("Login failed. Check credentials.")
+            return []
+
+        try:
+            res = (
+                get_supabase().table("holdings")
+                .select("holdings_id, symbol, quantity, average_price")
+                .eq("portfolio_id", portfolio_id)
+                .eq("user_id", auth_res.user.id)
+                .execute()
+            )
+            return res.data or []
+        except Exception as e:
+            print(f"Failed to retrieve holdings: {e}")
+            return []
+
+    # Per-user reads for servers handling many users at once: each call signs in on
+    # its own client (see sign_in_user) and raises instead of printing and returning [].
+    @staticmethod
+    @traced("db.fetch_user_portfolios")
+    def fetch_user_portfolios(email, password):
+        client, user_id = sign_in_user(email, password)
+        res = client.table("portfolios").select("*").eq("user_id", user_id).execute()
+        return res.data or []
+
+    @staticmethod
+    @traced("db.fetch_portfolio_holdings")
+    def fetch_portfolio_holdings(email, password, portfolio_id):
+        client, user_id = sign_in_user(email, password)
+        res = (
+            client.table("holdings")
+            .select("holdings_id, symbol, quantity, average_price")
+            .eq("portfolio_id", portfolio_id)
+            .eq("user_id", user_id)
+            .execute()
+        )
+        return res.data or []
+
+    # retrieves the latest scraped prices (stocks table) for a list of tickers
+    @staticmethod
+    @traced("db.get_stock_prices")
+    def get_stock_prices(tickers):
+        try:
+            res = (
+                get_supabase().table("stocks")
+                .select("ticker, exchange, price, last_updated")
+                .in_("ticker", [t.upper() for t in tickers])
+                .execute()
+            )
+            return res.data or []
+        except Exception as e:
+            print(f"Failed to retrieve prices: {e}")
+            return []
+
     # adds in stock trade for specific portfolio
     @staticmethod
+    @traced("db.test_add_stock")
     def test_add_stock(email, password, symbol, qty, portfolio_name=None):
         # 1. Login
-        user_auth = supabase.auth.sign_in_with_password({"email": email, "password": password})
+        user_auth = get_supabase().auth.sign_in_with_password({"email": email, "password": password})
 
         if user_auth.user:
             print(f"Successfully logged in as {user_auth.user.email}")
 
             # 2. Logic to find the correct Portfolio ID
-            query = supabase.table("portfolios").select("portfolio_id", "portfolio_name", "user_id")
+            query = get_supabase().table("portfolios").select("portfolio_id", "portfolio_name", "user_id")
 
             # If user specified a name, try to find that one specifically
             if portfolio_name:
@@ -184,7 +296,7 @@ class Database:
                     "average_price" : 150 # placeholder
                 }
 
-                insert_res = supabase.table("holdings").insert(stock_data).execute()
+                insert_res = get_supabase().table("holdings").insert(stock_data).execute()
                 print("Successfully added stock: ", insert_res.data)
             else:
                 print(f"Error: No portfolio found matching '{portfolio_name}'")
@@ -193,8 +305,9 @@ class Database:
 
     # deletes a stock holding by holding_id
     @staticmethod
+    @traced("db.delete_stock_by_holding_id")
     def delete_stock_by_holding_id(email, password, holding_id):
-        auth_res = supabase.auth.sign_in_with_password({"email": email, "password": password})
+        auth_res = get_supabase().auth.sign_in_with_password({"email": email, "password": password})
 
         if not auth_res.user:
             print("Login failed. Check credentials.")
@@ -205,7 +318,7 @@ class Database:
         try:
             # Optional pre-check for clearer message
             existing = (
-                supabase.table("holdings")
+                get_supabase().table("holdings")
                 .select("holdings_id, symbol, portfolio_id")
                 .eq("holdings_id", holding_id)
                 .eq("user_id", user_id)
@@ -217,7 +330,7 @@ class Database:
                 return False
 
             delete_res = (
-                supabase.table("holdings")
+                get_supabase().table("holdings")
                 .delete()
                 .eq("holdings_id", holding_id)
                 .eq("user_id", user_id)
@@ -236,6 +349,31 @@ class Database:
             return False
 
 
+class _LazyListings:
+    """Class attribute whose DataFrame is built by loader() on first access."""
+
+    def __init__(self, loader):
+        self._loader = loader
+        self._value = None
+
+    def __get__(self, obj, owner) -> "pd.DataFrame":
+        if self._value is None:
+            self._value = self._loader()
+        return self._value
+
+
+def _read_listings(path: str) -> "pd.DataFrame":
+    import pandas as pd
+
+    return pd.read_json(path)
+
+
+def _all_listings() -> "pd.DataFrame":
+    import pandas as pd
+
+    return pd.concat([StockScrapper.nasdaq, StockScrapper.nyse], axis=0)
+
+
 class StockScrapper:
     GOOGLE_FINANCE_QUOTE_URL = "https://www.google.com/finance/quote/{ticker}:{exchange}"
 
@@ -249,9 +387,9 @@ class StockScrapper:
         "adservice.google.com",
     )
 
-    nasdaq = pd.read_json("JSON/nasdaq.json")
-    nyse = pd.read_json("JSON/nyse.json")
-    df = pd.concat([nasdaq, nyse], axis=0)    
+    nasdaq = _LazyListings(lambda: _read_listings("JSON/nasdaq.json"))
+    nyse = _LazyListings(lambda: _read_listings("JSON/nyse.json"))
+    df = _LazyListings(_all_listings)
 
     @staticmethod
     def _clean_number(text: str) -> Optional[float]:
@@ -278,16 +416,20 @@ class StockScrapper:
     @staticmethod
     async def fetch_quote(page, ticker: str, exchange: str = "NASDAQ") -> Dict[str, object]:
         """Fetch a single quote quickly using an existing Page."""
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
         url = StockScrapper.GOOGLE_FINANCE_QUOTE_URL.format(
             ticker=ticker.upper(), exchange=exchange.upper()
         )
 
         # DOMContentLoaded is usually enough; full "load" can be much slower.
-        await page.goto(url, wait_until="domcontentloaded")
+        with span("scraper.goto", ticker=ticker.upper(), exchange=exchange.upper()):
+            await page.goto(url, wait_until="domcontentloaded")
 
         # Fast, minimal wait: only wait for the price node.
         try:
-            await page.wait_for_selector("div.YMlKec.fxKbKc", timeout=8000)
+            with span("scraper.wait_for_price", ticker=ticker.upper()):
+                await page.wait_for_selector("div.YMlKec.fxKbKc", timeout=8000)
         except PlaywrightTimeoutError:
             return {
                 "ticker": ticker.upper(),
@@ -309,6 +451,7 @@ class StockScrapper:
         }
 
     @staticmethod
+    @traced("scraper.scrape_quotes")
     async def scrape_quotes(
         symbols: List[Tuple[str, str]],
         concurrency: int = 6,
@@ -318,6 +461,8 @@ class StockScrapper:
         Scrape many tickers concurrently while reusing one browser/context.
         symbols: list of (ticker, exchange) like [("AAPL","NASDAQ"), ("SPY","NYSEARCA")]
         """
+        from playwright.async_api import async_playwright
+
         sem = asyncio.Semaphore(concurrency)
         results: List[Dict[str, object]] = []
 
@@ -365,7 +510,10 @@ class StockScrapper:
             yield items[i:i + size]
 
     @staticmethod
-    async def scrape_in_batches(df=df, batch_size=5, concurrency=6, headless=True):
+    @traced("scraper.scrape_in_batches")
+    async def scrape_in_batches(df=None, batch_size=5, concurrency=6, headless=True):
+        if df is None:
+            df = StockScrapper.df
         symbols = list(zip(df["ticker"], df["exchange"]))
         all_rows = []
 
@@ -410,10 +558,11 @@ class StockScrapper:
 
         total = 0
         for chunk in StockScrapper.chunk_list(all_rows, CHUNK_SIZE):
-            resp = supabase.table("stocks").upsert(
-                chunk,
-                on_conflict="ticker,exchange"
-            ).execute()
+            with span("db.upsert_prices", rows=len(chunk)):
+                resp = get_supabase().table("stocks").upsert(
+                    chunk,
+                    on_conflict="ticker,exchange"
+                ).execute()
 
             if getattr(resp, "error", None):
                 raise RuntimeError(f"Supabase upsert error: {resp.error}")
@@ -0,0 +1,210 @@
+import asyncio
+import itertools
+import json
+from typing import Any, Optional, Sequence
+
+# ---------------------------------------------------------------------------
+# Pipelined JSON-RPC client for stdio MCP servers (e.g. notebooklm-mcp)
+# ---------------------------------------------------------------------------
+
+PROTOCOL_VERSION = "2024-11-05"
+DEFAULT_COMMAND = ("notebooklm-mcp",)
+
+# notebook_query answers can be far larger than asyncio's 64 KiB default line limit.
+_STREAM_LIMIT = 16 * 1024 * 1024
+
+
+class McpError(Exception):
+    """Raised when the MCP server returns an error or goes away mid-request."""
+
+
+def _decode_tool_result(result: dict) -> Any:
+    """
+    Turn a tools/call result into the value news_tool expects: the text
+    content parsed as JSON when possible, otherwise the text itself.
+    """
+    text = "\n".join(
+        c.get("text", "") for c in result.get("content") or [] if c.get("type") == "text"
+    )
+    if result.get("isError"):
+        structured = result.get("structuredContent")
+        raise McpError(text or (json.dumps(structured) if structured is not None else "tool call failed"))
+    if result.get("structuredContent") is not None:
+        return result["structuredContent"]
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+class StdioMcpClient:
+    """
+    Async MCP client that spawns a stdio server once and keeps it running.
+
+    Requests are written as soon as they are made and matched to replies by
+    JSON-RPC id, so concurrent call_tool() calls overlap instead of waiting
+    for each other. Use as an async context manager, or call start()/close():
+
+        async with StdioMcpClient() as client:
+            await add_news_to_notebooklm(articles, "AAPL", "Apple Inc", client)
+    """
+
+    def __init__(
+        self,
+        command: Sequence[str] = DEFAULT_COMMAND,
+        env: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        client_name: str = "fiscaliq",
+    ):
+        self.command = list(command)
+        self.env = env
+        self.timeout = timeout
+        self.client_name = client_name
+        self.server_info: dict = {}
+        self._proc: Optional[asyncio.subprocess.Process] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._pending: dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+        self._write_lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "StdioMcpClient":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        """Spawn the server and perform the initialize handshake."""
+        if self._proc is not None:
+            return
+        self._proc = await asyncio.create_subprocess_exec(
+            *self.command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            env=self.env,
+            limit=_STREAM_LIMIT,
+        )
+        self._reader = asyncio.get_running_loop().create_task(self._read_loop())
+        try:
+            init = await self.request(
+                "initialize",
+                {
+                    "protocolVersion": PROTOCOL_VERSION,
+                    "capabilities": {},
+                    "clientInfo": {"name": self.client_name, "version": "1.0"},
+                },
+            )
+        except BaseException:
+            await self.close()
+            raise
+        self.server_info = init.get("serverInfo") or {}
+        await self.notify("notifications/initialized")
+
+    async def close(self) -> None:
+        """Stop the server and fail any requests still waiting for a reply."""
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        if proc.stdin and not proc.stdin.is_closing():
+            proc.stdin.close()
+        try:
+            await asyncio.wait_for(proc.wait(), 5)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+        if self._reader is not None:
+            await self._reader
+            self._reader = None
+        self._fail_pending(McpError("MCP client closed"))
+
+    async def request(self, method: str, params: Optional[dict] = None) -> dict:
+        """Send a JSON-RPC request and wait for its result."""
+        if self._proc is None:
+            raise McpError("MCP client is not started")
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        message = {"jsonrpc": "2.0", "id": request_id, "method": method}
+        if params is not None:
+            message["params"] = params
+        try:
+            await self._send(message)
+            return await asyncio.wait_for(future, self.timeout)
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def notify(self, method: str, params: Optional[dict] = None) -> None:
+        message = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        await self._send(message)
+
+    async def list_tools(self) -> list[dict]:
+        return (await self.request("tools/list")).get("tools") or []
+
+    async def call_tool(self, tool_name: str, arguments: dict) -> Any:
+        """Call an MCP tool and return its decoded result (see _decode_tool_result)."""
+        result = await self.request("tools/call", {"name": tool_name, "arguments": arguments})
+        return _decode_tool_result(result)
+
+    async def _send(self, message: dict) -> None:
+        line = (json.dumps(message) + "\n").encode()
+        async with self._write_lock:
+            if self._proc is None or self._proc.stdin.is_closing():
+                raise McpError("MCP server is not running")
+            self._proc.stdin.write(line)
+            try:
+                await self._proc.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError) as e:
+                raise McpError(f"MCP server went away: {e}") from e
+
+    async def _read_loop(self) -> None:
+        stdout = self._proc.stdout
+        while True:
+            try:
+                line = await stdout.readline()
+            except (ValueError, asyncio.LimitOverrunError) as e:
+                self._fail_pending(McpError(f"Unreadable MCP message: {e}"))
+                continue
+            if not line:
+                break
+            try:
+                message = json.loads(line)
+            except ValueError:
+                print(f"[mcp_client] Ignoring non-JSON output: {line[:200]!r}")
+                continue
+            if "method" in message:
+                await self._handle_server_message(message)
+                continue
+            future = self._pending.get(message.get("id"))
+            if future is None or future.done():
+                continue
+            if "error" in message:
+                error = message["error"] or {}
+                future.set_exception(McpError(f"{error.get('message', 'error')} (code {error.get('code')})"))
+            else:
+                future.set_result(message.get("result") or {})
+        self._fail_pending(McpError("MCP server exited"))
+
+    async def _handle_server_message(self, message: dict) -> None:
+        # Notifications need no reply; answer pings and decline other server requests.
+        if "id" not in message:
+            return
+        if message["method"] == "ping":
+            reply = {"jsonrpc": "2.0", "id": message["id"], "result": {}}
+        else:
+            reply = {
+                "jsonrpc": "2.0",
+                "id": message["id"],
+                "error": {"code": -32601, "message": f"Method not found: {message['method']}"},
+            }
+        try:
+            await self._send(reply)
+        except McpError:
+            pass
+
+    def _fail_pending(self, error: McpError) -> None:
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
@@ -0,0 +1,189 @@
+import heapq
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Iterable, Optional
+
+import requests
+
+from news_tool import _parse_published_at, iter_stock_news
+from tracing import profiled
+
+# ---------------------------------------------------------------------------
+# Incremental news polling with per-ticker cursors
+# ---------------------------------------------------------------------------
+
+DEFAULT_STATE_PATH = "news_poller_state.json"
+
+
+def _default_fetch(ticker: str, since: Optional[datetime]) -> Iterable[dict]:
+    # Without a cursor only take the latest page's worth; with one, page back to it.
+    if since is None:
+        return iter_stock_news(ticker=ticker, max_articles=10, max_requests=1)
+    return iter_stock_news(ticker=ticker, since=since, max_articles=200, max_requests=5)
+
+
+class NewsPoller:
+    """
+    Polls news for a set of tickers and emits only articles newer than each
+    ticker's high-water mark on published_at.
+
+    Each ticker has its own polling interval between min_interval and
+    max_interval seconds: it halves when a poll finds new articles and grows by
+    `backoff` when it finds none (or the providers fail), so quiet tickers are
+    polled rarely and busy ones often. Cursors and intervals are persisted to
+    `state_path` after every poll.
+
+    fetch(ticker, since) must return articles newest first, stopping at or
+    before `since`; it defaults to iter_stock_news.
+    """
+
+    def __init__(
+        self,
+        tickers: list[str],
+        on_articles: Callable[[str, list[dict]], None],
+        state_path: Optional[str] = DEFAULT_STATE_PATH,
+        min_interval: float = 60,
+        max_interval: float = 3600,
+        backoff: float = 1.5,
+        fetch: Callable[[str, Optional[datetime]], Iterable[dict]] = _default_fetch,
+    ):
+        self.on_articles = on_articles
+        self.state_path = state_path
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.fetch = fetch
+        self._state: dict[str, dict] = {}
+        self._queue: list[tuple[float, str]] = []
+        self._stop = threading.Event()
+
+        if state_path:
+            self._load()
+
+        # Every ticker is due immediately on start-up.
+        for ticker in dict.fromkeys(t.strip().upper() for t in tickers if t and t.strip()):
+            state = self._state.setdefault(
+                ticker, {"cursor": None, "seen": [], "interval": min_interval}
+            )
+            state["interval"] = min(max(state["interval"], min_interval), max_interval)
+            heapq.heappush(self._queue, (0.0, ticker))
+
+    def cursor(self, ticker: str) -> Optional[datetime]:
+        value = self._state.get(ticker.upper(), {}).get("cursor")
+        return _parse_published_at(value) if value else None
+
+    def interval(self, ticker: str) -> float:
+        return self._state[ticker.upper()]["interval"]
+
+    def poll_ticker(self, ticker: str) -> list[dict]:
+        """Poll one ticker now, advance its cursor and interval, and return its new articles."""
+        state = self._state[ticker]
+        cursor = _parse_published_at(state["cursor"]) if state["cursor"] else None
+        seen = set(state["seen"])
+
+        try:
+            fetched = list(self.fetch(ticker, cursor))
+        except (RuntimeError, requests.RequestException, OSError) as e:
+            # Providers exhausted or a network blip: back off like an empty poll.
+            print(f"[news_poller] {ticker}: {e}")
+            fetched = []
+
+        new = []
+        for article in fetched:
+            published = _parse_published_at(article.get("published_at") or "")
+            if cursor is not None and (published < cursor or (published == cursor and article.get("url") in seen)):
+                continue
+            new.append(article)
+
+        if new:
+            newest = max(_parse_published_at(a.get("published_at") or "") for a in new)
+            if cursor is None or newest > cursor:
+                seen = set()
+                cursor = newest
+            # Remember which URLs share the cursor timestamp so they aren't re-emitted.
+            seen.update(a.get("url") for a in new if _parse_published_at(a.get("published_at") or "") == cursor)
+            state["cursor"] = cursor.isoformat()
+            state["seen"] = sorted(u for u in seen if u)
+            state["interval"] = max(self.min_interval, state["interval"] / 2)
+        else:
+            state["interval"] = min(self.max_interval, state["interval"] * self.backoff)
+
+        return new
+
+    def poll_once(self, now: Optional[float] = None) -> dict[str, list[dict]]:
+        """Poll every ticker that is due at `now`, call on_articles for each with news, and reschedule them."""
+        now = time.time() if now is None else now
+        results: dict[str, list[dict]] = {}
+        polled = False
+
+        while self._queue and self._queue[0][0] <= now:
+            _, ticker = heapq.heappop(self._queue)
+            polled = True
+            new = self.poll_ticker(ticker)
+            if new:
+                results[ticker] = new
+                self.on_articles(ticker, new)
+            heapq.heappush(self._queue, (now + self._state[ticker]["interval"], ticker))
+
+        if self.state_path and polled:
+            self._save()
+        return results
+
+    def next_due(self) -> Optional[float]:
+        return self._queue[0][0] if self._queue else None
+
+    def run_forever(self) -> None:
+        """Poll until stop() is called, sleeping until the next ticker is due."""
+        while not self._stop.is_set():
+            self.poll_once()
+            due = self.next_due()
+            if due is None:
+                return
+            self._stop.wait(max(0.0, due - time.time()))
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _load(self) -> None:
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                self._state = json.load(f)
+        except (OSError, ValueError):
+            self._state = {}
+
+    def _save(self) -> None:
+        tmp_path = f"{self.state_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._state, f)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            print(f"[news_poller] Failed to persist state: {e}")
+
+
+@profiled
+def main():
+    import sys
+
+    tickers = sys.argv[1:]
+    if not tickers:
+        print("Usage: python news_poller.py TICKER [TICKER ...]")
+        return
+
+    def print_articles(ticker: str, articles: list[dict]):
+        for a in articles:
+            print(f"[{ticker}] {a.get('published_at', '')} {a.get('headline', '')}")
+            print(f"    {a.get('url', '')}")
+
+    poller = NewsPoller(tickers, print_articles)
+    try:
+        poller.run_forever()
+    except KeyboardInterrupt:
+        poller.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,65 @@
+import asyncio
+import atexit
+import functools
+import hashlib
+import json
+import math
 import os
+import re
+import sqlite3
+import threading
+import time
+import weakref
+import zlib
 import requests
-import pandas as pd
+import requests.adapters
+from collections import OrderedDict, defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from datetime import datetime, timezone
-from typing import Optional
+from email.utils import parsedate_to_datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from typing import Awaitable, Callable, Iterable, Iterator, Optional
 from dotenv import load_dotenv
 
+from tracing import span, traced
+
 load_dotenv()
 
 # ---------------------------------------------------------------------------
 # Ticker / company name resolution
 # ---------------------------------------------------------------------------
 
-_nasdaq = pd.read_json("JSON/nasdaq.json")
-_nyse = pd.read_json("JSON/nyse.json")
-_stocks_df = pd.concat([_nasdaq, _nyse], axis=0, ignore_index=True)
+# Parsed on first lookup rather than at import, so importing news_tool (e.g.
+# for ProviderError or the schemas) doesn't pay for reading ~5k listings.
+_STOCK_FILES = ("JSON/nasdaq.json", "JSON/nyse.json")
+_stock_index: Optional[tuple[dict[str, str], dict[str, str]]] = None
+_stock_index_lock = threading.Lock()
 
 
+def _get_stock_index() -> tuple[dict[str, str], dict[str, str]]:
+    """
+    Return ({TICKER: name}, {lowercased name: ticker}) built from the local
+    JSON files. The first listing wins for duplicates (NASDAQ before NYSE).
+    """
+    global _stock_index
+    if _stock_index is None:
+        with _stock_index_lock:
+            if _stock_index is None:
+                by_ticker: dict[str, str] = {}
+                by_name: dict[str, str] = {}
+                for path in _STOCK_FILES:
+                    with open(path, "r", encoding="utf-8") as f:
+                        for row in json.load(f):
+                            ticker, name = row.get("ticker"), row.get("name")
+                            if isinstance(ticker, str):
+                                by_ticker.setdefault(ticker.upper(), name)
+                                if isinstance(name, str):
+                                    by_name.setdefault(name.lower(), ticker)
+                _stock_index = (by_ticker, by_name)
+    return _stock_index
+
+
+@traced("news.resolve_inputs")
 def resolve_inputs(
     ticker: Optional[str],
     company_name: Optional[str],
@@ -24,17 +68,69 @@ def resolve_inputs(
     if not ticker and not company_name:
         raise ValueError("At least one of ticker or company_name must be provided.")
 
+    by_ticker, by_name = _get_stock_index()
+
     if ticker and not company_name:
-        row = _stocks_df[_stocks_df["ticker"].str.upper() == ticker.upper()]
-        company_name = row.iloc[0]["name"] if not row.empty else ticker
+        company_name = by_ticker.get(ticker.upper(), ticker)
 
     if company_name and not ticker:
-        row = _stocks_df[_stocks_df["name"].str.lower() == company_name.lower()]
-        ticker = row.iloc[0]["ticker"].upper() if not row.empty else company_name.upper()
+        ticker = by_name.get(company_name.lower(), company_name).upper()
 
     return ticker.upper(), company_name
 
 
+def resolve_many(tickers: list[str]) -> dict[str, str]:
+    """
+    Resolve many tickers to company names in one pass over the stock index.
+    Returns {TICKER: company_name}; unknown tickers map to themselves, as in
+    resolve_inputs.
+    """
+    by_ticker, _ = _get_stock_index()
+    wanted = [t.strip().upper() for t in tickers if t and t.strip()]
+    return {t: (by_ticker.get(t) or t) for t in wanted}
+
+
+# ---------------------------------------------------------------------------
+# HTTP clients
+# ---------------------------------------------------------------------------
+
+# One keep-alive session for all sync provider calls, so repeat requests to the
+# same host reuse the TCP+TLS connection instead of handshaking every time.
+_HTTP_SESSION = requests.Session()
+_HTTP_SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=32))
+
+# Async clients are bound to the event loop that created them, so keep one per loop.
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, object]" = weakref.WeakKeyDictionary()
+
+
+def _get_async_client():
+    """
+    Return the shared httpx.AsyncClient for the running event loop, or None
+    if httpx is not installed (callers then run the sync path in a thread).
+    """
+    try:
+        import httpx
+    except ImportError:
+        return None
+
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=10,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+        )
+        _ASYNC_CLIENTS[loop] = client
+    return client
+
+
+async def close_async_http_client() -> None:
+    """Close the shared async HTTP client for the running event loop, if one was created."""
+    client = _ASYNC_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
 # ---------------------------------------------------------------------------
 # Provider base / exception
 # ---------------------------------------------------------------------------
@@ -43,12 +139,264 @@ class ProviderError(Exception):
     pass
 
 
+class RateLimitError(ProviderError):
+    """The provider rejected the request for rate limit or quota reasons (HTTP 429)."""
+
+
+class QuotaExceededError(RateLimitError):
+    """Raised without a network call when a provider is over quota or cooling down."""
+
+
 class NewsProvider:
+    """
+    A news API. Subclasses describe the request (build_params) and how to
+    normalize the response (parse_response); the base class performs the HTTP
+    call on either the pooled sync session (fetch) or the shared async client
+    (fetch_async). Providers that support pagination also implement
+    build_page_params and next_cursor, used by fetch_page.
+    """
+
     name: str = "base"
+    BASE_URL: str = ""
+    PAGE_SIZE_MAX: int = 10
 
-    def fetch(self, ticker: str, company_name: str, max_articles: int) -> list[dict]:
+    def build_params(self, company_name: str, max_articles: int) -> dict:
         raise NotImplementedError
 
+    def parse_response(self, status_code: int, text: str, json_body: Callable[[], dict]) -> list[dict]:
+        raise NotImplementedError
+
+    def build_page_params(
+        self,
+        company_name: str,
+        page_size: int,
+        cursor,
+        since: Optional[datetime],
+    ) -> dict:
+        raise NotImplementedError
+
+    def next_cursor(self, data: dict, cursor, page_size: int):
+        """Cursor for the page after `cursor`, or None when there are no more pages."""
+        raise NotImplementedError
+
+    def _get(self, params: dict):
+        quotas = _QUOTA_TRACKER
+        if quotas is not None:
+            quotas.acquire(self.name)
+        with span("news.http", provider=self.name, url=self.BASE_URL) as s:
+            resp = _HTTP_SESSION.get(self.BASE_URL, params=params, timeout=10)
+            s.set_attribute("http.status_code", resp.status_code)
+        if quotas is not None:
+            quotas.observe(self.name, resp.status_code, resp.headers)
+        return resp
+
+    def fetch(self, ticker: str, company_name: str, max_articles: int) -> list[dict]:
+        resp = self._get(self.build_params(company_name, max_articles))
+        return self.parse_response(resp.status_code, resp.text, resp.json)
+
+    def fetch_page(
+        self,
+        company_name: str,
+        page_size: int,
+        cursor=None,
+        since: Optional[datetime] = None,
+    ) -> tuple[list[dict], object]:
+        """Fetch one page of results. Returns (articles, next cursor or None)."""
+        resp = self._get(self.build_page_params(company_name, page_size, cursor, since))
+        body = {}
+
+        def json_body() -> dict:
+            if "data" not in body:
+                body["data"] = resp.json()
+            return body["data"]
+
+        articles = self.parse_response(resp.status_code, resp.text, json_body)
+        return articles, self.next_cursor(json_body(), cursor, page_size)
+
+    async def fetch_async(self, ticker: str, company_name: str, max_articles: int) -> list[dict]:
+        client = _get_async_client()
+        if client is None:
+            return await asyncio.to_thread(self.fetch, ticker, company_name, max_articles)
+
+        params = self.build_params(company_name, max_articles)
+        quotas = _QUOTA_TRACKER
+        if quotas is not None:
+            quotas.acquire(self.name)
+        with span("news.http", provider=self.name, url=self.BASE_URL, transport="async") as s:
+            resp = await client.get(self.BASE_URL, params=params)
+            s.set_attribute("http.status_code", resp.status_code)
+        if quotas is not None:
+            quotas.observe(self.name, resp.status_code, resp.headers)
+        return self.parse_response(resp.status_code, resp.text, resp.json)
+
+
+# ---------------------------------------------------------------------------
+# Provider quotas
+# ---------------------------------------------------------------------------
+
+# Free-tier limits. cooldown is how long to back off after a 429 that carries
+# no Retry-After / X-RateLimit-Reset header.
+DEFAULT_PROVIDER_QUOTAS: dict[str, dict] = {
+    "newsdata": {"per_day": 200, "per_minute": None, "cooldown": 900},
+    "newsapi": {"per_day": 100, "per_minute": None, "cooldown": 3600},
+}
+
+
+class QuotaTracker:
+    """
+    Per-provider request budget shared by all NewsProvider instances.
+
+    acquire() counts a request against the provider's per-minute and per-day
+    limits, raising QuotaExceededError instead when the budget is spent or the
+    provider is cooling down after a 429. observe() reads the response status
+    and rate-limit headers (Retry-After, X-RateLimit-Remaining/Reset) to set
+    the cool-down. When `path` is given, counters are persisted to that JSON
+    file so they survive restarts.
+    """
+
+    def __init__(self, limits: Optional[dict[str, dict]] = None, path: Optional[str] = None):
+        self.limits = {**DEFAULT_PROVIDER_QUOTAS, **(limits or {})}
+        self.path = path
+        self._state: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        if path:
+            self._load()
+
+    def _provider_state(self, name: str, now: float) -> dict:
+        today = datetime.fromtimestamp(now, timezone.utc).date().isoformat()
+        state = self._state.setdefault(
+            name, {"day": today, "day_count": 0, "recent": [], "cooldown_until": 0.0}
+        )
+        if state["day"] != today:
+            state["day"] = today
+            state["day_count"] = 0
+        state["recent"] = [t for t in state["recent"] if now - t < 60]
+        return state
+
+    def _blocked_reason(self, name: str, state: dict, now: float) -> Optional[str]:
+        limits = self.limits.get(name, {})
+        if state["cooldown_until"] > now:
+            return f"rate limit cool-down for another {state['cooldown_until'] - now:.0f}s"
+        per_day = limits.get("per_day")
+        if per_day is not None and state["day_count"] >= per_day:
+            return f"daily quota exhausted ({state['day_count']}/{per_day})"
+        per_minute = limits.get("per_minute")
+        if per_minute is not None and len(state["recent"]) >= per_minute:
+            return f"per-minute quota exhausted ({per_minute}/min)"
+        return None
+
+    def acquire(self, name: str) -> None:
+        now = time.time()
+        with self._lock:
+            state = self._provider_state(name, now)
+            reason = self._blocked_reason(name, state, now)
+            if reason:
+                raise QuotaExceededError(f"{name} skipped: {reason}")
+            state["day_count"] += 1
+            state["recent"].append(now)
+        if self.path:
+            self._save()
+
+    def observe(self, name: str, status_code: int, headers) -> None:
+        now = time.time()
+        reset_in = _parse_rate_limit_reset(headers, now)
+        with self._lock:
+            state = self._provider_state(name, now)
+            if status_code == 429:
+                cooldown = reset_in if reset_in is not None else self.limits.get(name, {}).get("cooldown", 60)
+                state["cooldown_until"] = now + cooldown
+            elif _header_value(headers, "X-RateLimit-Remaining") == "0" and reset_in is not None:
+                state["cooldown_until"] = now + reset_in
+            else:
+                return
+        if self.path:
+            self._save()
+
+    def is_available(self, name: str) -> bool:
+        """True if acquire() would currently let a request to `name` through."""
+        now = time.time()
+        with self._lock:
+            return self._blocked_reason(name, self._provider_state(name, now), now) is None
+
+    def usage(self) -> dict[str, dict]:
+        now = time.time()
+        out = {}
+        with self._lock:
+            for name in list(self._state):
+                state = self._provider_state(name, now)
+                out[name] = {
+                    "day_count": state["day_count"],
+                    "minute_count": len(state["recent"]),
+                    "cooldown_remaining": max(0.0, state["cooldown_until"] - now),
+                }
+        return out
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._state = json.load(f)
+        except (OSError, ValueError):
+            self._state = {}
+
+    def _save(self) -> None:
+        with self._lock:
+            data = json.dumps(self._state)
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[news_tool] Failed to persist provider quotas: {e}")
+
+
+def _header_value(headers, name: str) -> Optional[str]:
+    value = headers.get(name) if headers is not None else None
+    return value.strip() if isinstance(value, str) else None
+
+
+def _parse_rate_limit_reset(headers, now: float) -> Optional[float]:
+    """Seconds until the provider's limit resets, from Retry-After or X-RateLimit-Reset."""
+    retry_after = _header_value(headers, "Retry-After")
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - now)
+            except (TypeError, ValueError):
+                pass
+
+    reset = _header_value(headers, "X-RateLimit-Reset")
+    if reset:
+        try:
+            value = float(reset)
+        except ValueError:
+            return None
+        # Some APIs send an epoch timestamp, others a number of seconds.
+        return max(0.0, value - now) if value > 1_000_000_000 else value
+
+    return None
+
+
+# Disabled by default; enable with configure_quota_tracker().
+_QUOTA_TRACKER: Optional[QuotaTracker] = None
+
+
+def configure_quota_tracker(
+    limits: Optional[dict[str, dict]] = None,
+    path: Optional[str] = None,
+) -> QuotaTracker:
+    """Enable provider quota tracking (replacing any existing tracker) and return it."""
+    global _QUOTA_TRACKER
+    _QUOTA_TRACKER = QuotaTracker(limits=limits, path=path)
+    return _QUOTA_TRACKER
+
+
+def disable_quota_tracker() -> None:
+    global _QUOTA_TRACKER
+    _QUOTA_TRACKER = None
+
 
 # ---------------------------------------------------------------------------
 # newsdata.io provider
@@ -58,28 +406,37 @@ class NewsdataProvider(NewsProvider):
     name = "newsdata"
     BASE_URL = "https://newsdata.io/api/1/latest"
 
-    def fetch(self, ticker: str, company_name: str, max_articles: int) -> list[dict]:
+    def build_params(self, company_name: str, max_articles: int) -> dict:
         api_key = os.getenv("NEWSDATA_API_KEY")
         if not api_key:
             raise ProviderError("NEWSDATA_API_KEY not set")
 
-        params = {
+        return {
             "apikey": api_key,
             "q": company_name,
             "language": "en",
             "size": min(max_articles, 10),  # free tier max is 10
         }
 
-        resp = requests.get(self.BASE_URL, params=params, timeout=10)
+    def build_page_params(self, company_name, page_size, cursor, since) -> dict:
+        # The latest endpoint has no absolute start date; the since cutoff is applied by the caller.
+        params = self.build_params(company_name, page_size)
+        if cursor:
+            params["page"] = cursor
+        return params
+
+    def next_cursor(self, data: dict, cursor, page_size: int):
+        return data.get("nextPage") or None
 
-        if resp.status_code == 429:
-            raise ProviderError("newsdata.io rate limit exceeded")
-        if resp.status_code == 401:
+    def parse_response(self, status_code: int, text: str, json_body: Callable[[], dict]) -> list[dict]:
+        if status_code == 429:
+            raise RateLimitError("newsdata.io rate limit exceeded")
+        if status_code == 401:
             raise ProviderError("newsdata.io invalid API key")
-        if not resp.ok:
-            raise ProviderError(f"newsdata.io error {resp.status_code}: {resp.text[:200]}")
+        if status_code >= 400:
+            raise ProviderError(f"newsdata.io error {status_code}: {text[:200]}")
 
-        data = resp.json()
+        data = json_body()
         articles = data.get("results", [])
 
         results = []
@@ -101,13 +458,14 @@ class NewsdataProvider(NewsProvider):
 class NewsApiProvider(NewsProvider):
     name = "newsapi"
     BASE_URL = "https://newsapi.org/v2/everything"
+    PAGE_SIZE_MAX = 100
 
-    def fetch(self, ticker: str, company_name: str, max_articles: int) -> list[dict]:
+    def build_params(self, company_name: str, max_articles: int) -> dict:
         api_key = os.getenv("NEWSAPI_KEY")
         if not api_key:
             raise ProviderError("NEWSAPI_KEY not set")
 
-        params = {
+        return {
             "apiKey": api_key,
             "q": company_name,
             "language": "en",
@@ -115,17 +473,31 @@ class NewsApiProvider(NewsProvider):
             "pageSize": min(max_articles, 100),
         }
 
-        resp = requests.get(self.BASE_URL, params=params, timeout=10)
-
-        if resp.status_code == 429:
-            raise ProviderError("newsapi.org rate limit exceeded")
-        if resp.status_code == 401:
+    def build_page_params(self, company_name, page_size, cursor, since) -> dict:
+        params = self.build_params(company_name, page_size)
+        params["page"] = cursor or 1
+        if since is not None:
+            params["from"] = since.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        return params
+
+    def next_cursor(self, data: dict, cursor, page_size: int):
+        page = cursor or 1
+        if page * page_size >= (data.get("totalResults") or 0):
+            return None
+        return page + 1
+
+    def parse_response(self, status_code: int, text: str, json_body: Callable[[], dict]) -> list[dict]:
+        if status_code == 429:
+            raise RateLimitError("newsapi.org rate limit exceeded")
+        if status_code == 401:
             raise ProviderError("newsapi.org invalid API key")
-        if not resp.ok:
-            raise ProviderError(f"newsapi.org error {resp.status_code}: {resp.text[:200]}")
+        if status_code >= 400:
+            raise ProviderError(f"newsapi.org error {status_code}: {text[:200]}")
 
-        data = resp.json()
+        data = json_body()
         if data.get("status") != "ok":
+            if data.get("code") == "rateLimited":
+                raise RateLimitError(f"newsapi.org {data.get('code')}: {data.get('message')}")
             raise ProviderError(f"newsapi.org returned status={data.get('status')}: {data.get('message')}")
 
         articles = data.get("articles", [])
@@ -153,23 +525,428 @@ _PROVIDERS: dict[str, NewsProvider] = {
 
 
 # ---------------------------------------------------------------------------
-# Main tool: get_stock_news
+# Response cache
 # ---------------------------------------------------------------------------
 
-def get_stock_news(
-    ticker: Optional[str] = None,
-    company_name: Optional[str] = None,
-    max_articles: int = 10,
-    providers: list[str] = ["newsdata", "newsapi"],
-) -> list[dict]:
+class NewsCache:
+    """
+    TTL + LRU cache for get_stock_news results.
+
+    Entries are fresh for `ttl` seconds. For a further `stale_ttl` seconds a
+    stale entry is still returned immediately while a background thread
+    refreshes it (stale-while-revalidate). At most `max_entries` are kept; the
+    least recently used entry is evicted first. When `path` is given the cache
+    is loaded from and saved to that JSON file so it survives restarts; writes
+    are batched to at most one per `save_interval` seconds (flush() forces one,
+    and pending writes are flushed at exit).
+
+    Callers get copies of the cached articles, so mutating a result doesn't
+    change what other callers see.
     """
-    Fetch recent news articles for a company or stock.
 
-    Returns a list of dicts with keys:
-        headline, url, summary, published_at, source
+    def __init__(
+        self,
+        ttl: float = 900,
+        max_entries: int = 256,
+        stale_ttl: float = 0,
+        path: Optional[str] = None,
+        save_interval: float = 1.0,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stale_ttl = stale_ttl
+        self.path = path
+        self.save_interval = save_interval
+        self._dirty = False
+        self._last_save = 0.0
+        self._save_timer: Optional[threading.Timer] = None
+        self._save_lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, list[dict]]] = OrderedDict()
+        self._refreshing: set[str] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "evictions": 0}
+        if path:
+            self._load()
+            atexit.register(self.flush)
+
+    @staticmethod
+    def _copy(articles: list[dict]) -> list[dict]:
+        return [dict(a) for a in articles]
+
+    @staticmethod
+    def make_key(
+        ticker: str,
+        company_name: str,
+        max_articles: int,
+        providers: list[str],
+        merge: bool = False,
+    ) -> str:
+        parts = [
+            ticker.strip().upper(),
+            " ".join(company_name.split()).lower(),
+            int(max_articles),
+            [p.strip().lower() for p in providers],
+        ]
+        if merge:
+            parts.append("merge")
+        return json.dumps(parts)
+
+    def get(self, key: str) -> Optional[tuple[list[dict], bool]]:
+        """Return (articles, is_fresh) for key, or None if missing or fully expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            age = time.time() - entry[0]
+            if age > self.ttl + self.stale_ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return self._copy(entry[1]), age <= self.ttl
+
+    def set(self, key: str, articles: list[dict]) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), self._copy(articles))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+        if self.path:
+            self._schedule_save()
+
+    def _lookup(self, key: str) -> tuple[Optional[list[dict]], bool]:
+        """Return (cached articles or None, whether the caller should start a background refresh)."""
+        cached = self.get(key)
+        with self._lock:
+            if cached is None:
+                self._stats["misses"] += 1
+                return None, False
+            articles, fresh = cached
+            if fresh:
+                self._stats["hits"] += 1
+                return articles, False
+            self._stats["stale_hits"] += 1
+            start_refresh = key not in self._refreshing
+            self._refreshing.add(key)
+            return articles, start_refresh
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], list[dict]]) -> list[dict]:
+        """Serve key from the cache, calling fetch() on a miss and refreshing stale entries in the background."""
+        articles, start_refresh = self._lookup(key)
+        if articles is None:
+            articles = fetch()
+            if articles:
+                self.set(key, articles)
+            return articles
+
+        if start_refresh:
+            threading.Thread(target=self._refresh, args=(key, fetch), daemon=True).start()
+        return articles
+
+    async def get_or_fetch_async(self, key: str, fetch: Callable[[], Awaitable[list[dict]]]) -> list[dict]:
+        """Async counterpart of get_or_fetch; stale entries are refreshed in a background task."""
+        articles, start_refresh = self._lookup(key)
+        if articles is None:
+            articles = await fetch()
+            if articles:
+                self.set(key, articles)
+            return articles
+
+        if start_refresh:
+            task = asyncio.create_task(self._refresh_async(key, fetch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return articles
+
+    def _refresh(self, key: str, fetch: Callable[[], list[dict]]) -> None:
+        try:
+            articles = fetch()
+            if articles:
+                self.set(key, articles)
+        except Exception as e:
+            print(f"[news_tool] Background cache refresh failed: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    async def _refresh_async(self, key: str, fetch: Callable[[], Awaitable[list[dict]]]) -> None:
+        try:
+            articles = await fetch()
+            if articles:
+                self.set(key, articles)
+        except Exception as e:
+            print(f"[news_tool] Background cache refresh failed: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self.path:
+            self._dirty = True
+            self.flush()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "size": len(self._entries)}
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        for key, stored_at, articles in data:
+            self._entries[key] = (stored_at, articles)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _schedule_save(self) -> None:
+        """Write now if the last write is older than save_interval, else once the interval is up."""
+        with self._save_lock:
+            self._dirty = True
+            if self._save_timer is not None:
+                return
+            wait = self._last_save + self.save_interval - time.monotonic()
+            if wait > 0:
+                self._save_timer = threading.Timer(wait, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+                return
+        self.flush()
+
+    def flush(self) -> None:
+        """Write pending changes to `path` now."""
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty or not self.path:
+                return
+            self._dirty = False
+            self._last_save = time.monotonic()
+            self._save()
+
+    def _save(self) -> None:
+        # Called with _save_lock held, so writers never share the temp file.
+        with self._lock:
+            data = [[k, stored_at, articles] for k, (stored_at, articles) in self._entries.items()]
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[news_tool] Failed to persist news cache: {e}")
+
+
+# Disabled by default; enable with configure_news_cache().
+_NEWS_CACHE: Optional[NewsCache] = None
+
+
+def configure_news_cache(
+    ttl: float = 900,
+    max_entries: int = 256,
+    stale_ttl: float = 0,
+    path: Optional[str] = None,
+    save_interval: float = 1.0,
+) -> NewsCache:
+    """Enable the get_stock_news response cache (replacing any existing one) and return it."""
+    global _NEWS_CACHE
+    _NEWS_CACHE = NewsCache(
+        ttl=ttl, max_entries=max_entries, stale_ttl=stale_ttl, path=path, save_interval=save_interval
+    )
+    return _NEWS_CACHE
+
+
+def disable_news_cache() -> None:
+    global _NEWS_CACHE
+    _NEWS_CACHE = None
+
+
+# ---------------------------------------------------------------------------
+# Cross-provider merge: URL canonicalization + near-duplicate removal
+# ---------------------------------------------------------------------------
+
+_TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid",
+    "ref", "ref_src", "referrer", "cmpid", "ocid", "smid", "sr_share",
+    "guccounter", "guce_referrer", "guce_referrer_sig", "outputtype", "amp",
+}
+
+# Headlines whose 4-character shingle sets overlap at least this much (Jaccard)
+# are treated as the same story.
+_NEAR_DUPLICATE_JACCARD = 0.7
+# MinHash LSH: 64 hash permutations in 16 bands of 4 rows. Two headlines share
+# a band bucket with high probability once their Jaccard similarity passes ~0.5,
+# so only bucket-mates are compared exactly and dedup stays roughly linear.
+_MINHASH_PERMUTATIONS = 64
+_MINHASH_BANDS = 16
+_MINHASH_PRIME = 4294967311  # smallest prime above 2**32
+
+# Trailing " - Reuters" / " | CNBC" style source attributions.
+_SOURCE_SUFFIX_RE = re.compile(r"\s+[-|\u2013\u2014]\s+[^-|\u2013\u2014]{1,40}$")
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def canonicalize_url(url: str) -> str:
     """
-    ticker, company_name = resolve_inputs(ticker, company_name)
+    Normalize an article URL so the same story links compare equal: lowercase
+    host without "www."/"amp." prefixes, AMP path variants (a leading /amp/ or
+    trailing /amp segment, .amp suffixes) removed, tracking parameters
+    (utm_*, fbclid, ...) dropped, remaining query sorted, no fragment. The
+    scheme becomes https; non-default ports are kept.
+    """
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    for prefix in ("www.", "amp.", "m."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port is not None and port not in (80, 443):
+        host = f"{host}:{port}"
+
+    path = parts.path
+    if path.startswith("/amp/"):
+        path = path[len("/amp"):]
+    if path.endswith("/amp") or path.endswith("/amp/"):
+        path = path[: path.rindex("/amp")]
+    elif path.endswith(".amp"):
+        path = path[: -len(".amp")]
+    elif path.endswith(".amp.html"):
+        path = path[: -len(".amp.html")] + ".html"
+    path = path.rstrip("/")
+
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    )
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def _headline_shingles(headline: str) -> set[str]:
+    words = _WORD_RE.findall(_SOURCE_SUFFIX_RE.sub("", headline).lower())
+    text = " ".join(words)
+    return {text[i:i + 4] for i in range(max(1, len(text) - 3))} if text else set()
+
+
+@functools.lru_cache(maxsize=None)
+def _minhash_params():
+    """The fixed (a, b) permutation coefficients; numpy is imported on first dedup."""
+    import numpy as np
+
+    rng = np.random.default_rng(20240601)
+    a = rng.integers(1, 1 << 31, _MINHASH_PERMUTATIONS, dtype=np.uint64)
+    b = rng.integers(0, 1 << 31, _MINHASH_PERMUTATIONS, dtype=np.uint64)
+    return np, a, b
+
+
+def _minhash(shingles: set[str]) -> "np.ndarray":
+    """MinHash signature (one min per permutation) of a shingle set."""
+    np, a, b = _minhash_params()
+    x = np.fromiter((zlib.crc32(sh.encode()) for sh in shingles), dtype=np.uint64, count=len(shingles))
+    return ((np.outer(a, x) + b[:, None]) % _MINHASH_PRIME).min(axis=1)
+
+
+def _parse_published_at(value: str) -> datetime:
+    """Parse newsdata ("2025-01-01 10:00:00", UTC) and newsapi (ISO 8601) timestamps."""
+    if value:
+        try:
+            dt = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+            return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+        except ValueError:
+            pass
+    return datetime.min.replace(tzinfo=timezone.utc)
+
+
+def merge_articles(article_lists: list[list[dict]]) -> list[dict]:
+    """
+    Merge article lists from several providers, newest first.
+
+    Lists are given in provider priority order; when two articles are the same
+    story (same canonical URL, or near-identical headline by MinHash) the one
+    seen first is kept. Runs in roughly linear time in the number of articles.
+    """
+    seen_urls: set[str] = set()
+    buckets: dict[tuple[int, bytes], list[int]] = defaultdict(list)
+    kept_shingles: list[set[str]] = []
+    kept: list[dict] = []
+
+    for articles in article_lists:
+        for article in articles:
+            url = canonicalize_url(article.get("url") or "")
+            if url and url in seen_urls:
+                continue
+
+            shingles = _headline_shingles(article.get("headline") or "")
+            band_keys = []
+            if shingles:
+                signature = _minhash(shingles).reshape(_MINHASH_BANDS, -1)
+                band_keys = [(i, band.tobytes()) for i, band in enumerate(signature)]
+                candidates = {j for key in band_keys for j in buckets.get(key, ())}
+                if any(
+                    len(shingles & kept_shingles[j]) / len(shingles | kept_shingles[j]) >= _NEAR_DUPLICATE_JACCARD
+                    for j in candidates
+                ):
+                    continue
+
+            if url:
+                seen_urls.add(url)
+            for key in band_keys:
+                buckets[key].append(len(kept))
+            kept_shingles.append(shingles)
+            kept.append(article)
+
+    kept.sort(key=lambda a: _parse_published_at(a.get("published_at") or ""), reverse=True)
+    return kept
+
+
+def _merge_from_providers(
+    ticker: str,
+    company_name: str,
+    max_articles: int,
+    providers: list[str],
+) -> list[dict]:
+    """Fetch from every provider concurrently and return the merged, de-duplicated articles."""
+    candidates = [(name, _PROVIDERS[name]) for name in providers if name in _PROVIDERS]
+    results: list[list[dict]] = []
+    last_error = None
+
+    with ThreadPoolExecutor(max_workers=max(len(candidates), 1)) as executor:
+        futures = [executor.submit(p.fetch, ticker, company_name, max_articles) for _, p in candidates]
+        for (name, _), future in zip(candidates, futures):
+            try:
+                results.append(future.result())
+            except ProviderError as e:
+                print(f"[news_tool] {name} failed: {e}")
+                last_error = e
+
+    merged = merge_articles(results)
+    if not merged:
+        raise RuntimeError(
+            f"All news providers failed for {company_name} ({ticker}). Last error: {last_error}"
+        )
+    return merged[:max_articles]
 
+
+# ---------------------------------------------------------------------------
+# Main tool: get_stock_news
+# ---------------------------------------------------------------------------
+
+def _fetch_from_providers(
+    ticker: str,
+    company_name: str,
+    max_articles: int,
+    providers: list[str],
+) -> list[dict]:
+    """Try each provider in priority order and return the first non-empty result."""
     last_error = None
     for provider_name in providers:
         provider = _PROVIDERS.get(provider_name)
@@ -188,6 +965,235 @@ def get_stock_news(
     )
 
 
+def _race_providers(
+    ticker: str,
+    company_name: str,
+    max_articles: int,
+    providers: list[str],
+    hedge_delay: float,
+) -> list[dict]:
+    """
+    Hedged version of _fetch_from_providers.
+
+    The first provider starts immediately; each following provider starts after
+    `hedge_delay` seconds without an answer, or as soon as an earlier one fails
+    (hedge_delay=0 starts them all at once). The first non-empty result wins;
+    if several finish together, the one earlier in `providers` is preferred.
+    Losing requests are cancelled if not yet started and otherwise ignored.
+    Any exception from a provider (not just ProviderError) fails only that leg.
+    """
+    candidates = [(name, _PROVIDERS[name]) for name in providers if name in _PROVIDERS]
+    executor = ThreadPoolExecutor(max_workers=max(len(candidates), 1))
+    pending = {}  # future -> index in candidates (priority)
+    next_idx = 0
+    last_error = None
+
+    def launch_next():
+        nonlocal next_idx
+        provider = candidates[next_idx][1]
+        pending[executor.submit(provider.fetch, ticker, company_name, max_articles)] = next_idx
+        next_idx += 1
+
+    try:
+        while pending or next_idx < len(candidates):
+            if not pending:
+                launch_next()
+                continue
+
+            timeout = hedge_delay if next_idx < len(candidates) else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                launch_next()
+                continue
+
+            best = None
+            for future in sorted(done, key=pending.get):
+                name = candidates[pending.pop(future)][0]
+                try:
+                    articles = future.result()
+                except Exception as e:  # a timeout or connection error only sinks this leg
+                    print(f"[news_tool] {name} failed: {e}")
+                    last_error = e
+                    continue
+                if articles and best is None:
+                    best = articles
+            if best:
+                return best
+            if next_idx < len(candidates):
+                launch_next()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    raise RuntimeError(
+        f"All news providers failed for {company_name} ({ticker}). Last error: {last_error}"
+    )
+
+
+@traced("news.get_stock_news")
+def get_stock_news(
+    ticker: Optional[str] = None,
+    company_name: Optional[str] = None,
+    max_articles: int = 10,
+    providers: list[str] = ["newsdata", "newsapi"],
+    use_cache: bool = True,
+    hedge_delay: Optional[float] = None,
+    merge: bool = False,
+) -> list[dict]:
+    """
+    Fetch recent news articles for a company or stock.
+
+    Providers are tried one after another in priority order by default. Pass
+    hedge_delay (seconds) to start the next provider when the current one is
+    slow instead of waiting for its timeout; hedge_delay=0 races them all.
+
+    With merge=True every provider is queried and the results are combined:
+    duplicate stories (same canonical URL or near-identical headline) are
+    dropped and articles are returned newest first.
+
+    Results are served from the response cache when one has been enabled with
+    configure_news_cache(); pass use_cache=False to always hit the providers.
+
+    Returns a list of dicts with keys:
+        headline, url, summary, published_at, source
+    """
+    ticker, company_name = resolve_inputs(ticker, company_name)
+
+    def fetch() -> list[dict]:
+        if merge:
+            return _merge_from_providers(ticker, company_name, max_articles, providers)
+        if hedge_delay is not None:
+            return _race_providers(ticker, company_name, max_articles, providers, hedge_delay)
+        return _fetch_from_providers(ticker, company_name, max_articles, providers)
+
+    cache = _NEWS_CACHE
+    if cache is None or not use_cache:
+        return fetch()
+
+    key = NewsCache.make_key(ticker, company_name, max_articles, providers, merge)
+    return cache.get_or_fetch(key, fetch)
+
+
+async def _fetch_from_providers_async(
+    ticker: str,
+    company_name: str,
+    max_articles: int,
+    providers: list[str],
+    hedge_delay: Optional[float],
+) -> list[dict]:
+    """
+    Async counterpart of _fetch_from_providers / _race_providers. With
+    hedge_delay=None providers are tried one at a time; otherwise the next one
+    is started after hedge_delay seconds or on failure, and losers are cancelled.
+    """
+    candidates = [(name, _PROVIDERS[name]) for name in providers if name in _PROVIDERS]
+    pending: dict[asyncio.Task, int] = {}
+    next_idx = 0
+    last_error = None
+
+    def launch_next():
+        nonlocal next_idx
+        provider = candidates[next_idx][1]
+        pending[asyncio.create_task(provider.fetch_async(ticker, company_name, max_articles))] = next_idx
+        next_idx += 1
+
+    try:
+        while pending or next_idx < len(candidates):
+            if not pending:
+                launch_next()
+                continue
+
+            timeout = hedge_delay if next_idx < len(candidates) else None
+            done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                launch_next()
+                continue
+
+            best = None
+            for task in sorted(done, key=pending.get):
+                name = candidates[pending.pop(task)][0]
+                try:
+                    articles = task.result()
+                except Exception as e:  # e.g. an httpx timeout only sinks this leg
+                    print(f"[news_tool] {name} failed: {e}")
+                    last_error = e
+                    continue
+                if articles and best is None:
+                    best = articles
+            if best:
+                return best
+            if next_idx < len(candidates):
+                launch_next()
+    finally:
+        for task in pending:
+            task.cancel()
+
+    raise RuntimeError(
+        f"All news providers failed for {company_name} ({ticker}). Last error: {last_error}"
+    )
+
+
+async def _merge_from_providers_async(
+    ticker: str,
+    company_name: str,
+    max_articles: int,
+    providers: list[str],
+) -> list[dict]:
+    """Async counterpart of _merge_from_providers."""
+    candidates = [(name, _PROVIDERS[name]) for name in providers if name in _PROVIDERS]
+    outcomes = await asyncio.gather(
+        *(p.fetch_async(ticker, company_name, max_articles) for _, p in candidates),
+        return_exceptions=True,
+    )
+    results: list[list[dict]] = []
+    last_error = None
+    for (name, _), outcome in zip(candidates, outcomes):
+        if isinstance(outcome, ProviderError):
+            print(f"[news_tool] {name} failed: {outcome}")
+            last_error = outcome
+        elif isinstance(outcome, BaseException):
+            raise outcome
+        else:
+            results.append(outcome)
+
+    merged = merge_articles(results)
+    if not merged:
+        raise RuntimeError(
+            f"All news providers failed for {company_name} ({ticker}). Last error: {last_error}"
+        )
+    return merged[:max_articles]
+
+
+@traced("news.get_stock_news_async")
+async def get_stock_news_async(
+    ticker: Optional[str] = None,
+    company_name: Optional[str] = None,
+    max_articles: int = 10,
+    providers: list[str] = ["newsdata", "newsapi"],
+    use_cache: bool = True,
+    hedge_delay: Optional[float] = None,
+    merge: bool = False,
+) -> list[dict]:
+    """
+    Async version of get_stock_news with the same arguments and return value.
+
+    Provider requests go through a shared keep-alive httpx.AsyncClient when
+    httpx is installed, and through the sync session in a worker thread otherwise.
+    """
+    ticker, company_name = resolve_inputs(ticker, company_name)
+
+    async def fetch() -> list[dict]:
+        if merge:
+            return await _merge_from_providers_async(ticker, company_name, max_articles, providers)
+        return await _fetch_from_providers_async(ticker, company_name, max_articles, providers, hedge_delay)
+
+    cache = _NEWS_CACHE
+    if cache is None or not use_cache:
+        return await fetch()
+
+    key = NewsCache.make_key(ticker, company_name, max_articles, providers, merge)
+    return await cache.get_or_fetch_async(key, fetch)
+
+
 GET_STOCK_NEWS_SCHEMA = {
     "name": "get_stock_news",
     "description": (
@@ -216,71 +1222,756 @@ GET_STOCK_NEWS_SCHEMA = {
 }
 
 
+# ---------------------------------------------------------------------------
+# Batch fetch: get_stock_news_many
+# ---------------------------------------------------------------------------
+
+def iter_stock_news_many(
+    tickers: list[str],
+    max_articles: int = 10,
+    providers: list[str] = ["newsdata", "newsapi"],
+    per_provider_concurrency: int = 4,
+    use_cache: bool = True,
+) -> Iterator[tuple[str, list[dict], Optional[Exception]]]:
+    """
+    Fetch news for many tickers concurrently, yielding (ticker, articles, error)
+    as each ticker completes. error is None on success.
+
+    At most `per_provider_concurrency` requests run against each provider at
+    once. A ticker goes to the first provider (in priority order) with a free
+    slot, so load spreads across providers when the preferred one is busy.
+    A provider that raises RateLimitError is skipped for the rest of the batch.
+    """
+    resolved = resolve_many(tickers)
+    names = [name for name in providers if name in _PROVIDERS]
+    slots = {name: threading.BoundedSemaphore(per_provider_concurrency) for name in names}
+    exhausted: set[str] = set()
+
+    def acquire(remaining: list[str], preferred: str) -> str:
+        for name in remaining:
+            if slots[name].acquire(blocking=False):
+                return name
+        slots[preferred].acquire()
+        return preferred
+
+    def fetch(ticker: str, company_name: str, offset: int) -> list[dict]:
+        # Rotate which provider a ticker waits on when all are busy.
+        order = names[offset % len(names):] + names[:offset % len(names)] if names else []
+        remaining = [n for n in names if n not in exhausted]
+        last_error = None
+        while remaining:
+            preferred = next(n for n in order if n in remaining)
+            name = acquire(remaining, preferred)
+            remaining.remove(name)
+            if name in exhausted:
+                slots[name].release()
+                continue
+            try:
+                articles = _PROVIDERS[name].fetch(ticker, company_name, max_articles)
+            except ProviderError as e:
+                print(f"[news_tool] {name} failed for {ticker}: {e}")
+                if isinstance(e, RateLimitError):
+                    exhausted.add(name)
+                last_error = e
+                continue
+            finally:
+                slots[name].release()
+            if articles:
+                return articles
+        raise RuntimeError(
+            f"All news providers failed for {company_name} ({ticker}). Last error: {last_error}"
+        )
+
+    def run(ticker: str, company_name: str, offset: int) -> list[dict]:
+        cache = _NEWS_CACHE
+        if cache is None or not use_cache:
+            return fetch(ticker, company_name, offset)
+        key = NewsCache.make_key(ticker, company_name, max_articles, providers)
+        return cache.get_or_fetch(key, lambda: fetch(ticker, company_name, offset))
+
+    workers = max(1, per_provider_concurrency * max(len(names), 1))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(run, ticker, company_name, i): ticker
+            for i, (ticker, company_name) in enumerate(resolved.items())
+        }
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                yield ticker, future.result(), None
+            except Exception as e:
+                yield ticker, [], e
+
+
+def get_stock_news_many(
+    tickers: list[str],
+    max_articles: int = 10,
+    providers: list[str] = ["newsdata", "newsapi"],
+    per_provider_concurrency: int = 4,
+    use_cache: bool = True,
+) -> dict[str, list[dict]]:
+    """
+    Fetch news for every ticker in `tickers` concurrently.
+
+    Returns {TICKER: articles}. Tickers whose providers all failed map to an
+    empty list. Use iter_stock_news_many to consume results as they complete.
+    """
+    results: dict[str, list[dict]] = {}
+    for ticker, articles, error in iter_stock_news_many(
+        tickers, max_articles, providers, per_provider_concurrency, use_cache
+    ):
+        if error is not None:
+            print(f"[news_tool] {ticker}: {error}")
+        results[ticker] = articles
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Paginated iterator: iter_stock_news
+# ---------------------------------------------------------------------------
+
+def iter_stock_news(
+    ticker: Optional[str] = None,
+    company_name: Optional[str] = None,
+    providers: list[str] = ["newsdata", "newsapi"],
+    since: Optional[datetime] = None,
+    max_articles: int = 1000,
+    max_requests: int = 100,
+    page_size: Optional[int] = None,
+) -> Iterator[dict]:
+    """
+    Lazily yield normalized articles page by page, newest first, following the
+    provider's pagination (newsdata.io nextPage token, newsapi.org page number).
+
+    Stops at the first article older than `since`, after `max_articles`
+    articles or `max_requests` HTTP requests, or when the provider runs out of
+    pages. Only one page is held in memory at a time.
+
+    As in get_stock_news, a provider whose first page fails or comes back
+    empty falls through to the next one; the first provider with a non-empty
+    first page is used for the whole iteration, and a later page failing ends
+    it. Raises RuntimeError if no provider returns a non-empty first page.
+    """
+    ticker, company_name = resolve_inputs(ticker, company_name)
+    if since is not None and since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+
+    yielded = 0
+    requests_made = 0
+    last_error = None
+
+    for provider_name in providers:
+        provider = _PROVIDERS.get(provider_name)
+        if provider is None:
+            continue
+        size = min(page_size or provider.PAGE_SIZE_MAX, provider.PAGE_SIZE_MAX)
+        cursor = None
+        pages = 0
+
+        while yielded < max_articles and requests_made < max_requests:
+            try:
+                articles, cursor = provider.fetch_page(company_name, size, cursor, since)
+            except ProviderError as e:
+                print(f"[news_tool] {provider_name} failed on page {pages + 1}: {e}")
+                last_error = e
+                break
+            requests_made += 1
+            if not articles and pages == 0:
+                print(f"[news_tool] {provider_name} returned no articles; trying the next provider")
+                break
+            pages += 1
+
+            for article in articles:
+                if since is not None and _parse_published_at(article.get("published_at") or "") < since:
+                    return
+                yield article
+                yielded += 1
+                if yielded >= max_articles:
+                    return
+
+            if not articles or cursor is None:
+                return
+
+        if pages or yielded >= max_articles or requests_made >= max_requests:
+            return
+
+    raise RuntimeError(
+        f"All news providers failed for {company_name} ({ticker}). Last error: {last_error}"
+    )
+
+
 # ---------------------------------------------------------------------------
 # NotebookLM integration
 # ---------------------------------------------------------------------------
 
 FISCALIQ_NOTEBOOK_NAME = "FiscalIQ"
+DEFAULT_LEDGER_PATH = "notebook_sources.db"
 
 
-async def add_news_to_notebooklm(
-    articles: list[dict],
-    ticker: str,
-    company_name: str,
-    mcp_client,
-) -> str:
+async def _mcp_call(mcp_client, tool_name: str, arguments: dict):
+    with span("mcp.call_tool", tool=tool_name):
+        return await mcp_client.call_tool(tool_name, arguments)
+
+
+class NotebookIdCache:
+    """
+    Remembers notebook ids by notebook name so notebook_list isn't called on
+    every tool call. Ids are trusted until a call using one fails; callers then
+    invalidate() and look the notebook up again. When `path` is given the
+    mapping is persisted to that JSON file.
     """
-    Add news article URLs to the FiscalIQ NotebookLM notebook, then query for a summary.
 
-    Creates the FiscalIQ notebook if it does not already exist.
-    Returns a human-readable summary report string.
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._ids: dict[str, str] = {}
+        self._lock = threading.Lock()
+        if path:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._ids = dict(json.load(f))
+            except (OSError, ValueError):
+                self._ids = {}
+
+    def get(self, name: str) -> Optional[str]:
+        with self._lock:
+            return self._ids.get(name)
+
+    def set(self, name: str, notebook_id: str) -> None:
+        with self._lock:
+            if self._ids.get(name) == notebook_id:
+                return
+            self._ids[name] = notebook_id
+        self._save()
+
+    def invalidate(self, name: str) -> None:
+        with self._lock:
+            if self._ids.pop(name, None) is None:
+                return
+        self._save()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ids.clear()
+        self._save()
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            data = json.dumps(self._ids)
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[news_tool] Failed to persist notebook ids: {e}")
 
-    mcp_client must expose an async call_tool(tool_name, arguments) method.
+
+_NOTEBOOK_IDS = NotebookIdCache()
+
+
+def configure_notebook_id_cache(path: Optional[str] = None) -> NotebookIdCache:
+    """Replace the notebook id cache, optionally persisting it to `path`, and return it."""
+    global _NOTEBOOK_IDS
+    _NOTEBOOK_IDS = NotebookIdCache(path)
+    return _NOTEBOOK_IDS
+
+
+class _BloomFilter:
+    """Fixed-size Bloom filter over strings (no false negatives, ~error_rate false positives)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.capacity = max(1, capacity)
+        self.size = max(8, math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class SourceLedger:
+    """
+    Records which source URLs (by canonical URL) have been added to each
+    notebook, so the same article is never ingested twice.
+
+    The ledger lives in SQLite at `path` (default: $FISCALIQ_SOURCE_LEDGER,
+    else notebook_sources.db; ":memory:" keeps it in memory). Each notebook's
+    URLs are also loaded into a Bloom filter, so the common case, a URL never
+    seen before, is answered without a database lookup; filter hits are
+    confirmed against SQLite.
+    """
+
+    def __init__(self, path: Optional[str] = None, bloom_capacity: int = 10_000):
+        path = path or os.getenv("FISCALIQ_SOURCE_LEDGER", DEFAULT_LEDGER_PATH)
+        self.path = path
+        self.bloom_capacity = bloom_capacity
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._blooms: dict[str, _BloomFilter] = {}
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS notebook_sources ("
+                " notebook_id TEXT NOT NULL, url_key TEXT NOT NULL,"
+                " source_id TEXT, added_at REAL, last_used REAL,"
+                " PRIMARY KEY (notebook_id, url_key)) WITHOUT ROWID"
+            )
+            # Ledgers written before sources were tracked for eviction lack these columns.
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(notebook_sources)")}
+            for column, kind in (("source_id", "TEXT"), ("added_at", "REAL"), ("last_used", "REAL")):
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE notebook_sources ADD COLUMN {column} {kind}")
+
+    def _bloom(self, notebook_id: str) -> _BloomFilter:
+        """The notebook's Bloom filter, (re)built from SQLite when missing or over capacity."""
+        bloom = self._blooms.get(notebook_id)
+        if bloom is not None and bloom.count <= bloom.capacity:
+            return bloom
+        (count,) = self._conn.execute(
+            "SELECT COUNT(*) FROM notebook_sources WHERE notebook_id = ?", (notebook_id,)
+        ).fetchone()
+        bloom = _BloomFilter(max(self.bloom_capacity, count * 2))
+        for (url_key,) in self._conn.execute(
+            "SELECT url_key FROM notebook_sources WHERE notebook_id = ?", (notebook_id,)
+        ):
+            bloom.add(url_key)
+        self._blooms[notebook_id] = bloom
+        return bloom
+
+    def contains(self, notebook_id: str, url: str) -> bool:
+        url_key = canonicalize_url(url)
+        with self._lock:
+            if url_key not in self._bloom(notebook_id):
+                return False
+            return self._conn.execute(
+                "SELECT 1 FROM notebook_sources WHERE notebook_id = ? AND url_key = ?",
+                (notebook_id, url_key),
+            ).fetchone() is not None
+
+    def split_known(self, notebook_id: str, articles: list[dict]) -> tuple[list[dict], list[dict]]:
+        """Split articles into (not yet in the notebook, already in the notebook)."""
+        new, known = [], []
+        for a in articles:
+            (known if self.contains(notebook_id, a.get("url") or "") else new).append(a)
+        return new, known
+
+    def add(self, notebook_id: str, urls: list[str], source_ids: Optional[list[Optional[str]]] = None) -> None:
+        """Record urls as sources of the notebook, with their NotebookLM source ids when known."""
+        now = time.time()
+        source_ids = source_ids or [None] * len(urls)
+        rows = [(notebook_id, canonicalize_url(u), sid, now, now) for u, sid in zip(urls, source_ids) if u]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO notebook_sources (notebook_id, url_key, source_id, added_at, last_used)"
+                " VALUES (?, ?, ?, ?, ?) ON CONFLICT (notebook_id, url_key) DO UPDATE SET"
+                " source_id = COALESCE(excluded.source_id, source_id), last_used = excluded.last_used",
+                rows,
+            )
+            bloom = self._bloom(notebook_id)
+            for row in rows:
+                bloom.add(row[1])
+
+    def touch(self, notebook_id: str, urls: list[str]) -> None:
+        """Mark sources as used now, so LRU eviction keeps them."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE notebook_sources SET last_used = ? WHERE notebook_id = ? AND url_key = ?",
+                [(now, notebook_id, canonicalize_url(u)) for u in urls if u],
+            )
+
+    def count(self, notebook_id: str) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM notebook_sources WHERE notebook_id = ?", (notebook_id,)
+            ).fetchone()[0]
+
+    def eviction_candidates(
+        self,
+        notebook_id: str,
+        max_sources: Optional[int] = None,
+        max_age: Optional[float] = None,
+        keep: Iterable[str] = (),
+    ) -> list[tuple[str, str]]:
+        """
+        Return (url_key, source_id) for sources to evict, least recently used
+        first: everything unused for more than `max_age` seconds, plus the
+        oldest beyond the newest `max_sources`. URLs in `keep` are never
+        returned (they still count toward max_sources). Rows recorded without
+        a source id can't be deleted, so they are neither counted nor returned.
+        """
+        keep_keys = {canonicalize_url(u) for u in keep}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url_key, source_id, COALESCE(last_used, 0) FROM notebook_sources"
+                " WHERE notebook_id = ? AND source_id IS NOT NULL ORDER BY COALESCE(last_used, 0), url_key",
+                (notebook_id,),
+            ).fetchall()
+        excess = len(rows) - max_sources if max_sources is not None else 0
+        cutoff = time.time() - max_age if max_age is not None else None
+        candidates = []
+        for url_key, source_id, last_used in rows:
+            if url_key in keep_keys:
+                continue
+            if excess > 0 or (cutoff is not None and last_used < cutoff):
+                candidates.append((url_key, source_id))
+                excess -= 1
+        return candidates
+
+    def remove(self, notebook_id: str, url_keys: list[str]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM notebook_sources WHERE notebook_id = ? AND url_key = ?",
+                [(notebook_id, k) for k in url_keys],
+            )
+            # The Bloom filter can't forget; lookups are confirmed against SQLite anyway.
+
+    def clear(self, notebook_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM notebook_sources WHERE notebook_id = ?", (notebook_id,))
+            self._blooms.pop(notebook_id, None)
+
+
+# Opened on first use, so importing news_tool doesn't create the database file.
+_SOURCE_LEDGER: Optional[SourceLedger] = None
+_SOURCE_LEDGER_LOCK = threading.Lock()
+
+
+def _source_ledger() -> SourceLedger:
+    global _SOURCE_LEDGER
+    if _SOURCE_LEDGER is None:
+        with _SOURCE_LEDGER_LOCK:
+            if _SOURCE_LEDGER is None:
+                _SOURCE_LEDGER = SourceLedger()
+    return _SOURCE_LEDGER
+
+
+def configure_source_ledger(path: Optional[str] = None, bloom_capacity: int = 10_000) -> SourceLedger:
+    """Replace the source ledger with one at `path` (":memory:" for a throwaway one) and return it."""
+    global _SOURCE_LEDGER
+    _SOURCE_LEDGER = SourceLedger(path, bloom_capacity)
+    return _SOURCE_LEDGER
+
+
+class SummaryCache:
     """
-    # 1. Find or create the FiscalIQ notebook
-    list_result = await mcp_client.call_tool("notebook_list", {})
+    Remembers NotebookLM summaries keyed by (notebook_id, ticker, source set,
+    prompt), so re-asking about a company whose sources haven't changed skips
+    the notebook_query round trip. Entries expire after `ttl` seconds and are
+    dropped when their notebook is deleted.
+    """
+
+    def __init__(self, ttl: float = 3600, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, str, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(notebook_id: str, ticker: str, urls: list[str], prompt: str) -> str:
+        sources = "\n".join(sorted({canonicalize_url(u) for u in urls if u}))
+        digest = hashlib.sha256(sources.encode()).hexdigest()
+        return json.dumps([notebook_id, ticker.strip().upper(), digest, prompt])
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry[0] > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def set(self, key: str, notebook_id: str, summary: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), notebook_id, summary)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_notebook(self, notebook_id: str) -> None:
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if e[1] == notebook_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_SUMMARY_CACHE = SummaryCache()
+
+
+def configure_summary_cache(ttl: float = 3600, max_entries: int = 256) -> SummaryCache:
+    """Replace the NotebookLM summary cache and return it."""
+    global _SUMMARY_CACHE
+    _SUMMARY_CACHE = SummaryCache(ttl, max_entries)
+    return _SUMMARY_CACHE
+
+
+class NotebookShards:
+    """
+    Decides which NotebookLM notebook a ticker's news goes into.
+
+    policy "single" keeps everything in the "FiscalIQ" notebook; "ticker"
+    gives each ticker its own notebook ("FiscalIQ - AAPL"); "sector" groups
+    tickers by `sectors` (ticker -> sector, unknown tickers go to "Other").
+    Once a notebook holds more than `max_sources` sources, or a source has
+    gone unused for `max_source_age` seconds, the least recently used
+    sources are deleted from it.
+    """
+
+    POLICIES = ("single", "ticker", "sector")
+
+    def __init__(
+        self,
+        policy: str = "single",
+        sectors: Optional[dict[str, str]] = None,
+        max_sources: Optional[int] = None,
+        max_source_age: Optional[float] = None,
+    ):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown shard policy {policy!r}; expected one of {self.POLICIES}")
+        self.policy = policy
+        self.sectors = {t.strip().upper(): s for t, s in (sectors or {}).items()}
+        self.max_sources = max_sources
+        self.max_source_age = max_source_age
+
+    def notebook_name(self, ticker: str) -> str:
+        if self.policy == "ticker":
+            return f"{FISCALIQ_NOTEBOOK_NAME} - {ticker.strip().upper()}"
+        if self.policy == "sector":
+            return f"{FISCALIQ_NOTEBOOK_NAME} - {self.sectors.get(ticker.strip().upper(), 'Other')}"
+        return FISCALIQ_NOTEBOOK_NAME
+
+    def is_shard(self, name: str) -> bool:
+        """Whether a notebook title belongs to FiscalIQ under any policy."""
+        return name == FISCALIQ_NOTEBOOK_NAME or name.startswith(f"{FISCALIQ_NOTEBOOK_NAME} - ")
+
+
+_NOTEBOOK_SHARDS = NotebookShards()
+
+
+def configure_notebook_shards(
+    policy: str = "single",
+    sectors: Optional[dict[str, str]] = None,
+    max_sources: Optional[int] = None,
+    max_source_age: Optional[float] = None,
+) -> NotebookShards:
+    """Set how news is split across FiscalIQ notebooks and when old sources are evicted."""
+    global _NOTEBOOK_SHARDS
+    _NOTEBOOK_SHARDS = NotebookShards(policy, sectors, max_sources, max_source_age)
+    return _NOTEBOOK_SHARDS
+
+
+def notebook_registry(tickers: list[str]) -> dict[str, Optional[str]]:
+    """Map each ticker to the id of its notebook under the current shard policy (None if not known yet)."""
+    return {t.strip().upper(): _NOTEBOOK_IDS.get(_NOTEBOOK_SHARDS.notebook_name(t)) for t in tickers}
+
+
+async def _find_notebook_id(mcp_client, name: str) -> Optional[str]:
+    """Look a notebook up by title with notebook_list, caching the id if found."""
+    list_result = await _mcp_call(mcp_client, "notebook_list", {})
     notebooks = list_result if isinstance(list_result, list) else (list_result.get("notebooks") or [])
 
-    notebook_id = None
     for nb in notebooks:
-        if nb.get("title") == FISCALIQ_NOTEBOOK_NAME or nb.get("name") == FISCALIQ_NOTEBOOK_NAME:
+        if nb.get("title") == name or nb.get("name") == name:
             notebook_id = nb.get("id") or nb.get("notebook_id")
-            break
+            _NOTEBOOK_IDS.set(name, notebook_id)
+            return notebook_id
+    return None
 
+
+async def _find_or_create_notebook(mcp_client, name: str) -> str:
+    notebook_id = await _find_notebook_id(mcp_client, name)
     if notebook_id is None:
-        create_result = await mcp_client.call_tool("notebook_create", {"title": FISCALIQ_NOTEBOOK_NAME})
+        create_result = await _mcp_call(mcp_client, "notebook_create", {"title": name})
         notebook_id = (
             create_result.get("id")
             or create_result.get("notebook_id")
             or create_result.get("notebookId")
         )
+        _NOTEBOOK_IDS.set(name, notebook_id)
+    return notebook_id
+
+
+def _source_id(add_result) -> Optional[str]:
+    """Pull the new source's id out of a source_add result, if the server reports one."""
+    if not isinstance(add_result, dict):
+        return None
+    source = add_result.get("source") if isinstance(add_result.get("source"), dict) else {}
+    return add_result.get("source_id") or add_result.get("sourceId") or add_result.get("id") or source.get("id")
+
+
+async def _add_sources(
+    mcp_client,
+    notebook_id: str,
+    articles: list[dict],
+    concurrency: int,
+    timeout: Optional[float],
+) -> list[tuple[dict, Optional[str]]]:
+    """
+    Add each article URL as a source, at most `concurrency` at a time.
+
+    A source that fails or takes longer than `timeout` seconds is skipped
+    without affecting the others. Returns (article, source id or None) for
+    the added articles, in input order.
+    """
+    sem = asyncio.Semaphore(max(1, concurrency))
+    failed = object()
 
-    # 2. Add each article URL as a source
-    added = []
-    for article in articles:
+    async def add(article: dict):
         url = article.get("url")
-        if not url:
-            continue
+        async with sem:
+            try:
+                result = await asyncio.wait_for(
+                    _mcp_call(mcp_client, "source_add", {"notebook_id": notebook_id, "url": url}),
+                    timeout,
+                )
+                return _source_id(result)
+            except Exception as e:
+                print(f"[news_tool] Failed to add source {url}: {e!r}")
+                return failed
+
+    with_url = [a for a in articles if a.get("url")]
+    source_ids = await asyncio.gather(*(add(a) for a in with_url))
+    return [(a, sid) for a, sid in zip(with_url, source_ids) if sid is not failed]
+
+
+async def _evict_sources(mcp_client, notebook_id: str, keep: Iterable[str] = ()) -> int:
+    """
+    Delete the notebook's least recently used sources beyond the shard
+    policy's max_sources / max_source_age, never those in `keep` (the
+    current call's URLs). Returns how many were removed.
+    """
+    shards = _NOTEBOOK_SHARDS
+    if shards.max_sources is None and shards.max_source_age is None:
+        return 0
+    candidates = _source_ledger().eviction_candidates(
+        notebook_id, shards.max_sources, shards.max_source_age, keep=keep
+    )
+    removed = []
+    for url_key, source_id in candidates:
         try:
-            await mcp_client.call_tool("source_add", {"notebook_id": notebook_id, "url": url})
-            added.append(article)
+            await _mcp_call(mcp_client, "source_delete", {"source_id": source_id, "confirm": True})
+            removed.append(url_key)
         except Exception as e:
-            print(f"[news_tool] Failed to add source {url}: {e}")
+            print(f"[news_tool] Failed to evict source {url_key}: {e!r}")
+    if removed:
+        _source_ledger().remove(notebook_id, removed)
+        _SUMMARY_CACHE.invalidate_notebook(notebook_id)
+    return len(removed)
+
+
+@traced("notebooklm.add_news")
+async def add_news_to_notebooklm(
+    articles: list[dict],
+    ticker: str,
+    company_name: str,
+    mcp_client,
+    concurrency: int = 5,
+    source_timeout: Optional[float] = 120,
+) -> str:
+    """
+    Add news article URLs to the ticker's FiscalIQ NotebookLM notebook, then query for a summary.
+
+    The notebook is chosen by the shard policy (configure_notebook_shards; by
+    default the single "FiscalIQ" notebook) and created if it does not
+    already exist. URLs already
+    added to the notebook (per the source ledger) are not added again. Sources
+    are added concurrently (at most `concurrency` in flight, each limited to
+    `source_timeout` seconds); a failed source is skipped. If the same set of
+    sources was summarized recently, the cached summary is returned without
+    querying the notebook.
+    Returns a human-readable summary report string.
+
+    mcp_client must expose an async call_tool(tool_name, arguments) method.
+    """
+    # 1. Find or create the ticker's notebook (cached id first)
+    notebook_name = _NOTEBOOK_SHARDS.notebook_name(ticker)
+    notebook_id = _NOTEBOOK_IDS.get(notebook_name)
+    cached = notebook_id is not None
+    if not cached:
+        notebook_id = await _find_or_create_notebook(mcp_client, notebook_name)
 
-    # 3. Query for a summary
     query_prompt = (
         f"Summarize all the recent news about {company_name} ({ticker}). "
         "What are the key themes, risks, and developments?"
     )
-    query_result = await mcp_client.call_tool(
-        "notebook_query",
-        {"notebook_id": notebook_id, "query": query_prompt},
-    )
-    summary_text = (
-        query_result
-        if isinstance(query_result, str)
-        else (query_result.get("answer") or query_result.get("response") or str(query_result))
-    )
+
+    async def query(nb_id: str):
+        return await _mcp_call(
+            mcp_client,
+            "notebook_query",
+            {"notebook_id": nb_id, "query": query_prompt},
+        )
+
+    # 2. Add each article URL the notebook doesn't already have as a source,
+    #    then evict the least recently used sources if the shard is over its limits
+    async def ingest(nb_id: str) -> tuple[list[dict], list[dict], list[dict]]:
+        new, known = _source_ledger().split_known(nb_id, [a for a in articles if a.get("url")])
+        _source_ledger().touch(nb_id, [a["url"] for a in known])
+        results = await _add_sources(mcp_client, nb_id, new, concurrency, source_timeout)
+        added = [a for a, _ in results]
+        _source_ledger().add(nb_id, [a["url"] for a in added], [sid for _, sid in results])
+        if added or known:
+            await _evict_sources(mcp_client, nb_id, keep=[a["url"] for a in added + known])
+        return new, added, known
+
+    def summary_key(nb_id: str) -> str:
+        return SummaryCache.make_key(nb_id, ticker, [a["url"] for a in added + known], query_prompt)
+
+    new, added, known = await ingest(notebook_id)
+
+    # 3. Query for a summary, unless the same sources were already summarized
+    #    with this prompt. If the cached id looks stale (every source_add or
+    #    the query fails), look the notebook up again: if it really changed,
+    #    re-ingest into the new one; if not, keep the ledger and retry the query.
+    summary_text = None
+    stale = cached and bool(new) and not added
+    if not stale:
+        summary_text = _SUMMARY_CACHE.get(summary_key(notebook_id))
+        if summary_text is None:
+            try:
+                query_result = await query(notebook_id)
+            except Exception:
+                if not cached:
+                    raise
+                stale = True
+
+    if stale:
+        print(f"[news_tool] Cached {notebook_name} notebook id failed; looking it up again")
+        _NOTEBOOK_IDS.invalidate(notebook_name)
+        old_id = notebook_id
+        notebook_id = await _find_or_create_notebook(mcp_client, notebook_name)
+        if notebook_id != old_id:
+            _source_ledger().clear(old_id)
+            _SUMMARY_CACHE.invalidate_notebook(old_id)
+            new, added, known = await ingest(notebook_id)
+        query_result = await query(notebook_id)
+
+    if summary_text is None:
+        summary_text = (
+            query_result
+            if isinstance(query_result, str)
+            else (query_result.get("answer") or query_result.get("response") or str(query_result))
+        )
+        _SUMMARY_CACHE.set(summary_key(notebook_id), notebook_id, summary_text)
 
     # 4. Format as human-readable report
     lines = [
@@ -295,6 +1986,8 @@ async def add_news_to_notebooklm(
         source = a.get("source", "")
         lines.append(f"{i}. {a.get('headline', '')} — {source} ({pub})")
         lines.append(f"   {a.get('url', '')}")
+    if known:
+        lines.append(f"({len(known)} already in the notebook, not re-added)")
 
     return "\n".join(lines)
 
@@ -321,31 +2014,71 @@ ADD_NEWS_TO_NOTEBOOKLM_SCHEMA = {
 }
 
 
-async def delete_fiscaliq_notebook(mcp_client) -> bool:
+async def _delete_notebook(mcp_client, name: str) -> bool:
+    """Delete the notebook titled `name` (cached id first). Returns False if it doesn't exist."""
+    cached_id = _NOTEBOOK_IDS.get(name)
+    _NOTEBOOK_IDS.invalidate(name)
+    if cached_id is not None:
+        try:
+            await _mcp_call(mcp_client, "notebook_delete", {"notebook_id": cached_id, "confirm": True})
+            _source_ledger().clear(cached_id)
+            _SUMMARY_CACHE.invalidate_notebook(cached_id)
+            return True
+        except Exception as e:
+            print(f"[news_tool] Deleting cached notebook id failed ({e}); looking it up again")
+
+    notebook_id = await _find_notebook_id(mcp_client, name)
+    _NOTEBOOK_IDS.invalidate(name)
+    if notebook_id is None:
+        return False
+
+    await _mcp_call(mcp_client, "notebook_delete", {"notebook_id": notebook_id, "confirm": True})
+    _source_ledger().clear(notebook_id)
+    _SUMMARY_CACHE.invalidate_notebook(notebook_id)
+    return True
+
+
+@traced("notebooklm.delete_notebook")
+async def delete_fiscaliq_notebook(mcp_client, ticker: Optional[str] = None) -> bool:
     """
     Delete the FiscalIQ NotebookLM notebook.
-    Returns True if deleted, False if not found.
+
+    With a sharded policy, deletes only `ticker`'s notebook when a ticker is
+    given, and every FiscalIQ notebook otherwise.
+    Returns True if anything was deleted, False if not found.
 
     mcp_client must expose an async call_tool(tool_name, arguments) method.
     """
-    list_result = await mcp_client.call_tool("notebook_list", {})
-    notebooks = list_result if isinstance(list_result, list) else (list_result.get("notebooks") or [])
+    if ticker is not None or _NOTEBOOK_SHARDS.policy == "single":
+        return await _delete_notebook(mcp_client, _NOTEBOOK_SHARDS.notebook_name(ticker or ""))
 
+    list_result = await _mcp_call(mcp_client, "notebook_list", {})
+    notebooks = list_result if isinstance(list_result, list) else (list_result.get("notebooks") or [])
+    deleted = False
     for nb in notebooks:
-        if nb.get("title") == FISCALIQ_NOTEBOOK_NAME or nb.get("name") == FISCALIQ_NOTEBOOK_NAME:
-            notebook_id = nb.get("id") or nb.get("notebook_id")
-            await mcp_client.call_tool("notebook_delete", {"notebook_id": notebook_id, "confirm": True})
-            return True
-
-    return False
+        name = nb.get("title") or nb.get("name") or ""
+        notebook_id = nb.get("id") or nb.get("notebook_id")
+        if not _NOTEBOOK_SHARDS.is_shard(name) or notebook_id is None:
+            continue
+        await _mcp_call(mcp_client, "notebook_delete", {"notebook_id": notebook_id, "confirm": True})
+        _NOTEBOOK_IDS.invalidate(name)
+        _source_ledger().clear(notebook_id)
+        _SUMMARY_CACHE.invalidate_notebook(notebook_id)
+        deleted = True
+    return deleted
 
 
 DELETE_FISCALIQ_NOTEBOOK_SCHEMA = {
     "name": "delete_fiscaliq_notebook",
-    "description": "Delete the FiscalIQ NotebookLM notebook and all its sources.",
+    "description": (
+        "Delete the FiscalIQ NotebookLM notebook and all its sources. When notebooks are "
+        "sharded, pass a ticker to delete only that ticker's notebook."
+    ),
     "parameters": {
         "type": "object",
-        "properties": {},
+        "properties": {
+            "ticker": {"type": "string", "description": "Only delete this ticker's notebook, e.g. AAPL"},
+        },
         "required": [],
     },
 }
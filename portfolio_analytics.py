@@ -0,0 +1,165 @@
+import copy
+import hashlib
+
+import numpy as np
+import pandas as pd
+from typing import Optional
+
+TRADING_DAYS_PER_YEAR = 252
+
+# ---------------------------------------------------------------------------
+# Holdings -> quantity vector
+# ---------------------------------------------------------------------------
+
+def holdings_to_quantities(holdings: list[dict], symbols: list[str]) -> np.ndarray:
+    """
+    Collapse rows from the `holdings` table into one quantity per symbol.
+
+    A portfolio can hold several rows for the same symbol (one per trade), so
+    quantities are summed. Symbols without a holding get a quantity of 0.
+    """
+    index = {s: i for i, s in enumerate(symbols)}
+    qty = np.zeros(len(symbols), dtype=float)
+    for h in holdings:
+        i = index.get(str(h.get("symbol") or "").upper())
+        if i is not None:
+            qty[i] += float(h.get("quantity") or 0)
+    return qty
+
+
+# ---------------------------------------------------------------------------
+# Risk metrics
+# ---------------------------------------------------------------------------
+
+def _max_drawdown(values: np.ndarray) -> np.ndarray:
+    """Largest peak-to-trough drop (a negative fraction) for each column of values."""
+    running_max = np.maximum.accumulate(values, axis=0)
+    return (values / running_max - 1.0).min(axis=0)
+
+
+def compute_risk_metrics(
+    holdings: list[dict],
+    prices: pd.DataFrame,
+    benchmark: Optional[pd.Series] = None,
+) -> dict:
+    """
+    Compute returns, volatility, drawdown, beta and correlations for a portfolio.
+
+    prices is a DataFrame indexed by date with one column per symbol. Every
+    metric is computed for all symbols at once with array operations on the
+    (dates x symbols) price matrix.
+
+    The portfolio is valued buy-and-hold from the holdings' quantities. Beta is
+    measured against benchmark when given, otherwise against the portfolio.
+
+    Returns a dict with keys:
+        symbols, weights, total_return, volatility, max_drawdown, beta,
+        correlation, portfolio
+    """
+    if prices.shape[0] < 2:
+        raise ValueError("At least two price observations are required.")
+
+    prices = prices.sort_index().ffill().bfill()
+    symbols = [str(c).upper() for c in prices.columns]
+    P = prices.to_numpy(dtype=float)
+
+    qty = holdings_to_quantities(holdings, symbols)
+    values = P @ qty
+    if values[-1] <= 0:
+        raise ValueError("Portfolio has no market value for the given prices.")
+
+    R = P[1:] / P[:-1] - 1.0
+    port_R = values[1:] / values[:-1] - 1.0
+
+    if benchmark is not None:
+        bench = benchmark.sort_index().reindex(prices.index).ffill().bfill().to_numpy(dtype=float)
+        bench_R = bench[1:] / bench[:-1] - 1.0
+    else:
+        bench_R = port_R
+
+    # Covariance of every symbol with the benchmark in a single mat-vec product.
+    n = R.shape[0]
+    R_centered = R - R.mean(axis=0)
+    bench_centered = bench_R - bench_R.mean()
+    bench_var = bench_centered @ bench_centered / max(n - 1, 1)
+    cov_with_bench = R_centered.T @ bench_centered / max(n - 1, 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        beta = np.where(bench_var > 0, cov_with_bench / bench_var, np.nan)
+        port_beta = (
+            (port_R - port_R.mean()) @ bench_centered / max(n - 1, 1) / bench_var
+            if bench_var > 0 else np.nan
+        )
+        correlation = np.corrcoef(R, rowvar=False) if R.shape[1] > 1 else np.ones((1, 1))
+
+    annualize = np.sqrt(TRADING_DAYS_PER_YEAR)
+
+    return {
+        "symbols": symbols,
+        "weights": qty * P[-1] / values[-1],
+        "total_return": P[-1] / P[0] - 1.0,
+        "volatility": R.std(axis=0, ddof=1) * annualize,
+        "max_drawdown": _max_drawdown(P),
+        "beta": beta,
+        "correlation": correlation,
+        "portfolio": {
+            "value": float(values[-1]),
+            "total_return": float(values[-1] / values[0] - 1.0),
+            "volatility": float(port_R.std(ddof=1) * annualize),
+            "max_drawdown": float(_max_drawdown(values)),
+            "beta": float(port_beta),
+        },
+    }
+
+
+# ---------------------------------------------------------------------------
+# Per-portfolio cache
+# ---------------------------------------------------------------------------
+
+# portfolio_id -> (cache key, metrics)
+_METRICS_CACHE: dict[str, tuple[tuple, dict]] = {}
+
+
+def _cache_key(holdings: list[dict], prices: pd.DataFrame, benchmark: Optional[pd.Series]) -> tuple:
+    """
+    Cheap fingerprint of the inputs: the holdings, the shape and last date of
+    the price history, and a digest of the price (and benchmark) values.
+    Appending a new day of prices or restating an old close changes the key.
+    """
+    held = tuple(sorted(
+        (str(h.get("symbol") or "").upper(), float(h.get("quantity") or 0)) for h in holdings
+    ))
+    last_date = prices.index.max() if len(prices.index) else None
+    bench_last = benchmark.index.max() if benchmark is not None and len(benchmark.index) else None
+    digest = hashlib.blake2b(np.ascontiguousarray(prices.to_numpy(dtype=float)).tobytes(), digest_size=16)
+    if benchmark is not None:
+        digest.update(np.ascontiguousarray(benchmark.to_numpy(dtype=float)).tobytes())
+    return (held, prices.shape, tuple(prices.columns), last_date, bench_last, digest.hexdigest())
+
+
+def get_portfolio_metrics(
+    portfolio_id: str,
+    holdings: list[dict],
+    prices: pd.DataFrame,
+    benchmark: Optional[pd.Series] = None,
+) -> dict:
+    """
+    Return compute_risk_metrics() for a portfolio, reusing the previous result
+    until new prices arrive or the holdings change. Callers get a copy, so
+    mutating the result doesn't change later cache hits.
+    """
+    key = _cache_key(holdings, prices, benchmark)
+    cached = _METRICS_CACHE.get(portfolio_id)
+    if cached is not None and cached[0] == key:
+        return copy.deepcopy(cached[1])
+
+    metrics = compute_risk_metrics(holdings, prices, benchmark)
+    _METRICS_CACHE[portfolio_id] = (key, metrics)
+    return copy.deepcopy(metrics)
+
+
+def clear_metrics_cache(portfolio_id: Optional[str] = None) -> None:
+    """Drop the cached metrics for one portfolio, or for all when portfolio_id is None."""
+    if portfolio_id is None:
+        _METRICS_CACHE.clear()
+    else:
+        _METRICS_CACHE.pop(portfolio_id, None)
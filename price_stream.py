@@ -0,0 +1,530 @@
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import socket
+import time
+from collections import defaultdict
+from typing import Awaitable, Callable, Iterable, Optional
+from urllib.parse import parse_qs, urlsplit
+
+# ---------------------------------------------------------------------------
+# Price hub: per-ticker fan-out with per-subscriber coalescing
+# ---------------------------------------------------------------------------
+
+
+class Subscription:
+    """
+    One client's view of the hub. Updates are kept as {ticker: latest quote}
+    until the client takes them with next_batch(), so a ticker that moves
+    several times between sends is delivered once with its newest price and a
+    slow client holds at most one pending quote per subscribed ticker.
+    """
+
+    def __init__(self, tickers: Optional[set[str]], min_interval: float):
+        self.tickers = tickers  # None = every ticker
+        self.min_interval = min_interval
+        self.closed = False
+        self.delivered = 0
+        self.coalesced = 0
+        self._pending: dict[str, dict] = {}
+        self._pending_since: Optional[float] = None
+        self._last_flush = 0.0
+        self._event = asyncio.Event()
+
+    def offer(self, quote: dict) -> None:
+        key = quote["ticker"]
+        if key in self._pending:
+            self.coalesced += 1
+        elif not self._pending:
+            self._pending_since = time.monotonic()
+        self._pending[key] = quote
+        self._event.set()
+
+    def lag(self, now: float) -> float:
+        """Seconds the oldest untaken update has been waiting."""
+        return 0.0 if self._pending_since is None else now - self._pending_since
+
+    async def next_batch(self, timeout: Optional[float] = None) -> Optional[list[dict]]:
+        """
+        Wait for updates and return them, at most once per min_interval (so
+        bursts coalesce). Returns None if nothing arrived within timeout, and
+        [] once the subscription is closed.
+        """
+        if not self._pending:
+            if self.closed:
+                return []
+            # A timer that sets the event is much cheaper than wait_for's extra
+            # task when thousands of subscribers are waiting.
+            handle = asyncio.get_running_loop().call_later(timeout, self._event.set) if timeout else None
+            self._event.clear()
+            await self._event.wait()
+            if handle is not None:
+                handle.cancel()
+            if not self._pending:
+                return [] if self.closed else None
+        wait = self._last_flush + self.min_interval - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        batch = list(self._pending.values())
+        self._pending = {}
+        self._pending_since = None
+        self._last_flush = time.monotonic()
+        self.delivered += len(batch)
+        return batch
+
+    def close(self) -> None:
+        self.closed = True
+        self._event.set()
+
+
+class PriceHub:
+    """
+    Routes published quotes to the subscriptions that asked for their ticker.
+
+    Fan-out is indexed by ticker, so a publish touches only that ticker's
+    subscribers (plus wildcard ones). A subscriber that hasn't taken its
+    updates for max_lag seconds is considered stuck and is dropped, so one
+    stalled client can't hold memory or slow the others down.
+
+    Not thread-safe: publish from the event loop (see run_scraper_feed).
+    """
+
+    def __init__(self, min_interval: float = 0.1, max_lag: float = 10.0):
+        self.min_interval = min_interval
+        self.max_lag = max_lag
+        self.latest: dict[str, dict] = {}
+        self.published = 0
+        self.dropped = 0
+        self._subscriptions: set[Subscription] = set()
+        self._by_ticker: dict[str, set[Subscription]] = defaultdict(set)
+        self._wildcard: set[Subscription] = set()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(self, tickers: Optional[Iterable[str]] = None, snapshot: bool = True) -> Subscription:
+        """Subscribe to tickers (None for all); snapshot queues their latest quotes immediately."""
+        if tickers is None:
+            sub = Subscription(None, self.min_interval)
+            self._subscriptions.add(sub)
+            self._wildcard.add(sub)
+            if snapshot:
+                for quote in self.latest.values():
+                    sub.offer(quote)
+            return sub
+        sub = Subscription(set(), self.min_interval)
+        self._subscriptions.add(sub)
+        self.update(sub, add=tickers, snapshot=snapshot)
+        return sub
+
+    def update(self, sub: Subscription, add: Iterable[str] = (), remove: Iterable[str] = (), snapshot: bool = True) -> None:
+        """Change a ticker subscription's topics (wildcard subscriptions are left as they are)."""
+        if sub.tickers is None or sub.closed:
+            return
+        for ticker in {t.strip().upper() for t in remove if t and t.strip()}:
+            sub.tickers.discard(ticker)
+            subs = self._by_ticker.get(ticker)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._by_ticker[ticker]
+        for ticker in {t.strip().upper() for t in add if t and t.strip()} - sub.tickers:
+            sub.tickers.add(ticker)
+            self._by_ticker[ticker].add(sub)
+            if snapshot and ticker in self.latest:
+                sub.offer(self.latest[ticker])
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        if sub.tickers is None:
+            self._wildcard.discard(sub)
+        else:
+            self.update(sub, remove=list(sub.tickers))
+        self._subscriptions.discard(sub)
+        sub.close()
+
+    def drop(self, sub: Subscription) -> None:
+        """Unsubscribe a client that fell behind (counted in stats)."""
+        if not sub.closed:
+            self.dropped += 1
+        self.unsubscribe(sub)
+
+    def close_all(self) -> None:
+        for sub in list(self._subscriptions):
+            self.unsubscribe(sub)
+
+    def publish(self, quote: dict) -> int:
+        """Record quote as its ticker's latest and queue it for subscribers; returns how many."""
+        quote = {**quote, "ticker": quote["ticker"].upper()}
+        quote.setdefault("ts", time.time())
+        self.latest[quote["ticker"]] = quote
+        self.published += 1
+
+        now = time.monotonic()
+        delivered = 0
+        for sub in (*self._by_ticker.get(quote["ticker"], ()), *self._wildcard):
+            if sub.lag(now) > self.max_lag:
+                self.drop(sub)
+                continue
+            sub.offer(quote)
+            delivered += 1
+        return delivered
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": self.subscriber_count,
+            "tickers": len(self.latest),
+            "published": self.published,
+            "dropped_subscribers": self.dropped,
+        }
+
+
+async def run_scraper_feed(
+    hub: PriceHub,
+    symbols: list[tuple[str, str]],
+    interval: float = 30.0,
+    scrape: Optional[Callable[[list[tuple[str, str]]], Awaitable[list[dict]]]] = None,
+    stop: Optional[asyncio.Event] = None,
+) -> None:
+    """
+    Scrape symbols [(ticker, exchange), ...] every interval seconds and publish
+    each quote to hub. scrape defaults to StockScrapper.scrape_quotes.
+    """
+    if scrape is None:
+        from db_functions import StockScrapper
+
+        scrape = StockScrapper.scrape_quotes
+    stop = stop or asyncio.Event()
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        started = loop.time()
+        try:
+            rows = await scrape(symbols)
+        except Exception as e:
+            print(f"[price_stream] Scrape failed: {e}")
+            rows = []
+        for row in rows:
+            if "error" in row or row.get("price") is None:
+                continue
+            hub.publish({
+                "ticker": row["ticker"],
+                "exchange": row.get("exchange"),
+                "price": row["price"],
+                "ts": time.time(),
+            })
+        try:
+            await asyncio.wait_for(stop.wait(), max(0.0, interval - (loop.time() - started)))
+        except asyncio.TimeoutError:
+            pass
+
+
+# ---------------------------------------------------------------------------
+# WebSocket framing (RFC 6455, text/control frames only)
+# ---------------------------------------------------------------------------
+
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+WS_TEXT, WS_CLOSE, WS_PING, WS_PONG = 0x1, 0x8, 0x9, 0xA
+_WS_MAX_MESSAGE = 64 * 1024
+
+
+def _ws_accept(key: str) -> str:
+    return base64.b64encode(hashlib.sha1((key + _WS_GUID).encode()).digest()).decode()
+
+
+def _xor_mask(payload: bytes, mask: bytes) -> bytes:
+    n = len(payload)
+    key = (mask * (n // 4 + 1))[:n]
+    return (int.from_bytes(payload, "big") ^ int.from_bytes(key, "big")).to_bytes(n, "big")
+
+
+def encode_ws_frame(opcode: int, payload: bytes = b"", mask: Optional[bytes] = None) -> bytes:
+    """One final frame. Servers send unmasked frames; clients pass a 4-byte mask."""
+    n = len(payload)
+    head = bytes([0x80 | opcode])
+    mask_bit = 0x80 if mask else 0
+    if n < 126:
+        head += bytes([mask_bit | n])
+    elif n < 1 << 16:
+        head += bytes([mask_bit | 126]) + n.to_bytes(2, "big")
+    else:
+        head += bytes([mask_bit | 127]) + n.to_bytes(8, "big")
+    if mask:
+        return head + mask + _xor_mask(payload, mask)
+    return head + payload
+
+
+async def read_ws_frame(reader: asyncio.StreamReader) -> tuple[bool, int, bytes]:
+    """Read one frame; returns (fin, opcode, unmasked payload)."""
+    b0, b1 = await reader.readexactly(2)
+    n = b1 & 0x7F
+    if n == 126:
+        n = int.from_bytes(await reader.readexactly(2), "big")
+    elif n == 127:
+        n = int.from_bytes(await reader.readexactly(8), "big")
+    if n > _WS_MAX_MESSAGE:
+        raise ValueError(f"WebSocket frame too large ({n} bytes)")
+    mask = await reader.readexactly(4) if b1 & 0x80 else None
+    payload = await reader.readexactly(n)
+    return bool(b0 & 0x80), b0 & 0x0F, _xor_mask(payload, mask) if mask else payload
+
+
+# ---------------------------------------------------------------------------
+# Streaming server (SSE at /stream, WebSocket at /ws)
+# ---------------------------------------------------------------------------
+
+
+class _SlowClient(Exception):
+    pass
+
+
+def _parse_tickers(value: Optional[str]) -> Optional[list[str]]:
+    if value is None or value.strip() in ("", "*"):
+        return None
+    return [t for t in value.split(",") if t.strip()]
+
+
+class PriceStreamServer:
+    """
+    Pushes hub updates to browsers over Server-Sent Events or WebSocket.
+
+        GET /stream?tickers=AAPL,MSFT   text/event-stream, one "quotes" event per batch
+        GET /ws?tickers=AAPL            WebSocket; send {"subscribe": [...]} or
+                                        {"unsubscribe": [...]} to change topics
+        GET /health                     hub stats as JSON
+
+    Each batch is {"type": "quotes", "quotes": [...]}. tickers=* subscribes
+    to everything, as does omitting tickers on /stream; a WebSocket opened
+    without tickers starts empty and subscribes by message.
+
+    Backpressure: each connection buffers at most write_buffer bytes in
+    process (plus send_buffer in the kernel, if set) and a send that can't
+    drain within send_timeout drops the client, while the hub coalesces
+    whatever it hasn't sent yet.
+    """
+
+    def __init__(
+        self,
+        hub: PriceHub,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        heartbeat: float = 15.0,
+        send_timeout: float = 5.0,
+        write_buffer: int = 64 * 1024,
+        send_buffer: Optional[int] = None,
+    ):
+        self.hub = hub
+        self.host = host
+        self.port = port
+        self.heartbeat = heartbeat
+        self.send_timeout = send_timeout
+        self.write_buffer = write_buffer
+        self.send_buffer = send_buffer
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    async def start(self) -> int:
+        """Start listening; returns the bound port (useful with port=0)."""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, backlog=4096)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            self.hub.close_all()
+            await self._server.wait_closed()
+
+    async def _drain(self, writer: asyncio.StreamWriter) -> None:
+        transport = writer.transport
+        if transport.is_closing():
+            raise ConnectionResetError("client went away")
+        if transport.get_write_buffer_size() <= self.write_buffer:
+            return  # not paused; skip wait_for's per-call task
+        try:
+            await asyncio.wait_for(writer.drain(), self.send_timeout)
+        except asyncio.TimeoutError:
+            raise _SlowClient() from None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        writer.transport.set_write_buffer_limits(high=self.write_buffer)
+        if self.send_buffer:
+            writer.get_extra_info("socket").setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.send_buffer)
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), 10)
+            headers = {}
+            while True:
+                line = await asyncio.wait_for(reader.readline(), 10)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+        except (asyncio.TimeoutError, ValueError, ConnectionError):
+            writer.close()
+            return
+
+        url = urlsplit(target)
+        raw_tickers = parse_qs(url.query).get("tickers", [None])[0]
+        try:
+            if method != "GET":
+                await self._respond(writer, 405, {"error": "method not allowed"})
+            elif url.path == "/health":
+                await self._respond(writer, 200, self.hub.stats())
+            elif url.path == "/stream":
+                await self._serve_sse(reader, writer, _parse_tickers(raw_tickers))
+            elif url.path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+                # Without ?tickers a WebSocket starts empty and subscribes by message.
+                tickers = _parse_tickers(raw_tickers) if raw_tickers is not None else []
+                await self._serve_websocket(reader, writer, headers, tickers)
+            else:
+                await self._respond(writer, 404, {"error": "not found"})
+        except _SlowClient:
+            writer.transport.abort()
+            return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        writer.close()
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, body: dict) -> None:
+        payload = json.dumps(body).encode()
+        reason = {200: "OK", 404: "Not Found", 405: "Method Not Allowed"}[status]
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\nAccess-Control-Allow-Origin: *\r\n"
+            f"Connection: close\r\n\r\n".encode() + payload
+        )
+        await self._drain(writer)
+
+    async def _pump(self, sub: Subscription, writer: asyncio.StreamWriter, encode, heartbeat: bytes) -> None:
+        try:
+            await self._send_batches(sub, writer, encode, heartbeat)
+        except _SlowClient:
+            self.hub.drop(sub)
+            raise
+
+    async def _send_batches(self, sub: Subscription, writer: asyncio.StreamWriter, encode, heartbeat: bytes) -> None:
+        while True:
+            batch = await sub.next_batch(self.heartbeat)
+            if batch is None:
+                writer.write(heartbeat)
+                await self._drain(writer)
+                continue
+            if not batch:
+                return
+            writer.write(encode(json.dumps({"type": "quotes", "quotes": batch}).encode()))
+            await self._drain(writer)
+
+    async def _serve_sse(self, reader, writer, tickers) -> None:
+        sub = self.hub.subscribe(tickers)
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+            b"Access-Control-Allow-Origin: *\r\nConnection: keep-alive\r\n\r\n"
+        )
+
+        async def close_on_eof():
+            while await reader.read(1024):
+                pass
+            sub.close()
+
+        watcher = asyncio.create_task(close_on_eof())
+        try:
+            await self._pump(sub, writer, lambda data: b"event: quotes\ndata: " + data + b"\n\n", b": ping\n\n")
+        finally:
+            watcher.cancel()
+            self.hub.unsubscribe(sub)
+
+    async def _serve_websocket(self, reader, writer, headers, tickers) -> None:
+        key = headers.get("sec-websocket-key")
+        if not key:
+            await self._respond(writer, 404, {"error": "missing Sec-WebSocket-Key"})
+            return
+        writer.write(
+            "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {_ws_accept(key)}\r\n\r\n".encode()
+        )
+        sub = self.hub.subscribe(tickers)
+
+        async def read_messages():
+            message = b""
+            try:
+                while True:
+                    fin, opcode, payload = await read_ws_frame(reader)
+                    if opcode == WS_CLOSE:
+                        writer.write(encode_ws_frame(WS_CLOSE, payload[:2]))
+                        break
+                    if opcode == WS_PING:
+                        writer.write(encode_ws_frame(WS_PONG, payload))
+                        continue
+                    if opcode in (WS_TEXT, 0x0):
+                        message += payload
+                        if len(message) > _WS_MAX_MESSAGE:
+                            break
+                        if fin:
+                            self._apply_ws_command(sub, message)
+                            message = b""
+            except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+                pass
+            sub.close()
+
+        reader_task = asyncio.create_task(read_messages())
+        try:
+            await self._pump(sub, writer, lambda data: encode_ws_frame(WS_TEXT, data), encode_ws_frame(WS_PING))
+        finally:
+            reader_task.cancel()
+            self.hub.unsubscribe(sub)
+
+    def _apply_ws_command(self, sub: Subscription, message: bytes) -> None:
+        try:
+            command = json.loads(message)
+        except ValueError:
+            return
+        if not isinstance(command, dict):
+            return
+        self.hub.update(sub, add=_ticker_list(command.get("subscribe")), remove=_ticker_list(command.get("unsubscribe")))
+
+
+def _ticker_list(value) -> list[str]:
+    """Tickers from a subscribe/unsubscribe value: a list, or a string like "AAPL" or "AAPL,MSFT"."""
+    if isinstance(value, str):
+        return value.split(",")
+    if isinstance(value, (list, tuple)):
+        return [t for t in value if isinstance(t, str)]
+    return []
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+
+async def serve(symbols: list[tuple[str, str]], host: str, port: int, interval: float) -> None:
+    hub = PriceHub()
+    server = PriceStreamServer(hub, host, port)
+    await server.start()
+    print(f"[price_stream] Streaming {len(symbols)} symbols on http://{host}:{server.port} (/stream, /ws)")
+    await asyncio.gather(server.serve_forever(), run_scraper_feed(hub, symbols, interval))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream StockScrapper quotes over SSE / WebSocket.")
+    parser.add_argument("--symbols", required=True, help="comma-separated TICKER:EXCHANGE, e.g. AAPL:NASDAQ,SPY:NYSEARCA")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--interval", type=float, default=30.0, help="seconds between scrapes")
+    args = parser.parse_args()
+
+    symbols = []
+    for item in args.symbols.split(","):
+        ticker, _, exchange = item.strip().partition(":")
+        symbols.append((ticker.upper(), (exchange or "NASDAQ").upper()))
+    asyncio.run(serve(symbols, args.host, args.port, args.interval))
+
+
+if __name__ == "__main__":
+    main()
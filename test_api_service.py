@@ -0,0 +1,268 @@
+"""
+Tests for api_service.py
+
+Run:
+    python -m pytest test_api_service.py -v
+"""
+
+import asyncio
+import base64
+import threading
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+import db_functions
+from api_service import ApiService, DefaultBackend, ResponseCache, value_portfolio
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+class FakeBackend:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = {"news": 0, "quotes": 0, "portfolios": 0, "holdings": 0}
+        self.prices = {"AAPL": 200.0, "MSFT": 400.0}
+
+    async def news(self, ticker, max_articles):
+        self.calls["news"] += 1
+        await asyncio.sleep(self.delay)
+        if ticker == "FAIL":
+            raise RuntimeError("All news providers failed")
+        return [{"headline": f"{ticker} news", "url": f"https://example.com/{ticker}"}][:max_articles]
+
+    async def quotes(self, symbols):
+        self.calls["quotes"] += 1
+        await asyncio.sleep(self.delay)
+        return [{"ticker": s, "price": self.prices[s]} for s in symbols if s in self.prices]
+
+    async def portfolios(self, email, password):
+        self.calls["portfolios"] += 1
+        return [{"portfolio_id": "p1", "portfolio_name": f"{email}'s"}]
+
+    async def holdings(self, email, password, portfolio_id):
+        self.calls["holdings"] += 1
+        return [
+            {"symbol": "AAPL", "quantity": 10, "average_price": 150},
+            {"symbol": "msft", "quantity": 2, "average_price": 300},
+            {"symbol": "ZZZZ", "quantity": 1, "average_price": 5},
+        ]
+
+
+def basic(email, password):
+    return {"Authorization": "Basic " + base64.b64encode(f"{email}:{password}".encode()).decode()}
+
+
+@pytest.fixture
+def backend():
+    return FakeBackend()
+
+
+def request_all(app, requests):
+    """Run [(path, headers)] concurrently against app; returns the responses."""
+    async def go():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(client.get(path, headers=headers or {}) for path, headers in requests))
+    return _run(go())
+
+
+# ---------------------------------------------------------------------------
+# Endpoints
+# ---------------------------------------------------------------------------
+
+def test_news_cached_with_etag(backend):
+    app = ApiService(backend)
+    first = request_all(app, [("/news?ticker=aapl", None)])[0]
+    second = request_all(app, [("/news?ticker=AAPL", None)])[0]
+    assert first.status_code == 200
+    assert first.json() == {"ticker": "AAPL", "articles": [{"headline": "AAPL news", "url": "https://example.com/AAPL"}]}
+    assert first.headers["x-cache"] == "miss" and second.headers["x-cache"] == "hit"
+    assert first.headers["etag"] == second.headers["etag"]
+    assert first.headers["cache-control"] == "public, max-age=300"
+    assert backend.calls["news"] == 1
+
+
+def test_if_none_match_returns_304(backend):
+    app = ApiService(backend)
+    etag = request_all(app, [("/quotes?symbols=AAPL", None)])[0].headers["etag"]
+    not_modified, changed = request_all(app, [
+        ("/quotes?symbols=AAPL", {"If-None-Match": f"W/{etag}"}),
+        ("/quotes?symbols=AAPL", {"If-None-Match": '"something-else"'}),
+    ])
+    assert not_modified.status_code == 304 and not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+    assert changed.status_code == 200
+    assert app.cache.stats()["not_modified"] == 1
+
+
+def test_identical_inflight_requests_coalesce():
+    backend = FakeBackend(delay=0.1)
+    app = ApiService(backend, ttls={"quotes": 0})
+    responses = request_all(app, [("/quotes?symbols=MSFT,AAPL", None), ("/quotes?symbols=aapl,msft", None)] * 10)
+    assert backend.calls["quotes"] == 1
+    assert {r.headers["x-cache"] for r in responses} == {"miss", "coalesced"}
+    assert all(r.json()["quotes"] == responses[0].json()["quotes"] for r in responses)
+    # ttl 0: nothing is kept once the in-flight request finishes
+    request_all(app, [("/quotes?symbols=AAPL,MSFT", None)])
+    assert backend.calls["quotes"] == 2
+
+
+def test_backend_failure_shared_not_cached():
+    backend = FakeBackend(delay=0.05)
+    app = ApiService(backend)
+    responses = request_all(app, [("/news?ticker=FAIL", None)] * 3)
+    assert [r.status_code for r in responses] == [502] * 3
+    assert "All news providers failed" in responses[0].json()["error"]
+    assert backend.calls["news"] == 1
+    request_all(app, [("/news?ticker=FAIL", None)])
+    assert backend.calls["news"] == 2
+
+
+def test_portfolios_require_auth_and_cache_per_user(backend):
+    app = ApiService(backend)
+    missing, alice, bob, alice_again = request_all(app, [
+        ("/portfolios", None),
+        ("/portfolios", basic("alice@example.com", "pw")),
+        ("/portfolios", basic("bob@example.com", "pw")),
+        ("/portfolios", basic("alice@example.com", "pw")),
+    ])
+    assert missing.status_code == 401
+    assert alice.json()["portfolios"][0]["portfolio_name"] == "alice@example.com's"
+    assert bob.json()["portfolios"][0]["portfolio_name"] == "bob@example.com's"
+    assert alice_again.headers["cache-control"] == "private, max-age=30"
+    assert backend.calls["portfolios"] == 2
+
+
+def test_valuation_shares_quote_cache(backend):
+    app = ApiService(backend)
+    request_all(app, [("/quotes?symbols=AAPL,MSFT,ZZZZ", None)])
+    response = request_all(app, [("/portfolios/p1/valuation", basic("alice@example.com", "pw"))])[0]
+    body = response.json()
+    assert body["total_value"] == 10 * 200.0 + 2 * 400.0
+    assert body["total_cost"] == 10 * 150 + 2 * 300 + 5
+    assert body["missing_prices"] == ["ZZZZ"]
+    assert backend.calls["quotes"] == 1
+
+
+def test_errors_and_health(backend):
+    app = ApiService(backend)
+    no_ticker, bad_max, unknown, health = request_all(app, [
+        ("/news", None), ("/news?ticker=AAPL&max_articles=x", None), ("/nope", None), ("/health", None),
+    ])
+    assert (no_ticker.status_code, bad_max.status_code, unknown.status_code) == (400, 400, 404)
+    assert health.json()["status"] == "ok"
+
+    async def post():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post("/news?ticker=AAPL")
+    assert _run(post()).status_code == 405
+
+
+def test_lifespan_shutdown_closes_backend(backend):
+    closed = []
+
+    async def close():
+        closed.append(True)
+
+    backend.close = close
+    app = ApiService(backend)
+    messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message["type"])
+
+    _run(app({"type": "lifespan"}, receive, send))
+    assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+    assert closed == [True]
+
+
+# ---------------------------------------------------------------------------
+# DefaultBackend: per-user Supabase sessions
+# ---------------------------------------------------------------------------
+
+class FakeSupabase:
+    """One client = one auth session; reads are filtered to the signed-in user, like RLS."""
+
+    USERS = {"alice@example.com": ("pw-a", "uid-a"), "bob@example.com": ("pw-b", "uid-b")}
+    ROWS = {"uid-a": [{"portfolio_id": "pa", "user_id": "uid-a"}], "uid-b": [{"portfolio_id": "pb", "user_id": "uid-b"}]}
+
+    def __init__(self, signed_in: threading.Barrier):
+        self.user_id = None
+        self.signed_in = signed_in
+        self.auth = SimpleNamespace(sign_in_with_password=self._sign_in)
+
+    def _sign_in(self, credentials):
+        password, user_id = self.USERS.get(credentials["email"], (None, None))
+        if password != credentials["password"]:
+            return SimpleNamespace(user=None)
+        self.user_id = user_id
+        self.signed_in.wait(timeout=1)  # both users are signed in before either one reads
+        return SimpleNamespace(user=SimpleNamespace(id=user_id))
+
+    def table(self, name):
+        client = self
+
+        class Query:
+            def select(self, *columns):
+                return self
+
+            def eq(self, column, value):
+                return self
+
+            def execute(self):
+                time.sleep(0.01)
+                return SimpleNamespace(data=list(FakeSupabase.ROWS.get(client.user_id, [])))
+
+        return Query()
+
+
+def test_default_backend_isolates_concurrent_users(monkeypatch):
+    signed_in = threading.Barrier(2)
+    monkeypatch.setattr(db_functions, "_new_client", lambda: FakeSupabase(signed_in))
+    app = ApiService(DefaultBackend())
+    alice, bob = request_all(app, [
+        ("/portfolios", basic("alice@example.com", "pw-a")),
+        ("/portfolios", basic("bob@example.com", "pw-b")),
+    ])
+    assert [p["portfolio_id"] for p in alice.json()["portfolios"]] == ["pa"]
+    assert [p["portfolio_id"] for p in bob.json()["portfolios"]] == ["pb"]
+
+    wrong = request_all(app, [("/portfolios", basic("alice@example.com", "nope"))])[0]
+    assert wrong.status_code == 401
+    assert app.cache.stats()["size"] == 2
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def test_cache_evicts_least_recently_used():
+    async def scenario():
+        cache = ResponseCache(max_entries=2)
+
+        async def value():
+            return {"v": 1}
+
+        for key in ("a", "b", "a", "c"):
+            await cache.fetch(key, 60, value)
+        return cache
+
+    cache = _run(scenario())
+    assert list(cache._entries) == ["a", "c"]
+
+
+def test_value_portfolio_without_prices():
+    result = value_portfolio("p1", [{"symbol": "AAPL", "quantity": "3", "average_price": 10}], {})
+    assert result["positions"][0]["market_value"] is None
+    assert result["total_value"] == 0 and result["total_cost"] == 30
+    assert result["missing_prices"] == ["AAPL"]
@@ -0,0 +1,110 @@
+"""
+Tests for article_store.py
+
+Run:
+    python -m pytest test_article_store.py -v
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from article_store import ArticleStore
+
+
+ARTICLES = [
+    {
+        "headline": "Nvidia warns of supply chain constraints",
+        "url": "https://www.reuters.com/nvda-supply?utm_source=x",
+        "summary": "Chip shortages could limit data center shipments.",
+        "published_at": "2025-03-10 09:00:00",
+        "source": "Reuters",
+    },
+    {
+        "headline": "Nvidia unveils new GPU",
+        "url": "https://cnbc.com/nvda-gpu",
+        "summary": "The launch event drew a record audience.",
+        "published_at": "2025-03-20T15:00:00Z",
+        "source": "CNBC",
+    },
+    {
+        "headline": "Apple faces supply chain risk in Asia",
+        "url": "https://bloomberg.com/apple-supply",
+        "summary": "Factories report delays.",
+        "published_at": "2025-03-15T12:00:00Z",
+        "source": "Bloomberg",
+    },
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = ArticleStore(str(tmp_path / "articles.db"))
+    s.upsert("NVDA", ARTICLES[:2])
+    s.upsert("aapl", ARTICLES[2:])
+    yield s
+    s.close()
+
+
+def test_full_text_search_filtered_by_ticker(store):
+    results = store.search("supply chain risk", ticker="NVDA")
+    assert results == []
+    results = store.search("supply chain", ticker="NVDA")
+    assert [r["headline"] for r in results] == ["Nvidia warns of supply chain constraints"]
+
+
+def test_search_matches_summary(store):
+    results = store.search("shortages")
+    assert [r["source"] for r in results] == ["Reuters"]
+
+
+def test_date_range_filter(store):
+    results = store.search(
+        ticker="NVDA",
+        start=datetime(2025, 3, 15, tzinfo=timezone.utc),
+        end="2025-03-31T00:00:00Z",
+    )
+    assert [r["headline"] for r in results] == ["Nvidia unveils new GPU"]
+
+
+def test_date_only_end_includes_that_day(store):
+    results = store.search(ticker="NVDA", start="2025-03-15", end="2025-03-20")
+    assert [r["headline"] for r in results] == ["Nvidia unveils new GPU"]
+    assert store.search(ticker="NVDA", start="2025-03-15", end="2025-03-19") == []
+
+
+def test_without_query_newest_first(store):
+    results = store.search()
+    assert [r["source"] for r in results] == ["CNBC", "Bloomberg", "Reuters"]
+
+
+def test_upsert_is_keyed_by_canonical_url(store):
+    updated = dict(ARTICLES[0], url="https://reuters.com/nvda-supply", headline="Nvidia supply chain update")
+    store.upsert("NVDA", [updated])
+    assert store.count() == 3
+    assert store.search("update")[0]["headline"] == "Nvidia supply chain update"
+    assert store.search("constraints") == []
+
+
+def test_same_article_linked_to_several_tickers(store):
+    store.upsert("TSM", ARTICLES[:1])
+    assert store.count() == 3
+    assert [r["source"] for r in store.search("supply", ticker="TSM")] == ["Reuters"]
+
+
+def test_query_with_fts_syntax_characters(store):
+    assert [r["source"] for r in store.search('supply "chain" (risk*')] == ["Bloomberg"]
+
+
+def test_articles_without_url_skipped(store):
+    assert store.upsert("NVDA", [{"headline": "No link", "url": ""}]) == 0
+
+
+def test_persists_across_reopen(tmp_path):
+    path = str(tmp_path / "articles.db")
+    s = ArticleStore(path)
+    s.upsert("NVDA", ARTICLES[:1])
+    s.close()
+    reopened = ArticleStore(path)
+    assert reopened.search("supply", ticker="NVDA")[0]["url"] == ARTICLES[0]["url"]
+    reopened.close()
@@ -0,0 +1,29 @@
+"""
+Import-time budget for the FiscalIQ modules (see bench_import_time.py).
+
+Run:
+    python -m pytest test_import_time.py -v
+"""
+
+import pytest
+
+from bench_import_time import IMPORT_BUDGETS_MS, measure, parse_importtime
+
+
+def test_parse_importtime():
+    rows = parse_importtime(
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |     _json\n"
+        "import time:       800 |        920 |   json\n"
+        "import time:      1500 |       2420 | news_tool\n"
+    )
+    assert [(r["module"], r["depth"], r["cumulative_us"]) for r in rows] == [
+        ("_json", 2, 120), ("json", 1, 920), ("news_tool", 0, 2420),
+    ]
+
+
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGETS_MS))
+def test_import_within_budget(module):
+    result = measure(module, runs=3)
+    assert result["lazy_dependencies_loaded"] == []
+    assert result["cumulative_ms"] <= IMPORT_BUDGETS_MS[module], result["heaviest"]
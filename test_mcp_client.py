@@ -0,0 +1,196 @@
+"""
+Tests for mcp_client.py, run against a fake stdio MCP server subprocess.
+
+Run:
+    python -m pytest test_mcp_client.py -v
+"""
+
+import asyncio
+import sys
+import textwrap
+import time
+
+import pytest
+
+from mcp_client import McpError, StdioMcpClient, _decode_tool_result
+from news_tool import (
+    add_news_to_notebooklm,
+    configure_notebook_id_cache,
+    configure_notebook_shards,
+    configure_source_ledger,
+    configure_summary_cache,
+)
+
+
+# Answers each request on its own thread, so slow calls reply after fast ones.
+FAKE_SERVER = textwrap.dedent(
+    """
+    import json, sys, threading, time
+
+    lock = threading.Lock()
+    state = {"initialized": False, "notebooks": []}
+
+    def send(message):
+        with lock:
+            sys.stdout.write(json.dumps(message) + "\\n")
+            sys.stdout.flush()
+
+    def text(value):
+        return {"content": [{"type": "text", "text": value if isinstance(value, str) else json.dumps(value)}]}
+
+    def handle(msg):
+        params = msg.get("params") or {}
+        if msg["method"] == "initialize":
+            return {"protocolVersion": params["protocolVersion"], "capabilities": {"tools": {}},
+                    "serverInfo": {"name": "fake-notebooklm", "version": "0"}}
+        if msg["method"] == "tools/list":
+            return {"tools": [{"name": "sleep"}, {"name": "echo"}]}
+        if not state["initialized"]:
+            raise RuntimeError("request before notifications/initialized")
+        name, args = params["name"], params.get("arguments") or {}
+        if name == "sleep":
+            time.sleep(args["seconds"])
+            return text({"slept": args["seconds"]})
+        if name == "echo":
+            return text(args["text"])
+        if name == "fail":
+            return {"content": [{"type": "text", "text": "boom"}], "isError": True}
+        if name == "exit":
+            sys.stdout.flush()
+            import os; os._exit(0)
+        if name == "notebook_list":
+            return text({"notebooks": state["notebooks"]})
+        if name == "notebook_create":
+            state["notebooks"].append({"id": "nb-1", "title": args["title"]})
+            return text({"id": "nb-1"})
+        if name == "source_add":
+            time.sleep(0.2)
+            return text({"status": "ok"})
+        if name == "notebook_query":
+            return text({"answer": "Fake summary."})
+        raise RuntimeError("unknown tool " + name)
+
+    def run(msg):
+        try:
+            send({"jsonrpc": "2.0", "id": msg["id"], "result": handle(msg)})
+        except Exception as e:
+            send({"jsonrpc": "2.0", "id": msg["id"], "error": {"code": -32000, "message": str(e)}})
+
+    for line in sys.stdin:
+        msg = json.loads(line)
+        if msg.get("method") == "notifications/initialized":
+            state["initialized"] = True
+        elif "id" in msg:
+            threading.Thread(target=run, args=(msg,)).start()
+    """
+)
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+@pytest.fixture
+def server_command(tmp_path):
+    path = tmp_path / "fake_mcp_server.py"
+    path.write_text(FAKE_SERVER)
+    return [sys.executable, str(path)]
+
+
+def test_handshake_and_list_tools(server_command):
+    async def scenario():
+        async with StdioMcpClient(server_command) as client:
+            return client.server_info, await client.list_tools()
+
+    info, tools = _run(scenario())
+    assert info["name"] == "fake-notebooklm"
+    assert [t["name"] for t in tools] == ["sleep", "echo"]
+
+
+def test_concurrent_calls_overlap(server_command):
+    async def scenario():
+        async with StdioMcpClient(server_command) as client:
+            start = time.perf_counter()
+            results = await asyncio.gather(*(client.call_tool("sleep", {"seconds": 0.3}) for _ in range(5)))
+            return results, time.perf_counter() - start
+
+    results, elapsed = _run(scenario())
+    assert results == [{"slept": 0.3}] * 5
+    assert elapsed < 1.0  # sequential would take 1.5s
+
+
+def test_replies_matched_by_id_out_of_order(server_command):
+    async def scenario():
+        async with StdioMcpClient(server_command) as client:
+            order = []
+
+            async def call(name, args):
+                result = await client.call_tool(name, args)
+                order.append(result)
+                return result
+
+            results = await asyncio.gather(call("sleep", {"seconds": 0.3}), call("echo", {"text": "fast"}))
+            return results, order
+
+    results, order = _run(scenario())
+    assert results == [{"slept": 0.3}, "fast"]
+    assert order == ["fast", {"slept": 0.3}]
+
+
+def test_tool_error_raises(server_command):
+    async def scenario():
+        async with StdioMcpClient(server_command) as client:
+            with pytest.raises(McpError, match="boom"):
+                await client.call_tool("fail", {})
+            with pytest.raises(McpError, match="unknown tool"):
+                await client.call_tool("missing", {})
+            return await client.call_tool("echo", {"text": "still alive"})
+
+    assert _run(scenario()) == "still alive"
+
+
+def test_error_with_structured_content_raises():
+    with pytest.raises(McpError, match="quota exceeded"):
+        _decode_tool_result({
+            "content": [{"type": "text", "text": "quota exceeded"}],
+            "structuredContent": {"status": "error"},
+            "isError": True,
+        })
+    with pytest.raises(McpError, match="error"):
+        _decode_tool_result({"structuredContent": {"status": "error"}, "isError": True})
+    assert _decode_tool_result({"structuredContent": {"id": "nb-1"}}) == {"id": "nb-1"}
+
+
+def test_server_exit_fails_pending_calls(server_command):
+    async def scenario():
+        async with StdioMcpClient(server_command) as client:
+            slow = asyncio.ensure_future(client.call_tool("sleep", {"seconds": 5}))
+            await asyncio.sleep(0.1)
+            with pytest.raises(McpError):
+                await client.call_tool("exit", {})
+            with pytest.raises(McpError, match="exited"):
+                await slow
+
+    _run(scenario())
+
+
+def test_drives_add_news_to_notebooklm(server_command):
+    configure_notebook_id_cache()
+    configure_source_ledger(":memory:")
+    configure_summary_cache()
+    configure_notebook_shards()
+    articles = [
+        {"headline": f"Story {i}", "url": f"https://example.com/{i}", "source": "Example", "published_at": ""}
+        for i in range(5)
+    ]
+
+    async def scenario():
+        async with StdioMcpClient(server_command) as client:
+            start = time.perf_counter()
+            report = await add_news_to_notebooklm(articles, "AAPL", "Apple Inc", client)
+            return report, time.perf_counter() - start
+
+    report, elapsed = _run(scenario())
+    assert "Fake summary." in report
+    assert "Sources (5 articles added)" in report
+    assert elapsed < 0.8  # five 0.2s source_add calls in parallel
@@ -0,0 +1,126 @@
+"""
+Tests for news_poller.py
+
+Run:
+    python -m pytest test_news_poller.py -v
+"""
+
+import requests
+
+from news_poller import NewsPoller
+
+
+def article(n, published_at):
+    return {
+        "headline": f"Story {n}",
+        "url": f"https://example.com/{n}",
+        "summary": "",
+        "published_at": published_at,
+        "source": "Reuters",
+    }
+
+
+class FakeFeed:
+    """Serves a growing list of articles newest first, honouring the since cutoff."""
+
+    def __init__(self):
+        self.articles = []
+        self.calls = []
+
+    def __call__(self, ticker, since):
+        self.calls.append((ticker, since))
+        out = sorted(self.articles, key=lambda a: a["published_at"], reverse=True)
+        return [a for a in out if since is None or a["published_at"] >= since.strftime("%Y-%m-%dT%H:%M:%SZ")]
+
+
+def make_poller(feed, tmp_path, emitted=None, **kwargs):
+    emitted = emitted if emitted is not None else []
+    return NewsPoller(
+        ["aapl"],
+        lambda ticker, articles: emitted.append((ticker, articles)),
+        state_path=str(tmp_path / "state.json"),
+        min_interval=10,
+        max_interval=100,
+        backoff=2,
+        fetch=feed,
+        **kwargs,
+    )
+
+
+def test_only_new_articles_are_emitted(tmp_path):
+    feed = FakeFeed()
+    feed.articles = [article(1, "2025-01-01T10:00:00Z"), article(2, "2025-01-01T11:00:00Z")]
+    emitted = []
+    poller = make_poller(feed, tmp_path, emitted)
+
+    first = poller.poll_once(now=0)
+    assert [a["headline"] for a in first["AAPL"]] == ["Story 2", "Story 1"]
+
+    feed.articles.append(article(3, "2025-01-01T12:00:00Z"))
+    second = poller.poll_once(now=1000)
+    assert [a["headline"] for a in second["AAPL"]] == ["Story 3"]
+    assert len(emitted) == 2
+
+
+def test_same_timestamp_articles_not_repeated(tmp_path):
+    feed = FakeFeed()
+    feed.articles = [article(1, "2025-01-01T10:00:00Z")]
+    poller = make_poller(feed, tmp_path)
+    poller.poll_once(now=0)
+
+    feed.articles.append(article(2, "2025-01-01T10:00:00Z"))
+    result = poller.poll_once(now=1000)
+    assert [a["headline"] for a in result["AAPL"]] == ["Story 2"]
+    assert poller.poll_once(now=2000) == {}
+
+
+def test_interval_adapts_to_news_volume(tmp_path):
+    feed = FakeFeed()
+    poller = make_poller(feed, tmp_path)
+
+    poller.poll_once(now=0)
+    assert poller.interval("AAPL") == 20
+    poller.poll_once(now=20)
+    assert poller.interval("AAPL") == 40
+    assert poller.next_due() == 60
+
+    feed.articles = [article(1, "2025-01-01T10:00:00Z")]
+    poller.poll_once(now=60)
+    assert poller.interval("AAPL") == 20
+
+
+def test_not_polled_before_due(tmp_path):
+    feed = FakeFeed()
+    poller = make_poller(feed, tmp_path)
+    poller.poll_once(now=0)
+    poller.poll_once(now=5)
+    assert len(feed.calls) == 1
+
+
+def test_cursor_persists_across_restarts(tmp_path):
+    feed = FakeFeed()
+    feed.articles = [article(1, "2025-01-01T10:00:00Z")]
+    make_poller(feed, tmp_path).poll_once(now=0)
+
+    restarted = make_poller(feed, tmp_path)
+    assert restarted.cursor("AAPL").isoformat() == "2025-01-01T10:00:00+00:00"
+    assert restarted.poll_once(now=0) == {}
+    assert feed.calls[-1][1] == restarted.cursor("AAPL")
+
+
+def test_provider_failure_backs_off(tmp_path):
+    def failing(ticker, since):
+        raise RuntimeError("All news providers failed")
+
+    poller = make_poller(failing, tmp_path)
+    assert poller.poll_once(now=0) == {}
+    assert poller.interval("AAPL") == 20
+
+
+def test_network_error_backs_off(tmp_path):
+    def failing(ticker, since):
+        raise requests.ConnectionError("connection reset")
+
+    poller = make_poller(failing, tmp_path)
+    assert poller.poll_once(now=0) == {}
+    assert poller.interval("AAPL") == 20
@@ -6,8 +6,19 @@ Sections:
   2. NewsdataProvider       — mocked HTTP
   3. NewsApiProvider        — mocked HTTP
   4. get_stock_news         — mocked providers
+  4a. Hedged providers     — get_stock_news(hedge_delay=...)
+  4b. Async path          — fetch_async / get_stock_news_async
+  4c. NewsCache             — TTL / LRU / stale-while-revalidate / persistence
+  4d. Batch fetch          — resolve_many / get_stock_news_many
+  4e. QuotaTracker         — budgets, 429 cool-down, header parsing, persistence
+  4f. Merge mode           — canonicalize_url / merge_articles / get_stock_news(merge=True)
+  4g. Pagination           — fetch_page / iter_stock_news
   5. add_news_to_notebooklm — mocked MCP client
   6. delete_fiscaliq_notebook — mocked MCP client
+  6b. Notebook id cache     — lazy validation, invalidation, persistence
+  6c. Source ledger         — skip already-added URLs, persistence, cleared on delete
+  6d. Summary cache         — reuse summaries for an unchanged source set, TTL, delete
+  6e. Notebook shards       — per-ticker / per-sector notebooks, LRU and age eviction
   7. Schema structure       — sanity checks on the exported schema dicts
   8. Live smoke test        — real network call, skipped if key absent
 
@@ -20,7 +31,12 @@ Run everything including the live smoke test:
 
 import asyncio
 import os
+import threading
+import time
 import pytest
+import requests
+from concurrent.futures import wait as wait_all
+from datetime import datetime, timezone
 from unittest.mock import MagicMock, AsyncMock, patch
 
 from news_tool import (
@@ -29,6 +45,27 @@ from news_tool import (
     NewsdataProvider,
     NewsApiProvider,
     get_stock_news,
+    get_stock_news_async,
+    resolve_many,
+    iter_stock_news_many,
+    get_stock_news_many,
+    QuotaTracker,
+    QuotaExceededError,
+    RateLimitError,
+    configure_quota_tracker,
+    disable_quota_tracker,
+    canonicalize_url,
+    merge_articles,
+    iter_stock_news,
+    configure_notebook_id_cache,
+    configure_source_ledger,
+    configure_summary_cache,
+    configure_notebook_shards,
+    notebook_registry,
+    SourceLedger,
+    NewsCache,
+    configure_news_cache,
+    disable_news_cache,
     add_news_to_notebooklm,
     delete_fiscaliq_notebook,
     FISCALIQ_NOTEBOOK_NAME,
@@ -60,12 +97,13 @@ SAMPLE_ARTICLES = [
 ]
 
 
-def make_mock_response(status_code=200, json_body=None, text=""):
+def make_mock_response(status_code=200, json_body=None, text="", headers=None):
     resp = MagicMock()
     resp.status_code = status_code
     resp.ok = status_code < 400
     resp.json.return_value = json_body or {}
     resp.text = text
+    resp.headers = headers or {}
     return resp
 
 
@@ -138,7 +176,7 @@ class TestNewsdataProvider:
 
     def test_fetch_returns_normalized_fields(self):
         with patch.dict(os.environ, {"NEWSDATA_API_KEY": "test_key"}):
-            with patch("news_tool.requests.get") as mock_get:
+            with patch("news_tool._HTTP_SESSION.get") as mock_get:
                 mock_get.return_value = make_mock_response(200, NEWSDATA_RESPONSE)
                 results = self.provider.fetch("AAPL", "Apple Inc", 5)
 
@@ -158,28 +196,28 @@ class TestNewsdataProvider:
 
     def test_rate_limit_raises_provider_error(self):
         with patch.dict(os.environ, {"NEWSDATA_API_KEY": "test_key"}):
-            with patch("news_tool.requests.get") as mock_get:
+            with patch("news_tool._HTTP_SESSION.get") as mock_get:
                 mock_get.return_value = make_mock_response(429)
-                with pytest.raises(ProviderError, match="rate limit"):
+                with pytest.raises(RateLimitError, match="rate limit"):
                     self.provider.fetch("AAPL", "Apple Inc", 5)
 
     def test_invalid_key_raises_provider_error(self):
         with patch.dict(os.environ, {"NEWSDATA_API_KEY": "bad_key"}):
-            with patch("news_tool.requests.get") as mock_get:
+            with patch("news_tool._HTTP_SESSION.get") as mock_get:
                 mock_get.return_value = make_mock_response(401)
                 with pytest.raises(ProviderError, match="invalid API key"):
                     self.provider.fetch("AAPL", "Apple Inc", 5)
 
     def test_other_http_error_raises_provider_error(self):
         with patch.dict(os.environ, {"NEWSDATA_API_KEY": "test_key"}):
-            with patch("news_tool.requests.get") as mock_get:
+            with patch("news_tool._HTTP_SESSION.get") as mock_get:
                 mock_get.return_value = make_mock_response(500, text="Server error")
                 with pytest.raises(ProviderError, match="500"):
                     self.provider.fetch("AAPL", "Apple Inc", 5)
 
     def test_max_articles_capped_at_10(self):
         with patch.dict(os.environ, {"NEWSDATA_API_KEY": "test_key"}):
-            with patch("news_tool.requests.get") as mock_get:
+            with patch("news_tool._HTTP_SESSION.get") as mock_get:
                 mock_get.return_value = make_mock_response(200, {"results": []})
                 self.provider.fetch("AAPL", "Apple Inc", 50)
                 call_params = mock_get.call_args[1]["params"]
@@ -187,7 +225,7 @@ class TestNewsdataProvider:
 
     def test_empty_results_returns_empty_list(self):
         with patch.dict(os.environ, {"NEWSDATA_API_KEY": "test_key"}):
-            with patch("news_tool.requests.get") as mock_get:
+            with patch("news_tool._HTTP_SESSION.get") as mock_get:
                 mock_get.return_value = make_mock_response(200, {"results": []})
                 results = self.provider.fetch("AAPL", "Apple Inc", 5)
                 assert results == []
@@ -217,7 +255,7 @@ class TestNewsApiProvider:
 
     def test_fetch_returns_normalized_fields(self):
         with patch.dict(os.environ, {"NEWSAPI_KEY": "test_key"}):
-            with patch("news_tool.requests.get") as mock_get:
+            with patch("news_tool._HTTP_SESSION.get") as mock_get:
                 mock_get.return_value = make_mock_response(200, NEWSAPI_RESPONSE)
                 results = self.provider.fetch("TSLA", "Tesla", 5)
 
@@ -237,21 +275,21 @@ class TestNewsApiProvider:
 
     def test_rate_limit_raises_provider_error(self):
         with patch.dict(os.environ, {"NEWSAPI_KEY": "test_key"}):
-            with patch("news_tool.requests.get") as mock_get:
+            with patch("news_tool._HTTP_SESSION.get") as mock_get:
                 mock_get.return_value = make_mock_response(429)
                 with pytest.raises(ProviderError, match="rate limit"):
                     self.provider.fetch("TSLA", "Tesla", 5)
 
     def test_invalid_key_raises_provider_error(self):
         with patch.dict(os.environ, {"NEWSAPI_KEY": "bad_key"}):
-            with patch("news_tool.requests.get") as mock_get:
+            with patch("news_tool._HTTP_SESSION.get") as mock_get:
                 mock_get.return_value = make_mock_response(401)
                 with pytest.raises(ProviderError, match="invalid API key"):
                     self.provider.fetch("TSLA", "Tesla", 5)
 
     def test_api_error_status_raises_provider_error(self):
         with patch.dict(os.environ, {"NEWSAPI_KEY": "test_key"}):
-            with patch("news_tool.requests.get") as mock_get:
+            with patch("news_tool._HTTP_SESSION.get") as mock_get:
                 mock_get.return_value = make_mock_response(
                     200, {"status": "error", "message": "apiKeyInvalid"}
                 )
@@ -260,7 +298,7 @@ class TestNewsApiProvider:
 
     def test_empty_articles_returns_empty_list(self):
         with patch.dict(os.environ, {"NEWSAPI_KEY": "test_key"}):
-            with patch("news_tool.requests.get") as mock_get:
+            with patch("news_tool._HTTP_SESSION.get") as mock_get:
                 mock_get.return_value = make_mock_response(200, {"status": "ok", "articles": []})
                 results = self.provider.fetch("TSLA", "Tesla", 5)
                 assert results == []
@@ -334,6 +372,595 @@ class TestGetStockNews:
                 assert field in article, f"Missing field: {field}"
 
 
+# ---------------------------------------------------------------------------
+# 4a. Hedged providers
+# ---------------------------------------------------------------------------
+
+class TestHedgedProviders:
+    def _provider(self, articles=None, delay=0.0, raises=None):
+        provider = MagicMock()
+
+        def fetch(ticker, company_name, max_articles):
+            time.sleep(delay)
+            if raises:
+                raise raises
+            return articles
+
+        provider.fetch.side_effect = fetch
+        return provider
+
+    def test_slow_primary_is_hedged(self):
+        slow = self._provider(SAMPLE_ARTICLES[:1], delay=1.0)
+        fast = self._provider(SAMPLE_ARTICLES, delay=0.0)
+        with patch("news_tool._PROVIDERS", {"newsdata": slow, "newsapi": fast}):
+            start = time.perf_counter()
+            results = get_stock_news(ticker="AAPL", company_name="Apple Inc", hedge_delay=0.05)
+            elapsed = time.perf_counter() - start
+        assert results == SAMPLE_ARTICLES
+        assert elapsed < 0.5
+
+    def test_fast_primary_does_not_start_fallback(self):
+        fast = self._provider(SAMPLE_ARTICLES)
+        other = self._provider(SAMPLE_ARTICLES[:1])
+        with patch("news_tool._PROVIDERS", {"newsdata": fast, "newsapi": other}):
+            results = get_stock_news(ticker="AAPL", company_name="Apple Inc", hedge_delay=0.5)
+        assert results == SAMPLE_ARTICLES
+        other.fetch.assert_not_called()
+
+    def test_priority_breaks_ties(self):
+        p1 = self._provider(SAMPLE_ARTICLES, delay=0.05)
+        p2 = self._provider(SAMPLE_ARTICLES[:1], delay=0.05)
+        with patch("news_tool._PROVIDERS", {"newsdata": p1, "newsapi": p2}):
+            # Let both providers finish before the race is judged.
+            with patch("news_tool.wait", side_effect=lambda fs, **kw: wait_all(fs)):
+                results = get_stock_news(ticker="AAPL", company_name="Apple Inc", hedge_delay=0)
+        assert results == SAMPLE_ARTICLES
+
+    def test_failure_starts_fallback_immediately(self):
+        p1 = self._provider(raises=ProviderError("rate limited"))
+        p2 = self._provider(SAMPLE_ARTICLES)
+        with patch("news_tool._PROVIDERS", {"newsdata": p1, "newsapi": p2}):
+            start = time.perf_counter()
+            results = get_stock_news(ticker="AAPL", company_name="Apple Inc", hedge_delay=5)
+            elapsed = time.perf_counter() - start
+        assert results == SAMPLE_ARTICLES
+        assert elapsed < 1
+
+    def test_network_error_on_one_leg_does_not_abort_race(self):
+        p1 = self._provider(raises=requests.exceptions.ConnectTimeout("connect timed out"))
+        p2 = self._provider(SAMPLE_ARTICLES, delay=0.05)
+        with patch("news_tool._PROVIDERS", {"newsdata": p1, "newsapi": p2}):
+            results = get_stock_news(ticker="AAPL", company_name="Apple Inc", hedge_delay=0)
+        assert results == SAMPLE_ARTICLES
+
+    def test_raises_when_all_fail(self):
+        p1 = self._provider(raises=ProviderError("p1 fail"))
+        p2 = self._provider([])
+        with patch("news_tool._PROVIDERS", {"newsdata": p1, "newsapi": p2}):
+            with pytest.raises(RuntimeError, match="All news providers failed"):
+                get_stock_news(ticker="AAPL", company_name="Apple Inc", hedge_delay=0)
+
+
+# ---------------------------------------------------------------------------
+# 4b. Async path
+# ---------------------------------------------------------------------------
+
+class TestAsyncNews:
+    def _run(self, coro):
+        return asyncio.get_event_loop().run_until_complete(coro)
+
+    def test_fetch_async_uses_shared_async_client(self):
+        client = MagicMock()
+        client.get = AsyncMock(return_value=make_mock_response(200, NEWSAPI_RESPONSE))
+        with patch.dict(os.environ, {"NEWSAPI_KEY": "test_key"}):
+            with patch("news_tool._get_async_client", return_value=client):
+                results = self._run(NewsApiProvider().fetch_async("TSLA", "Tesla", 5))
+        assert results[0]["headline"] == "Tesla record delivery"
+        assert client.get.call_args[1]["params"]["q"] == "Tesla"
+
+    def test_fetch_async_falls_back_to_sync_session_without_httpx(self):
+        with patch.dict(os.environ, {"NEWSDATA_API_KEY": "test_key"}):
+            with patch("news_tool._get_async_client", return_value=None):
+                with patch("news_tool._HTTP_SESSION.get") as mock_get:
+                    mock_get.return_value = make_mock_response(429)
+                    with pytest.raises(ProviderError, match="rate limit"):
+                        self._run(NewsdataProvider().fetch_async("AAPL", "Apple Inc", 5))
+
+    def test_get_stock_news_async_falls_back(self):
+        p1 = MagicMock()
+        p1.fetch_async = AsyncMock(side_effect=ProviderError("rate limited"))
+        p2 = MagicMock()
+        p2.fetch_async = AsyncMock(return_value=SAMPLE_ARTICLES)
+        with patch("news_tool._PROVIDERS", {"newsdata": p1, "newsapi": p2}):
+            results = self._run(get_stock_news_async(ticker="AAPL", company_name="Apple Inc"))
+        assert results == SAMPLE_ARTICLES
+
+    def test_get_stock_news_async_hedge_cancels_slow_provider(self):
+        cancelled = []
+
+        async def slow(*args):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        p1 = MagicMock()
+        p1.fetch_async = slow
+        p2 = MagicMock()
+        p2.fetch_async = AsyncMock(return_value=SAMPLE_ARTICLES)
+
+        async def run():
+            results = await get_stock_news_async(ticker="AAPL", company_name="Apple Inc", hedge_delay=0.01)
+            await asyncio.sleep(0)
+            return results
+
+        with patch("news_tool._PROVIDERS", {"newsdata": p1, "newsapi": p2}):
+            results = self._run(run())
+        assert results == SAMPLE_ARTICLES
+        assert cancelled == [True]
+
+    def test_get_stock_news_async_hedge_survives_transport_error(self):
+        p1 = MagicMock()
+        p1.fetch_async = AsyncMock(side_effect=ConnectionError("reset by peer"))
+        p2 = MagicMock()
+        p2.fetch_async = AsyncMock(return_value=SAMPLE_ARTICLES)
+        with patch("news_tool._PROVIDERS", {"newsdata": p1, "newsapi": p2}):
+            results = self._run(get_stock_news_async(ticker="AAPL", company_name="Apple Inc", hedge_delay=0))
+        assert results == SAMPLE_ARTICLES
+
+    def test_get_stock_news_async_raises_when_all_fail(self):
+        p1 = MagicMock()
+        p1.fetch_async = AsyncMock(return_value=[])
+        with patch("news_tool._PROVIDERS", {"newsdata": p1}):
+            with pytest.raises(RuntimeError, match="All news providers failed"):
+                self._run(get_stock_news_async(ticker="AAPL", providers=["newsdata"]))
+
+    def test_get_stock_news_async_merge_matches_sync(self):
+        p1 = MagicMock()
+        p1.fetch_async = AsyncMock(side_effect=ProviderError("rate limited"))
+        p1.fetch.side_effect = ProviderError("rate limited")
+        p2 = MagicMock()
+        p2.fetch_async = AsyncMock(return_value=[SAMPLE_ARTICLES[1], SAMPLE_ARTICLES[0]])
+        p2.fetch.return_value = [SAMPLE_ARTICLES[1], SAMPLE_ARTICLES[0]]
+        with patch("news_tool._PROVIDERS", {"newsdata": p1, "newsapi": p2}):
+            results = self._run(get_stock_news_async(ticker="AAPL", company_name="Apple Inc", merge=True))
+            expected = get_stock_news(ticker="AAPL", company_name="Apple Inc", merge=True)
+        assert results == expected == [SAMPLE_ARTICLES[1], SAMPLE_ARTICLES[0]]
+        assert p1.fetch_async.await_count == 1
+
+
+# ---------------------------------------------------------------------------
+# 4c. NewsCache
+# ---------------------------------------------------------------------------
+
+class TestNewsCache:
+    def teardown_method(self):
+        disable_news_cache()
+
+    def test_key_is_normalized(self):
+        k1 = NewsCache.make_key("aapl ", "Apple  Inc", 10, ["newsdata", "newsapi"])
+        k2 = NewsCache.make_key("AAPL", "apple inc", 10, ["NewsData", "newsapi"])
+        assert k1 == k2
+        assert k1 != NewsCache.make_key("AAPL", "apple inc", 5, ["newsdata", "newsapi"])
+
+    def test_hit_skips_fetch_and_counts_stats(self):
+        cache = NewsCache(ttl=60)
+        fetch = MagicMock(return_value=SAMPLE_ARTICLES)
+        assert cache.get_or_fetch("k", fetch) == SAMPLE_ARTICLES
+        assert cache.get_or_fetch("k", fetch) == SAMPLE_ARTICLES
+        assert fetch.call_count == 1
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["size"] == 1
+
+    def test_expired_entry_is_refetched(self):
+        cache = NewsCache(ttl=60)
+        cache.set("k", SAMPLE_ARTICLES)
+        with patch("news_tool.time.time", return_value=time.time() + 120):
+            assert cache.get("k") is None
+
+    def test_empty_results_not_cached(self):
+        cache = NewsCache(ttl=60)
+        cache.get_or_fetch("k", lambda: [])
+        assert cache.stats()["size"] == 0
+
+    def test_lru_evicts_least_recently_used(self):
+        cache = NewsCache(ttl=60, max_entries=2)
+        cache.set("a", SAMPLE_ARTICLES)
+        cache.set("b", SAMPLE_ARTICLES)
+        cache.get("a")
+        cache.set("c", SAMPLE_ARTICLES)
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.stats()["evictions"] == 1
+
+    def test_stale_entry_served_while_revalidating(self):
+        cache = NewsCache(ttl=60, stale_ttl=600)
+        cache.set("k", SAMPLE_ARTICLES[:1])
+        refreshed = threading.Event()
+
+        def fetch():
+            refreshed.set()
+            return SAMPLE_ARTICLES
+
+        with patch("news_tool.time.time", return_value=time.time() + 120):
+            assert cache.get_or_fetch("k", fetch) == SAMPLE_ARTICLES[:1]
+        assert refreshed.wait(2)
+        for _ in range(100):
+            if cache.get("k")[0] == SAMPLE_ARTICLES:
+                break
+            time.sleep(0.01)
+        assert cache.get("k") == (SAMPLE_ARTICLES, True)
+        assert cache.stats()["stale_hits"] == 1
+
+    def test_persists_to_disk(self, tmp_path):
+        path = str(tmp_path / "news_cache.json")
+        NewsCache(ttl=60, path=path).set("k", SAMPLE_ARTICLES)
+        reloaded = NewsCache(ttl=60, path=path)
+        assert reloaded.get("k") == (SAMPLE_ARTICLES, True)
+
+    def test_writes_batched_within_save_interval(self, tmp_path):
+        path = str(tmp_path / "news_cache.json")
+        cache = NewsCache(ttl=60, path=path, save_interval=60)
+        with patch.object(cache, "_save", wraps=cache._save) as save:
+            for i in range(5):
+                cache.set(f"k{i}", SAMPLE_ARTICLES)
+            assert save.call_count == 1
+            cache.flush()
+            assert save.call_count == 2
+        assert NewsCache(ttl=60, path=path).get("k4") == (SAMPLE_ARTICLES, True)
+
+    def test_callers_get_copies(self):
+        cache = NewsCache(ttl=60)
+        fetched = [dict(a) for a in SAMPLE_ARTICLES]
+        first = cache.get_or_fetch("k", lambda: fetched)
+        first.append({"headline": "injected"})
+        fetched[0]["headline"] = "edited"
+        second = cache.get_or_fetch("k", lambda: [])
+        second.sort(key=lambda a: a["url"], reverse=True)
+        second[0]["headline"] = "edited again"
+        assert cache.get("k") == (SAMPLE_ARTICLES, True)
+
+    def test_get_stock_news_uses_configured_cache(self):
+        p1 = MagicMock()
+        p1.fetch.return_value = SAMPLE_ARTICLES
+        configure_news_cache(ttl=60)
+        with patch("news_tool._PROVIDERS", {"newsdata": p1}):
+            get_stock_news(ticker="AAPL", company_name="Apple Inc", providers=["newsdata"])
+            get_stock_news(ticker="aapl", company_name="Apple Inc", providers=["newsdata"])
+            get_stock_news(ticker="AAPL", company_name="Apple Inc", providers=["newsdata"], use_cache=False)
+        assert p1.fetch.call_count == 2
+
+
+# ---------------------------------------------------------------------------
+# 4d. Batch fetch
+# ---------------------------------------------------------------------------
+
+class TestGetStockNewsMany:
+    def test_resolve_many_matches_resolve_inputs(self):
+        resolved = resolve_many(["aapl", "ZZZZ_UNKNOWN", " AAPL "])
+        assert resolved == {
+            "AAPL": resolve_inputs("AAPL", None)[1],
+            "ZZZZ_UNKNOWN": "ZZZZ_UNKNOWN",
+        }
+
+    def test_returns_results_keyed_by_ticker(self):
+        p1 = MagicMock()
+        p1.fetch.side_effect = lambda t, n, m: [{**SAMPLE_ARTICLES[0], "headline": t}]
+        with patch("news_tool._PROVIDERS", {"newsdata": p1}):
+            results = get_stock_news_many(["AAPL", "TSLA", "MSFT"], providers=["newsdata"])
+        assert set(results) == {"AAPL", "TSLA", "MSFT"}
+        assert results["TSLA"][0]["headline"] == "TSLA"
+
+    def test_respects_per_provider_concurrency(self):
+        active = {"newsdata": 0, "newsapi": 0}
+        peak = {"newsdata": 0, "newsapi": 0}
+        lock = threading.Lock()
+
+        def make(name):
+            def fetch(t, n, m):
+                with lock:
+                    active[name] += 1
+                    peak[name] = max(peak[name], active[name])
+                time.sleep(0.02)
+                with lock:
+                    active[name] -= 1
+                return SAMPLE_ARTICLES
+            p = MagicMock()
+            p.fetch.side_effect = fetch
+            return p
+
+        tickers = [f"T{i}" for i in range(20)]
+        with patch("news_tool._PROVIDERS", {"newsdata": make("newsdata"), "newsapi": make("newsapi")}):
+            results = get_stock_news_many(tickers, per_provider_concurrency=2)
+        assert len(results) == 20
+        assert peak["newsdata"] <= 2 and peak["newsapi"] <= 2
+        # Both providers took part of the load
+        assert peak["newsdata"] > 0 and peak["newsapi"] > 0
+
+    def test_rate_limited_provider_skipped_for_rest_of_batch(self):
+        p1 = MagicMock()
+        p1.fetch.side_effect = RateLimitError("quota spent")
+        p2 = MagicMock()
+        p2.fetch.return_value = SAMPLE_ARTICLES
+        tickers = [f"T{i}" for i in range(10)]
+        with patch("news_tool._PROVIDERS", {"newsdata": p1, "newsapi": p2}):
+            results = get_stock_news_many(tickers, per_provider_concurrency=1)
+        assert all(results[t] == SAMPLE_ARTICLES for t in tickers)
+        assert p1.fetch.call_count < len(tickers)
+
+    def test_other_provider_errors_dont_exhaust_provider(self):
+        p1 = MagicMock()
+        p1.fetch.side_effect = ProviderError("newsdata.io error 500: rate limit backend down")
+        tickers = [f"T{i}" for i in range(4)]
+        with patch("news_tool._PROVIDERS", {"newsdata": p1}):
+            list(iter_stock_news_many(tickers, providers=["newsdata"], per_provider_concurrency=1))
+        assert p1.fetch.call_count == len(tickers)
+
+    def test_streams_errors_per_ticker(self):
+        p1 = MagicMock()
+        p1.fetch.side_effect = lambda t, n, m: [] if t == "BAD" else SAMPLE_ARTICLES
+        with patch("news_tool._PROVIDERS", {"newsdata": p1}):
+            out = {t: (a, e) for t, a, e in iter_stock_news_many(["GOOD", "BAD"], providers=["newsdata"])}
+        assert out["GOOD"] == (SAMPLE_ARTICLES, None)
+        assert out["BAD"][0] == []
+        assert isinstance(out["BAD"][1], RuntimeError)
+
+
+# ---------------------------------------------------------------------------
+# 4e. QuotaTracker
+# ---------------------------------------------------------------------------
+
+class TestQuotaTracker:
+    def teardown_method(self):
+        disable_quota_tracker()
+
+    def test_daily_limit_blocks_without_network_call(self):
+        configure_quota_tracker(limits={"newsdata": {"per_day": 1}})
+        provider = NewsdataProvider()
+        with patch.dict(os.environ, {"NEWSDATA_API_KEY": "test_key"}):
+            with patch("news_tool._HTTP_SESSION.get") as mock_get:
+                mock_get.return_value = make_mock_response(200, NEWSDATA_RESPONSE)
+                provider.fetch("AAPL", "Apple Inc", 5)
+                with pytest.raises(QuotaExceededError, match="daily quota"):
+                    provider.fetch("AAPL", "Apple Inc", 5)
+        assert mock_get.call_count == 1
+
+    def test_per_minute_limit(self):
+        tracker = QuotaTracker(limits={"newsapi": {"per_day": None, "per_minute": 2}})
+        tracker.acquire("newsapi")
+        tracker.acquire("newsapi")
+        assert not tracker.is_available("newsapi")
+        with patch("news_tool.time.time", return_value=time.time() + 61):
+            assert tracker.is_available("newsapi")
+
+    def test_429_puts_provider_in_cooldown(self):
+        tracker = QuotaTracker(limits={"newsdata": {"cooldown": 120}})
+        tracker.observe("newsdata", 429, {})
+        assert not tracker.is_available("newsdata")
+        assert tracker.usage()["newsdata"]["cooldown_remaining"] == pytest.approx(120, abs=1)
+
+    def test_retry_after_header_sets_cooldown(self):
+        tracker = QuotaTracker()
+        tracker.observe("newsapi", 429, {"Retry-After": "30"})
+        assert tracker.usage()["newsapi"]["cooldown_remaining"] == pytest.approx(30, abs=1)
+
+    def test_remaining_zero_header_sets_cooldown(self):
+        tracker = QuotaTracker()
+        reset_at = str(int(time.time()) + 45)
+        tracker.observe("newsdata", 200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset_at})
+        assert tracker.usage()["newsdata"]["cooldown_remaining"] == pytest.approx(45, abs=2)
+
+    def test_get_stock_news_skips_cooling_provider(self):
+        configure_quota_tracker()
+        with patch.dict(os.environ, {"NEWSDATA_API_KEY": "k", "NEWSAPI_KEY": "k"}):
+            with patch("news_tool._HTTP_SESSION.get") as mock_get:
+                mock_get.side_effect = [
+                    make_mock_response(429),
+                    make_mock_response(200, NEWSAPI_RESPONSE),
+                    make_mock_response(200, NEWSAPI_RESPONSE),
+                ]
+                get_stock_news(ticker="TSLA", company_name="Tesla")
+                results = get_stock_news(ticker="TSLA", company_name="Tesla")
+        assert results[0]["headline"] == "Tesla record delivery"
+        # newsdata was called once (the 429); the second call went straight to newsapi
+        urls = [c[0][0] for c in mock_get.call_args_list]
+        assert urls.count(NewsdataProvider.BASE_URL) == 1
+
+    def test_counters_persist_across_restarts(self, tmp_path):
+        path = str(tmp_path / "quotas.json")
+        QuotaTracker(limits={"newsapi": {"per_day": 1}}, path=path).acquire("newsapi")
+        reloaded = QuotaTracker(limits={"newsapi": {"per_day": 1}}, path=path)
+        assert reloaded.usage()["newsapi"]["day_count"] == 1
+        with pytest.raises(QuotaExceededError):
+            reloaded.acquire("newsapi")
+
+
+# ---------------------------------------------------------------------------
+# 4f. Merge mode
+# ---------------------------------------------------------------------------
+
+class TestMergeArticles:
+    def test_canonicalize_strips_tracking_and_amp(self):
+        variants = [
+            "https://www.reuters.com/business/apple-high/?utm_source=twitter&utm_medium=social",
+            "http://reuters.com/business/apple-high/amp/?fbclid=abc",
+            "https://amp.reuters.com/business/apple-high#comments",
+        ]
+        assert {canonicalize_url(u) for u in variants} == {"https://reuters.com/business/apple-high"}
+
+    def test_canonicalize_strips_only_leading_or_trailing_amp_segment(self):
+        assert canonicalize_url("https://example.com/amp/markets/story") == "https://example.com/markets/story"
+        assert canonicalize_url("https://example.com/markets/story/amp") == "https://example.com/markets/story"
+        # "amp" in the middle of a path is part of the article's address
+        assert canonicalize_url("https://example.com/energy/amp/grid-story") == "https://example.com/energy/amp/grid-story"
+        assert canonicalize_url("https://example.com/energy/amp/grid-story") != canonicalize_url(
+            "https://example.com/energy/grid-story"
+        )
+
+    def test_canonicalize_keeps_non_default_ports(self):
+        assert canonicalize_url("http://example.com:80/a") == "https://example.com/a"
+        assert canonicalize_url("https://example.com:443/a") == "https://example.com/a"
+        assert canonicalize_url("http://example.com:8080/a") == "https://example.com:8080/a"
+        assert canonicalize_url("http://example.com:8080/a") != canonicalize_url("http://example.com:9090/a")
+
+    def test_canonicalize_keeps_meaningful_query_sorted(self):
+        assert canonicalize_url("https://x.com/a?b=2&a=1&gclid=z") == "https://x.com/a?a=1&b=2"
+
+    def test_same_story_under_different_urls_is_removed(self):
+        newsdata = [{
+            "headline": "Apple hits all-time high as iPhone sales surge - Reuters",
+            "url": "https://www.reuters.com/apple?utm_source=newsdata",
+            "published_at": "2025-01-01 10:00:00",
+        }]
+        newsapi = [
+            {
+                "headline": "Apple hits all-time high as iPhone sales surge",
+                "url": "https://reuters.com/apple",
+                "published_at": "2025-01-01T10:00:00Z",
+            },
+            {
+                "headline": "Apple hits all-time high as iPhone sales surged",
+                "url": "https://syndicated.example.com/apple-story",
+                "published_at": "2025-01-01T11:00:00Z",
+            },
+            {
+                "headline": "Tesla recalls two million vehicles over Autopilot",
+                "url": "https://cnbc.com/tesla",
+                "published_at": "2025-01-02T08:00:00Z",
+            },
+        ]
+        merged = merge_articles([newsdata, newsapi])
+        assert [a["url"] for a in merged] == ["https://cnbc.com/tesla", newsdata[0]["url"]]
+
+    def test_sorted_newest_first_across_timestamp_formats(self):
+        merged = merge_articles([[SAMPLE_ARTICLES[0]], [SAMPLE_ARTICLES[1]], [{
+            "headline": "Something unrelated entirely", "url": "https://x.com/1", "published_at": "2025-01-01 15:00:00",
+        }]])
+        assert [a["published_at"] for a in merged] == [
+            "2025-01-02T09:00:00Z", "2025-01-01 15:00:00", "2025-01-01T12:00:00Z",
+        ]
+
+    def test_get_stock_news_merge_queries_all_providers(self):
+        p1 = MagicMock()
+        p1.fetch.return_value = [SAMPLE_ARTICLES[0]]
+        p2 = MagicMock()
+        p2.fetch.return_value = [SAMPLE_ARTICLES[1], SAMPLE_ARTICLES[0]]
+        with patch("news_tool._PROVIDERS", {"newsdata": p1, "newsapi": p2}):
+            results = get_stock_news(ticker="AAPL", company_name="Apple Inc", merge=True)
+        assert results == [SAMPLE_ARTICLES[1], SAMPLE_ARTICLES[0]]
+
+    def test_get_stock_news_merge_tolerates_one_failure(self):
+        p1 = MagicMock()
+        p1.fetch.side_effect = ProviderError("rate limited")
+        p2 = MagicMock()
+        p2.fetch.return_value = SAMPLE_ARTICLES
+        with patch("news_tool._PROVIDERS", {"newsdata": p1, "newsapi": p2}):
+            results = get_stock_news(ticker="AAPL", company_name="Apple Inc", merge=True, max_articles=1)
+        assert results == [SAMPLE_ARTICLES[1]]
+
+
+# ---------------------------------------------------------------------------
+# 4g. Pagination
+# ---------------------------------------------------------------------------
+
+def newsdata_page(start, count, next_page):
+    return {
+        "status": "success",
+        "nextPage": next_page,
+        "results": [
+            {"title": f"Story {i}", "link": f"https://n.io/{i}", "pubDate": f"2025-01-{31 - i:02d} 10:00:00"}
+            for i in range(start, start + count)
+        ],
+    }
+
+
+class TestIterStockNews:
+    def test_follows_newsdata_next_page_token(self):
+        pages = [newsdata_page(0, 10, "tok2"), newsdata_page(10, 10, "tok3"), newsdata_page(20, 5, None)]
+        with patch.dict(os.environ, {"NEWSDATA_API_KEY": "k"}):
+            with patch("news_tool._HTTP_SESSION.get") as mock_get:
+                mock_get.side_effect = [make_mock_response(200, p) for p in pages]
+                articles = list(iter_stock_news(ticker="AAPL", company_name="Apple Inc"))
+        assert len(articles) == 25
+        sent_pages = [c[1]["params"].get("page") for c in mock_get.call_args_list]
+        assert sent_pages == [None, "tok2", "tok3"]
+
+    def test_is_lazy(self):
+        with patch.dict(os.environ, {"NEWSDATA_API_KEY": "k"}):
+            with patch("news_tool._HTTP_SESSION.get") as mock_get:
+                mock_get.side_effect = [make_mock_response(200, newsdata_page(0, 10, "tok2"))]
+                it = iter_stock_news(ticker="AAPL", company_name="Apple Inc")
+                first = next(it)
+        assert first["headline"] == "Story 0"
+        assert mock_get.call_count == 1
+
+    def test_since_cutoff_stops_iteration(self):
+        since = datetime(2025, 1, 28, tzinfo=timezone.utc)
+        with patch.dict(os.environ, {"NEWSDATA_API_KEY": "k"}):
+            with patch("news_tool._HTTP_SESSION.get") as mock_get:
+                mock_get.side_effect = [make_mock_response(200, newsdata_page(0, 10, "tok2"))]
+                articles = list(iter_stock_news(ticker="AAPL", company_name="Apple Inc", since=since))
+        # Story 0..3 are dated Jan 31..28
+        assert [a["headline"] for a in articles] == ["Story 0", "Story 1", "Story 2", "Story 3"]
+
+    def test_max_articles_and_max_requests_budgets(self):
+        with patch.dict(os.environ, {"NEWSDATA_API_KEY": "k"}):
+            with patch("news_tool._HTTP_SESSION.get") as mock_get:
+                mock_get.side_effect = lambda *a, **kw: make_mock_response(200, newsdata_page(0, 10, "more"))
+                assert len(list(iter_stock_news(ticker="AAPL", company_name="Apple Inc", max_articles=15))) == 15
+                assert mock_get.call_count == 2
+                mock_get.reset_mock()
+                assert len(list(iter_stock_news(ticker="AAPL", company_name="Apple Inc", max_requests=3))) == 30
+                assert mock_get.call_count == 3
+
+    def test_newsapi_page_numbers_and_from_param(self):
+        def page(n):
+            return {
+                "status": "ok",
+                "totalResults": 150,
+                "articles": [
+                    {"title": f"P{n}-{i}", "url": f"https://a.org/{n}/{i}", "publishedAt": "2025-02-01T00:00:00Z"}
+                    for i in range(100 if n == 1 else 50)
+                ],
+            }
+
+        since = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        with patch.dict(os.environ, {"NEWSAPI_KEY": "k"}):
+            with patch("news_tool._HTTP_SESSION.get") as mock_get:
+                mock_get.side_effect = [make_mock_response(200, page(1)), make_mock_response(200, page(2))]
+                articles = list(iter_stock_news(ticker="TSLA", company_name="Tesla", providers=["newsapi"], since=since))
+        assert len(articles) == 150
+        params = [c[1]["params"] for c in mock_get.call_args_list]
+        assert [p["page"] for p in params] == [1, 2]
+        assert params[0]["pageSize"] == 100
+        assert params[0]["from"] == "2025-01-01T00:00:00"
+
+    def test_falls_back_when_first_page_fails(self):
+        with patch.dict(os.environ, {"NEWSDATA_API_KEY": "k", "NEWSAPI_KEY": "k"}):
+            with patch("news_tool._HTTP_SESSION.get") as mock_get:
+                mock_get.side_effect = [make_mock_response(429), make_mock_response(200, NEWSAPI_RESPONSE)]
+                articles = list(iter_stock_news(ticker="TSLA", company_name="Tesla"))
+        assert [a["headline"] for a in articles] == ["Tesla record delivery"]
+
+    def test_falls_back_when_first_page_is_empty(self):
+        with patch.dict(os.environ, {"NEWSDATA_API_KEY": "k", "NEWSAPI_KEY": "k"}):
+            with patch("news_tool._HTTP_SESSION.get") as mock_get:
+                mock_get.side_effect = [
+                    make_mock_response(200, newsdata_page(0, 0, None)),
+                    make_mock_response(200, NEWSAPI_RESPONSE),
+                ]
+                articles = list(iter_stock_news(ticker="TSLA", company_name="Tesla"))
+        assert [a["headline"] for a in articles] == ["Tesla record delivery"]
+
+    def test_raises_when_all_providers_fail(self):
+        with patch.dict(os.environ, {}, clear=True):
+            with pytest.raises(RuntimeError, match="All news providers failed"):
+                list(iter_stock_news(ticker="AAPL", company_name="Apple Inc"))
+
+
 # ---------------------------------------------------------------------------
 # 5. add_news_to_notebooklm
 # ---------------------------------------------------------------------------
@@ -359,6 +986,12 @@ def make_mock_mcp(existing_notebooks=None, notebook_id="nb-123", summary="Great
 
 
 class TestAddNewsToNotebooklm:
+    def setup_method(self):
+        configure_notebook_id_cache()
+        configure_source_ledger(":memory:")
+        configure_summary_cache()
+        configure_notebook_shards()
+
     def _run(self, coro):
         return asyncio.get_event_loop().run_until_complete(coro)
 
@@ -465,12 +1098,60 @@ class TestAddNewsToNotebooklm:
         result = self._run(add_news_to_notebooklm(SAMPLE_ARTICLES, "AAPL", "Apple Inc", client))
         assert "Plain string summary" in result
 
+    def test_sources_added_concurrently_up_to_limit(self):
+        client = make_mock_mcp()
+        in_flight = 0
+        peak = 0
+
+        async def slow_call(tool_name, args):
+            nonlocal in_flight, peak
+            if tool_name == "source_add":
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.05)
+                in_flight -= 1
+            return await make_mock_mcp().call_tool(tool_name, args)
+
+        client.call_tool = slow_call
+        articles = [dict(SAMPLE_ARTICLES[0], url=f"https://example.com/{i}") for i in range(10)]
+        start = time.perf_counter()
+        result = self._run(add_news_to_notebooklm(articles, "AAPL", "Apple Inc", client, concurrency=5))
+        elapsed = time.perf_counter() - start
+        assert peak == 5
+        assert elapsed < 0.4
+        assert "Sources (10 articles added)" in result
+
+    def test_slow_source_times_out_and_order_is_kept(self):
+        client = make_mock_mcp()
+
+        async def call(tool_name, args):
+            if tool_name == "source_add" and args["url"] == SAMPLE_ARTICLES[0]["url"]:
+                await asyncio.sleep(5)
+            if tool_name == "source_add" and args["url"] == "https://example.com/third":
+                await asyncio.sleep(0.02)
+            return await make_mock_mcp().call_tool(tool_name, args)
+
+        client.call_tool = call
+        third = dict(SAMPLE_ARTICLES[1], headline="Third story", url="https://example.com/third")
+        result = self._run(add_news_to_notebooklm(
+            SAMPLE_ARTICLES + [third], "AAPL", "Apple Inc", client, source_timeout=0.1,
+        ))
+        assert "Sources (2 articles added)" in result
+        assert SAMPLE_ARTICLES[0]["url"] not in result
+        assert result.index(SAMPLE_ARTICLES[1]["headline"]) < result.index("Third story")
+
 
 # ---------------------------------------------------------------------------
 # 6. delete_fiscaliq_notebook
 # ---------------------------------------------------------------------------
 
 class TestDeleteFiscaliqNotebook:
+    def setup_method(self):
+        configure_notebook_id_cache()
+        configure_source_ledger(":memory:")
+        configure_summary_cache()
+        configure_notebook_shards()
+
     def _run(self, coro):
         return asyncio.get_event_loop().run_until_complete(coro)
 
@@ -526,6 +1207,401 @@ class TestDeleteFiscaliqNotebook:
         assert delete_calls[0]["notebook_id"] == "nb-fiscal"
 
 
+# ---------------------------------------------------------------------------
+# 6b. Notebook id cache
+# ---------------------------------------------------------------------------
+
+class TestNotebookIdCache:
+    def setup_method(self):
+        configure_notebook_id_cache()
+        configure_source_ledger(":memory:")
+        configure_summary_cache()
+        configure_notebook_shards()
+
+    def _run(self, coro):
+        return asyncio.get_event_loop().run_until_complete(coro)
+
+    def _tracking_client(self, existing, calls, fail_ids=()):
+        client = MagicMock()
+
+        async def call_tool(tool_name, args):
+            calls.append((tool_name, dict(args)))
+            if args.get("notebook_id") in fail_ids:
+                raise Exception("notebook not found")
+            return await make_mock_mcp(existing_notebooks=existing).call_tool(tool_name, args)
+
+        client.call_tool = call_tool
+        return client
+
+    def test_second_call_skips_notebook_list(self):
+        existing = [{"title": FISCALIQ_NOTEBOOK_NAME, "id": "nb-1"}]
+        calls = []
+        client = self._tracking_client(existing, calls)
+        self._run(add_news_to_notebooklm(SAMPLE_ARTICLES, "AAPL", "Apple Inc", client))
+        self._run(add_news_to_notebooklm(SAMPLE_ARTICLES, "AAPL", "Apple Inc", client))
+        assert [c[0] for c in calls].count("notebook_list") == 1
+
+    def test_stale_cached_id_is_revalidated(self):
+        existing = [{"title": FISCALIQ_NOTEBOOK_NAME, "id": "nb-new"}]
+        configure_notebook_id_cache().set(FISCALIQ_NOTEBOOK_NAME, "nb-gone")
+        calls = []
+        client = self._tracking_client(existing, calls, fail_ids={"nb-gone"})
+        result = self._run(add_news_to_notebooklm(SAMPLE_ARTICLES, "AAPL", "Apple Inc", client))
+        assert "Sources (2 articles added)" in result
+        assert [c[0] for c in calls].count("notebook_list") == 1
+        query_ids = [c[1]["notebook_id"] for c in calls if c[0] == "notebook_query"]
+        assert query_ids == ["nb-new"]
+
+    def test_stale_cached_id_detected_by_failed_query(self):
+        existing = [{"title": FISCALIQ_NOTEBOOK_NAME, "id": "nb-new"}]
+        configure_notebook_id_cache().set(FISCALIQ_NOTEBOOK_NAME, "nb-gone")
+        calls = []
+        client = self._tracking_client(existing, calls, fail_ids={"nb-gone"})
+        result = self._run(add_news_to_notebooklm([], "AAPL", "Apple Inc", client))
+        assert "Great summary." in result
+
+    def test_transient_failure_with_same_id_keeps_ledger(self):
+        existing = [{"title": FISCALIQ_NOTEBOOK_NAME, "id": "nb-1"}]
+        calls = []
+        client = self._tracking_client(existing, calls)
+        self._run(add_news_to_notebooklm(SAMPLE_ARTICLES[:1], "AAPL", "Apple Inc", client))
+        calls.clear()
+
+        inner = client.call_tool
+        failed = []
+
+        async def flaky(tool_name, args):
+            if tool_name == "notebook_query" and not failed:
+                failed.append(True)
+                calls.append((tool_name, dict(args)))
+                raise Exception("transient")
+            return await inner(tool_name, args)
+
+        client.call_tool = flaky
+        result = self._run(add_news_to_notebooklm(SAMPLE_ARTICLES, "AAPL", "Apple Inc", client))
+        assert "Great summary." in result
+        added = [c[1]["url"] for c in calls if c[0] == "source_add"]
+        assert added == [SAMPLE_ARTICLES[1]["url"]]
+        assert [c[0] for c in calls].count("notebook_query") == 2
+
+    def test_delete_uses_cached_id_and_invalidates(self):
+        existing = [{"title": FISCALIQ_NOTEBOOK_NAME, "id": "nb-1"}]
+        calls = []
+        client = self._tracking_client(existing, calls)
+        self._run(add_news_to_notebooklm(SAMPLE_ARTICLES, "AAPL", "Apple Inc", client))
+        calls.clear()
+
+        assert self._run(delete_fiscaliq_notebook(client)) is True
+        assert calls == [("notebook_delete", {"notebook_id": "nb-1", "confirm": True})]
+
+        # Next summary must look the notebook up again
+        calls.clear()
+        self._run(add_news_to_notebooklm(SAMPLE_ARTICLES, "AAPL", "Apple Inc", client))
+        assert calls[0][0] == "notebook_list"
+
+    def test_persisted_id_survives_restart(self, tmp_path):
+        path = str(tmp_path / "notebooks.json")
+        configure_notebook_id_cache(path)
+        calls = []
+        client = self._tracking_client([{"title": FISCALIQ_NOTEBOOK_NAME, "id": "nb-1"}], calls)
+        self._run(add_news_to_notebooklm(SAMPLE_ARTICLES, "AAPL", "Apple Inc", client))
+
+        configure_notebook_id_cache(path)
+        calls.clear()
+        self._run(add_news_to_notebooklm(SAMPLE_ARTICLES, "AAPL", "Apple Inc", client))
+        assert "notebook_list" not in [c[0] for c in calls]
+
+
+# ---------------------------------------------------------------------------
+# 6c. Source ledger
+# ---------------------------------------------------------------------------
+
+class TestSourceLedger:
+    def setup_method(self):
+        configure_notebook_id_cache()
+        configure_source_ledger(":memory:")
+        configure_summary_cache()
+        configure_notebook_shards()
+
+    def _run(self, coro):
+        return asyncio.get_event_loop().run_until_complete(coro)
+
+    def _tracking_client(self, calls):
+        client = MagicMock()
+        mock = make_mock_mcp(existing_notebooks=[{"title": FISCALIQ_NOTEBOOK_NAME, "id": "nb-1"}])
+
+        async def call_tool(tool_name, args):
+            calls.append((tool_name, dict(args)))
+            return await mock.call_tool(tool_name, args)
+
+        client.call_tool = call_tool
+        return client
+
+    def test_repeat_call_skips_known_urls(self):
+        calls = []
+        client = self._tracking_client(calls)
+        self._run(add_news_to_notebooklm(SAMPLE_ARTICLES, "AAPL", "Apple Inc", client))
+        calls.clear()
+        result = self._run(add_news_to_notebooklm(SAMPLE_ARTICLES, "AAPL", "Apple Inc", client))
+        assert "source_add" not in [c[0] for c in calls]
+        assert "(2 already in the notebook, not re-added)" in result
+        assert "Great summary." in result
+
+    def test_only_new_urls_added(self):
+        calls = []
+        client = self._tracking_client(calls)
+        self._run(add_news_to_notebooklm(SAMPLE_ARTICLES[:1], "AAPL", "Apple Inc", client))
+        calls.clear()
+        self._run(add_news_to_notebooklm(SAMPLE_ARTICLES, "AAPL", "Apple Inc", client))
+        added = [c[1]["url"] for c in calls if c[0] == "source_add"]
+        assert added == [SAMPLE_ARTICLES[1]["url"]]
+
+    def test_urls_compared_canonically(self):
+        ledger = SourceLedger(":memory:")
+        ledger.add("nb-1", ["https://www.example.com/story?utm_source=x"])
+        assert ledger.contains("nb-1", "https://example.com/story")
+        assert not ledger.contains("nb-2", "https://example.com/story")
+
+    def test_bloom_filter_grows_past_capacity(self):
+        ledger = SourceLedger(":memory:", bloom_capacity=8)
+        urls = [f"https://example.com/{i}" for i in range(50)]
+        ledger.add("nb-1", urls)
+        assert all(ledger.contains("nb-1", u) for u in urls)
+        assert not ledger.contains("nb-1", "https://example.com/other")
+
+    def test_persists_across_restart(self, tmp_path):
+        path = str(tmp_path / "ledger.db")
+        configure_source_ledger(path).add("nb-1", [SAMPLE_ARTICLES[0]["url"]])
+        assert configure_source_ledger(path).contains("nb-1", SAMPLE_ARTICLES[0]["url"])
+
+    def test_default_ledger_is_on_disk(self, tmp_path, monkeypatch):
+        path = tmp_path / "sources.db"
+        monkeypatch.setenv("FISCALIQ_SOURCE_LEDGER", str(path))
+        SourceLedger().add("nb-1", [SAMPLE_ARTICLES[0]["url"]])
+        assert path.exists()
+        assert SourceLedger().contains("nb-1", SAMPLE_ARTICLES[0]["url"])
+
+    def test_delete_clears_ledger(self):
+        calls = []
+        client = self._tracking_client(calls)
+        self._run(add_news_to_notebooklm(SAMPLE_ARTICLES, "AAPL", "Apple Inc", client))
+        self._run(delete_fiscaliq_notebook(client))
+        calls.clear()
+        self._run(add_news_to_notebooklm(SAMPLE_ARTICLES, "AAPL", "Apple Inc", client))
+        assert [c[0] for c in calls].count("source_add") == 2
+
+
+# ---------------------------------------------------------------------------
+# 6d. Summary cache
+# ---------------------------------------------------------------------------
+
+class TestSummaryCache:
+    def setup_method(self):
+        configure_notebook_id_cache()
+        configure_source_ledger(":memory:")
+        configure_summary_cache()
+        configure_notebook_shards()
+
+    def _run(self, coro):
+        return asyncio.get_event_loop().run_until_complete(coro)
+
+    def _tracking_client(self, calls):
+        client = MagicMock()
+        mock = make_mock_mcp(existing_notebooks=[{"title": FISCALIQ_NOTEBOOK_NAME, "id": "nb-1"}])
+
+        async def call_tool(tool_name, args):
+            calls.append(tool_name)
+            return await mock.call_tool(tool_name, args)
+
+        client.call_tool = call_tool
+        return client
+
+    def test_unchanged_sources_reuse_summary(self):
+        calls = []
+        client = self._tracking_client(calls)
+        first = self._run(add_news_to_notebooklm(SAMPLE_ARTICLES, "AAPL", "Apple Inc", client))
+        calls.clear()
+        second = self._run(add_news_to_notebooklm(list(reversed(SAMPLE_ARTICLES)), "AAPL", "Apple Inc", client))
+        assert calls == []
+        assert "Great summary." in first and "Great summary." in second
+
+    def test_new_source_triggers_query(self):
+        calls = []
+        client = self._tracking_client(calls)
+        self._run(add_news_to_notebooklm(SAMPLE_ARTICLES[:1], "AAPL", "Apple Inc", client))
+        calls.clear()
+        self._run(add_news_to_notebooklm(SAMPLE_ARTICLES, "AAPL", "Apple Inc", client))
+        assert calls.count("notebook_query") == 1
+
+    def test_other_ticker_not_shared(self):
+        calls = []
+        client = self._tracking_client(calls)
+        self._run(add_news_to_notebooklm(SAMPLE_ARTICLES, "AAPL", "Apple Inc", client))
+        calls.clear()
+        self._run(add_news_to_notebooklm(SAMPLE_ARTICLES, "MSFT", "Microsoft", client))
+        assert calls.count("notebook_query") == 1
+
+    def test_expired_entry_requeries(self):
+        configure_summary_cache(ttl=0)
+        calls = []
+        client = self._tracking_client(calls)
+        self._run(add_news_to_notebooklm(SAMPLE_ARTICLES, "AAPL", "Apple Inc", client))
+        calls.clear()
+        with patch("news_tool.time.time", return_value=time.time() + 1):
+            self._run(add_news_to_notebooklm(SAMPLE_ARTICLES, "AAPL", "Apple Inc", client))
+        assert calls.count("notebook_query") == 1
+
+    def test_delete_invalidates_summaries(self):
+        calls = []
+        client = self._tracking_client(calls)
+        self._run(add_news_to_notebooklm(SAMPLE_ARTICLES, "AAPL", "Apple Inc", client))
+        self._run(delete_fiscaliq_notebook(client))
+        calls.clear()
+        self._run(add_news_to_notebooklm(SAMPLE_ARTICLES, "AAPL", "Apple Inc", client))
+        assert calls.count("notebook_query") == 1
+
+
+# ---------------------------------------------------------------------------
+# 6e. Notebook shards
+# ---------------------------------------------------------------------------
+
+def article(n):
+    return {"headline": f"Story {n}", "url": f"https://example.com/{n}", "source": "Example", "published_at": ""}
+
+
+class TestNotebookShards:
+    def setup_method(self):
+        configure_notebook_id_cache()
+        configure_source_ledger(":memory:")
+        configure_summary_cache()
+        configure_notebook_shards()
+        self.notebooks = []
+        self.calls = []
+        self.client = MagicMock()
+        self.client.call_tool = self._call_tool
+
+    async def _call_tool(self, tool_name, args):
+        self.calls.append((tool_name, dict(args)))
+        if tool_name == "notebook_list":
+            return {"notebooks": list(self.notebooks)}
+        if tool_name == "notebook_create":
+            nb = {"id": f"nb-{len(self.notebooks) + 1}", "title": args["title"]}
+            self.notebooks.append(nb)
+            return {"id": nb["id"]}
+        if tool_name == "source_add":
+            return {"status": "success", "source": {"id": "src-" + args["url"].rsplit("/", 1)[-1]}}
+        if tool_name == "notebook_delete":
+            self.notebooks = [nb for nb in self.notebooks if nb["id"] != args["notebook_id"]]
+        if tool_name == "notebook_query":
+            return {"answer": "Great summary."}
+        return {"status": "ok"}
+
+    def _run(self, coro):
+        return asyncio.get_event_loop().run_until_complete(coro)
+
+    def _add(self, articles, ticker="AAPL", at=None):
+        coro = add_news_to_notebooklm(articles, ticker, ticker, self.client)
+        if at is None:
+            return self._run(coro)
+        with patch("news_tool.time.time", return_value=at):
+            return self._run(coro)
+
+    def _deleted_sources(self):
+        return [c[1]["source_id"] for c in self.calls if c[0] == "source_delete"]
+
+    def test_single_policy_is_default(self):
+        self._add([article(1)], "AAPL")
+        self._add([article(2)], "MSFT")
+        assert [nb["title"] for nb in self.notebooks] == [FISCALIQ_NOTEBOOK_NAME]
+
+    def test_ticker_policy_one_notebook_per_ticker(self):
+        configure_notebook_shards("ticker")
+        self._add([article(1)], "AAPL")
+        self._add([article(2)], "msft")
+        assert [nb["title"] for nb in self.notebooks] == ["FiscalIQ - AAPL", "FiscalIQ - MSFT"]
+        assert notebook_registry(["AAPL", "MSFT", "TSLA"]) == {"AAPL": "nb-1", "MSFT": "nb-2", "TSLA": None}
+
+    def test_sector_policy_groups_tickers(self):
+        configure_notebook_shards("sector", sectors={"AAPL": "Technology", "MSFT": "Technology"})
+        self._add([article(1)], "AAPL")
+        self._add([article(2)], "MSFT")
+        self._add([article(3)], "XOM")
+        assert [nb["title"] for nb in self.notebooks] == ["FiscalIQ - Technology", "FiscalIQ - Other"]
+
+    def test_unknown_policy_rejected(self):
+        with pytest.raises(ValueError):
+            configure_notebook_shards("company")
+
+    def test_least_recently_used_sources_evicted_over_limit(self):
+        configure_notebook_shards("ticker", max_sources=2)
+        self._add([article(1), article(2)], at=1000.0)
+        self._add([article(2), article(3)], at=2000.0)
+        assert self._deleted_sources() == ["src-1"]
+
+        # Story 1 is gone from the ledger, so it can be added again
+        self.calls.clear()
+        self._add([article(1)], at=3000.0)
+        assert [c[1]["url"] for c in self.calls if c[0] == "source_add"] == [article(1)["url"]]
+
+    def test_batch_larger_than_limit_keeps_its_own_sources(self):
+        configure_notebook_shards("ticker", max_sources=2)
+        self._add([article(1)], at=1000.0)
+        self._add([article(2), article(3), article(4)], at=2000.0)
+        assert self._deleted_sources() == ["src-1"]
+
+    def test_sources_without_id_not_counted(self, capsys):
+        configure_notebook_shards("ticker", max_sources=2)
+        ledger = configure_source_ledger(":memory:")
+        self._add([article(1)], at=1000.0)
+        # Rows recorded before source ids were tracked can't be deleted
+        with patch("news_tool.time.time", return_value=500.0):
+            ledger.add(self.notebooks[0]["id"], ["https://example.com/legacy-1", "https://example.com/legacy-2"])
+        self._add([article(2)], at=2000.0)
+        assert self._deleted_sources() == []
+        self._add([article(3)], at=3000.0)
+        assert self._deleted_sources() == ["src-1"]
+        assert "Cannot evict" not in capsys.readouterr().out
+
+    def test_old_sources_evicted_by_age(self):
+        configure_notebook_shards("ticker", max_source_age=60)
+        self._add([article(1), article(2)], at=1000.0)
+        self._add([article(3)], at=1030.0)
+        assert self._deleted_sources() == []
+        self._add([article(4)], at=1070.0)
+        assert sorted(self._deleted_sources()) == ["src-1", "src-2"]
+
+    def test_eviction_invalidates_summaries(self):
+        configure_notebook_shards(max_sources=2)
+        self._add([article(1)], "AAPL", at=1000.0)
+        self._add([article(2)], "MSFT", at=2000.0)
+        self.calls.clear()
+        self._add([article(1)], "AAPL", at=3000.0)
+        assert [c[0] for c in self.calls].count("notebook_query") == 0
+
+        self._add([article(3)], "MSFT", at=4000.0)
+        assert self._deleted_sources() == ["src-2"]
+        self.calls.clear()
+        self._add([article(1)], "AAPL", at=5000.0)
+        assert [c[0] for c in self.calls] == ["notebook_query"]
+
+    def test_delete_single_ticker_shard(self):
+        configure_notebook_shards("ticker")
+        self._add([article(1)], "AAPL")
+        self._add([article(2)], "MSFT")
+        assert self._run(delete_fiscaliq_notebook(self.client, ticker="AAPL")) is True
+        assert [nb["title"] for nb in self.notebooks] == ["FiscalIQ - MSFT"]
+        assert notebook_registry(["AAPL"]) == {"AAPL": None}
+
+    def test_delete_all_shards(self):
+        configure_notebook_shards("ticker")
+        self.notebooks.append({"id": "nb-other", "title": "Recipes"})
+        self._add([article(1)], "AAPL")
+        self._add([article(2)], "MSFT")
+        assert self._run(delete_fiscaliq_notebook(self.client)) is True
+        assert [nb["title"] for nb in self.notebooks] == ["Recipes"]
+        assert self._run(delete_fiscaliq_notebook(self.client)) is False
+
+
 # ---------------------------------------------------------------------------
 # 7. Schema structure
 # ---------------------------------------------------------------------------
@@ -0,0 +1,140 @@
+"""
+Tests for portfolio_analytics.py
+
+Run:
+    python -m pytest test_portfolio_analytics.py -v
+"""
+
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import portfolio_analytics
+from portfolio_analytics import (
+    holdings_to_quantities,
+    compute_risk_metrics,
+    get_portfolio_metrics,
+    clear_metrics_cache,
+)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+DATES = pd.date_range("2025-01-01", periods=4, freq="D")
+
+PRICES = pd.DataFrame(
+    {
+        "AAPL": [100.0, 110.0, 99.0, 121.0],
+        "MSFT": [50.0, 50.0, 55.0, 55.0],
+    },
+    index=DATES,
+)
+
+HOLDINGS = [
+    {"symbol": "AAPL", "quantity": 1},
+    {"symbol": "MSFT", "quantity": 1},
+    {"symbol": "MSFT", "quantity": 1},
+]
+
+
+def setup_function():
+    clear_metrics_cache()
+
+
+# ---------------------------------------------------------------------------
+# holdings_to_quantities
+# ---------------------------------------------------------------------------
+
+def test_quantities_sum_duplicate_symbols():
+    qty = holdings_to_quantities(HOLDINGS, ["AAPL", "MSFT", "TSLA"])
+    assert qty.tolist() == [1.0, 2.0, 0.0]
+
+
+# ---------------------------------------------------------------------------
+# compute_risk_metrics
+# ---------------------------------------------------------------------------
+
+def test_metrics_match_per_symbol_reference():
+    m = compute_risk_metrics(HOLDINGS, PRICES)
+
+    assert m["symbols"] == ["AAPL", "MSFT"]
+    np.testing.assert_allclose(m["total_return"], [0.21, 0.10])
+    np.testing.assert_allclose(m["max_drawdown"], [-0.1, 0.0])
+
+    returns = PRICES.pct_change().dropna()
+    np.testing.assert_allclose(m["volatility"], returns.std().to_numpy() * np.sqrt(252))
+    np.testing.assert_allclose(m["correlation"], returns.corr().to_numpy())
+
+
+def test_portfolio_values_are_buy_and_hold():
+    m = compute_risk_metrics(HOLDINGS, PRICES)
+    # 1 AAPL + 2 MSFT: 200 -> 231
+    assert m["portfolio"]["value"] == pytest.approx(231.0)
+    assert m["portfolio"]["total_return"] == pytest.approx(0.155)
+    np.testing.assert_allclose(m["weights"], [121 / 231, 110 / 231])
+
+
+def test_beta_against_benchmark():
+    bench = PRICES["AAPL"] * 2
+    m = compute_risk_metrics(HOLDINGS, PRICES, benchmark=bench)
+    assert m["beta"][0] == pytest.approx(1.0)
+
+
+def test_requires_two_observations():
+    with pytest.raises(ValueError):
+        compute_risk_metrics(HOLDINGS, PRICES.iloc[:1])
+
+
+def test_requires_market_value():
+    with pytest.raises(ValueError):
+        compute_risk_metrics([{"symbol": "TSLA", "quantity": 5}], PRICES)
+
+
+# ---------------------------------------------------------------------------
+# get_portfolio_metrics cache
+# ---------------------------------------------------------------------------
+
+def computes():
+    return patch.object(portfolio_analytics, "compute_risk_metrics", wraps=portfolio_analytics.compute_risk_metrics)
+
+
+def test_cache_reused_until_new_prices_arrive():
+    with computes() as compute:
+        get_portfolio_metrics("p1", HOLDINGS, PRICES)
+        get_portfolio_metrics("p1", HOLDINGS, PRICES)
+        assert compute.call_count == 1
+
+        more = pd.concat([PRICES, pd.DataFrame({"AAPL": [130.0], "MSFT": [60.0]}, index=[DATES[-1] + pd.Timedelta(days=1)])])
+        refreshed = get_portfolio_metrics("p1", HOLDINGS, more)
+        assert compute.call_count == 2
+    assert refreshed["portfolio"]["value"] == pytest.approx(250.0)
+
+
+def test_cache_invalidated_when_a_close_is_restated():
+    with computes() as compute:
+        get_portfolio_metrics("p1", HOLDINGS, PRICES)
+        corrected = PRICES.copy()
+        corrected.loc[DATES[1], "AAPL"] = 105.0
+        get_portfolio_metrics("p1", HOLDINGS, corrected)
+        assert compute.call_count == 2
+
+
+def test_cache_invalidated_when_holdings_change():
+    with computes() as compute:
+        get_portfolio_metrics("p1", HOLDINGS, PRICES)
+        get_portfolio_metrics("p1", HOLDINGS[:1], PRICES)
+        assert compute.call_count == 2
+
+
+def test_cache_hits_return_copies():
+    first = get_portfolio_metrics("p1", HOLDINGS, PRICES)
+    value = first["portfolio"]["value"]
+    first["portfolio"]["value"] = -1.0
+    first["volatility"][:] = 0.0
+    second = get_portfolio_metrics("p1", HOLDINGS, PRICES)
+    assert second["portfolio"]["value"] == value
+    assert np.all(second["volatility"] > 0)
@@ -0,0 +1,286 @@
+"""
+Tests for price_stream.py
+
+Run:
+    python -m pytest test_price_stream.py -v
+"""
+
+import asyncio
+import json
+import os
+import time
+
+from price_stream import (
+    WS_CLOSE,
+    WS_PING,
+    WS_PONG,
+    WS_TEXT,
+    PriceHub,
+    PriceStreamServer,
+    encode_ws_frame,
+    read_ws_frame,
+    run_scraper_feed,
+)
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+def quote(ticker, price):
+    return {"ticker": ticker, "exchange": "NASDAQ", "price": price}
+
+
+# ---------------------------------------------------------------------------
+# Hub: filtering, coalescing, backpressure
+# ---------------------------------------------------------------------------
+
+class TestPriceHub:
+
+    def test_topic_filtering(self):
+        async def scenario():
+            hub = PriceHub(min_interval=0)
+            aapl = hub.subscribe(["aapl"])
+            everything = hub.subscribe()
+            hub.publish(quote("AAPL", 1.0))
+            hub.publish(quote("MSFT", 2.0))
+            return await aapl.next_batch(), await everything.next_batch()
+
+        aapl, everything = _run(scenario())
+        assert [q["ticker"] for q in aapl] == ["AAPL"]
+        assert sorted(q["ticker"] for q in everything) == ["AAPL", "MSFT"]
+
+    def test_rapid_updates_coalesce_to_latest(self):
+        async def scenario():
+            hub = PriceHub(min_interval=0)
+            sub = hub.subscribe(["AAPL", "MSFT"])
+            for price in (1.0, 2.0, 3.0):
+                hub.publish(quote("AAPL", price))
+            hub.publish(quote("MSFT", 9.0))
+            return sub, await sub.next_batch()
+
+        sub, batch = _run(scenario())
+        assert {q["ticker"]: q["price"] for q in batch} == {"AAPL": 3.0, "MSFT": 9.0}
+        assert sub.coalesced == 2
+
+    def test_min_interval_batches_bursts(self):
+        async def scenario():
+            hub = PriceHub(min_interval=0.1)
+            sub = hub.subscribe(["AAPL"])
+            hub.publish(quote("AAPL", 1.0))
+            first = await sub.next_batch()
+
+            async def burst():
+                for price in (2.0, 3.0, 4.0):
+                    hub.publish(quote("AAPL", price))
+                    await asyncio.sleep(0.01)
+
+            task = asyncio.create_task(burst())
+            second = await sub.next_batch()
+            await task
+            return first, second
+
+        first, second = _run(scenario())
+        assert [q["price"] for q in first] == [1.0]
+        assert [q["price"] for q in second] == [4.0]
+
+    def test_snapshot_and_dynamic_topics(self):
+        async def scenario():
+            hub = PriceHub(min_interval=0)
+            hub.publish(quote("AAPL", 1.0))
+            sub = hub.subscribe([])
+            hub.update(sub, add=["AAPL", "TSLA"])
+            snapshot = await sub.next_batch()
+            hub.update(sub, remove=["AAPL"])
+            hub.publish(quote("AAPL", 2.0))
+            hub.publish(quote("TSLA", 5.0))
+            return snapshot, await sub.next_batch()
+
+        snapshot, later = _run(scenario())
+        assert [q["price"] for q in snapshot] == [1.0]
+        assert [q["ticker"] for q in later] == ["TSLA"]
+
+    def test_stuck_subscriber_dropped(self):
+        async def scenario():
+            hub = PriceHub(min_interval=0, max_lag=0.05)
+            stuck = hub.subscribe(["AAPL"])
+            live = hub.subscribe(["AAPL"])
+            hub.publish(quote("AAPL", 1.0))
+            await live.next_batch()
+            await asyncio.sleep(0.1)
+            hub.publish(quote("AAPL", 2.0))
+            return hub, stuck, await live.next_batch()
+
+        hub, stuck, batch = _run(scenario())
+        assert stuck.closed
+        assert hub.stats()["dropped_subscribers"] == 1
+        assert hub.subscriber_count == 1
+        assert [q["price"] for q in batch] == [2.0]
+
+    def test_scraper_feed_publishes_quotes(self):
+        async def scenario():
+            hub = PriceHub(min_interval=0)
+            sub = hub.subscribe()
+            stop = asyncio.Event()
+
+            async def scrape(symbols):
+                stop.set()
+                return [
+                    {"ticker": "AAPL", "exchange": "NASDAQ", "price": 190.5, "price_text": "$190.50"},
+                    {"ticker": "MSFT", "exchange": "NASDAQ", "error": "price selector timeout"},
+                ]
+
+            await run_scraper_feed(hub, [("AAPL", "NASDAQ"), ("MSFT", "NASDAQ")], interval=0, scrape=scrape, stop=stop)
+            return await sub.next_batch()
+
+        batch = _run(scenario())
+        assert [(q["ticker"], q["price"]) for q in batch] == [("AAPL", 190.5)]
+        assert batch[0]["ts"] <= time.time()
+
+
+# ---------------------------------------------------------------------------
+# Server: SSE and WebSocket
+# ---------------------------------------------------------------------------
+
+async def open_stream(port, path):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    headers = await reader.readuntil(b"\r\n\r\n")
+    return reader, writer, headers
+
+
+async def open_websocket(port, path):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    key = "dGhlIHNhbXBsZSBub25jZQ=="
+    writer.write(
+        f"GET {path} HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+        f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n".encode()
+    )
+    headers = await reader.readuntil(b"\r\n\r\n")
+    return reader, writer, headers
+
+
+async def send_ws_json(writer, message):
+    writer.write(encode_ws_frame(WS_TEXT, json.dumps(message).encode(), mask=os.urandom(4)))
+    await writer.drain()
+
+
+class TestPriceStreamServer:
+
+    def test_sse_stream_filters_tickers(self):
+        async def scenario():
+            hub = PriceHub(min_interval=0)
+            server = PriceStreamServer(hub, port=0)
+            port = await server.start()
+            try:
+                reader, writer, headers = await open_stream(port, "/stream?tickers=AAPL")
+                while hub.subscriber_count == 0:
+                    await asyncio.sleep(0.01)
+                hub.publish(quote("MSFT", 1.0))
+                hub.publish(quote("AAPL", 2.0))
+                event = await asyncio.wait_for(reader.readuntil(b"\n\n"), 2)
+                writer.close()
+                while hub.subscriber_count:
+                    await asyncio.sleep(0.01)
+                return headers, event
+            finally:
+                await server.close()
+
+        headers, event = _run(scenario())
+        assert b"text/event-stream" in headers
+        name, data = event.decode().strip().split("\n")
+        assert name == "event: quotes"
+        assert [q["ticker"] for q in json.loads(data[len("data: "):])["quotes"]] == ["AAPL"]
+
+    def test_websocket_subscribe_ping_and_close(self):
+        async def scenario():
+            hub = PriceHub(min_interval=0)
+            hub.publish(quote("NVDA", 100.0))
+            server = PriceStreamServer(hub, port=0)
+            port = await server.start()
+            try:
+                reader, writer, headers = await open_websocket(port, "/ws")
+                await send_ws_json(writer, {"subscribe": ["NVDA", "TSLA"]})
+                snapshot = await asyncio.wait_for(read_ws_frame(reader), 2)
+                hub.publish(quote("TSLA", 250.0))
+                update = await asyncio.wait_for(read_ws_frame(reader), 2)
+
+                writer.write(encode_ws_frame(WS_PING, b"hi", mask=os.urandom(4)))
+                pong = await asyncio.wait_for(read_ws_frame(reader), 2)
+                writer.write(encode_ws_frame(WS_CLOSE, (1000).to_bytes(2, "big"), mask=os.urandom(4)))
+                close = await asyncio.wait_for(read_ws_frame(reader), 2)
+                return headers, snapshot, update, pong, close
+            finally:
+                await server.close()
+
+        headers, snapshot, update, pong, close = _run(scenario())
+        # RFC 6455 section 1.3 example key / accept pair
+        assert b"Sec-WebSocket-Accept: s3pPLMBiTxaQ9kYGzzhZRbK+xOo=" in headers
+        assert snapshot[1] == WS_TEXT
+        assert json.loads(snapshot[2])["quotes"][0]["price"] == 100.0
+        assert [(q["ticker"], q["price"]) for q in json.loads(update[2])["quotes"]] == [("TSLA", 250.0)]
+        assert pong == (True, WS_PONG, b"hi")
+        assert close[1] == WS_CLOSE
+
+    def test_websocket_subscribe_accepts_bare_string(self):
+        async def scenario():
+            hub = PriceHub(min_interval=0)
+            hub.publish(quote("AAPL", 100.0))
+            hub.publish(quote("A", 1.0))
+            server = PriceStreamServer(hub, port=0)
+            port = await server.start()
+            try:
+                reader, writer, _ = await open_websocket(port, "/ws")
+                await send_ws_json(writer, {"subscribe": "AAPL"})
+                snapshot = await asyncio.wait_for(read_ws_frame(reader), 2)
+                await send_ws_json(writer, {"subscribe": [42, None]})  # ignored, connection stays up
+                hub.publish(quote("AAPL", 101.0))
+                update = await asyncio.wait_for(read_ws_frame(reader), 2)
+                writer.close()
+                return snapshot, update
+            finally:
+                await server.close()
+
+        snapshot, update = _run(scenario())
+        assert [q["ticker"] for q in json.loads(snapshot[2])["quotes"]] == ["AAPL"]
+        assert [q["price"] for q in json.loads(update[2])["quotes"]] == [101.0]
+
+    def test_health_and_unknown_path(self):
+        async def scenario():
+            hub = PriceHub()
+            server = PriceStreamServer(hub, port=0)
+            port = await server.start()
+            try:
+                reader, writer, headers = await open_stream(port, "/health")
+                body = await reader.read()
+                _, _, missing = await open_stream(port, "/nope")
+                return body, missing
+            finally:
+                await server.close()
+
+        body, missing = _run(scenario())
+        assert json.loads(body)["subscribers"] == 0
+        assert missing.startswith(b"HTTP/1.1 404")
+
+    def test_client_that_stops_reading_is_dropped(self):
+        async def scenario():
+            hub = PriceHub(min_interval=0)
+            server = PriceStreamServer(hub, port=0, send_timeout=0.2, write_buffer=1024)
+            port = await server.start()
+            try:
+                reader, writer, _ = await open_stream(port, "/stream?tickers=AAPL")
+                writer.transport.pause_reading()  # never read again
+                while hub.subscriber_count == 0:
+                    await asyncio.sleep(0.01)
+                padding = "x" * 256 * 1024
+                deadline = time.monotonic() + 10
+                while hub.subscriber_count and time.monotonic() < deadline:
+                    hub.publish({**quote("AAPL", time.monotonic()), "note": padding})
+                    await asyncio.sleep(0.001)
+                return hub.stats()
+            finally:
+                await server.close()
+
+        stats = _run(scenario())
+        assert stats["subscribers"] == 0
+        assert stats["dropped_subscribers"] == 1
@@ -0,0 +1,126 @@
+"""
+Tests for tool_runtime.py
+
+Run:
+    python -m pytest test_tool_runtime.py -v
+"""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from tool_runtime import ToolRegistry, default_registry
+
+
+def _run(coro):
+    # A private loop: asyncio.run would unset the main thread's loop for other test modules.
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def schema(name):
+    return {"name": name, "description": name, "parameters": {"type": "object", "properties": {}}}
+
+
+def slow_sync(seconds, value=None):
+    time.sleep(seconds)
+    return value if value is not None else seconds
+
+
+async def slow_async(seconds, client=None):
+    await asyncio.sleep(seconds)
+    return {"slept": seconds, "client": client}
+
+
+def broken():
+    raise ValueError("bad input")
+
+
+@pytest.fixture
+def registry():
+    r = ToolRegistry(max_workers=4)
+    r.register(schema("slow_sync"), slow_sync)
+    r.register(schema("slow_async"), slow_async, client="bound-client")
+    r.register(schema("broken"), broken)
+    yield r
+    r.close()
+
+
+def test_schemas_and_names(registry):
+    assert registry.names() == ["slow_sync", "slow_async", "broken"]
+    assert [s["name"] for s in registry.schemas()] == registry.names()
+
+
+def test_batch_runs_sync_and_async_concurrently(registry):
+    calls = [
+        {"id": "1", "name": "slow_sync", "arguments": {"seconds": 0.3}},
+        {"id": "2", "name": "slow_sync", "arguments": '{"seconds": 0.3, "value": "ok"}'},
+        {"id": "3", "name": "slow_async", "input": {"seconds": 0.3}},
+    ]
+    start = time.perf_counter()
+    results = _run(registry.call_many(calls))
+    assert time.perf_counter() - start < 0.6  # serially 0.9s
+    assert [r["id"] for r in results] == ["1", "2", "3"]
+    assert [r["result"] for r in results] == [0.3, "ok", {"slept": 0.3, "client": "bound-client"}]
+    assert all(r["ok"] and r["latency_ms"] >= 300 for r in results)
+
+
+def test_errors_reported_per_call(registry):
+    results = _run(registry.call_many([
+        {"name": "broken", "arguments": {}},
+        {"name": "missing", "arguments": {}},
+        {"name": "slow_sync", "arguments": "{not json"},
+        {"name": "slow_sync", "arguments": {"seconds": 0}},
+    ]))
+    assert [r["ok"] for r in results] == [False, False, False, True]
+    assert results[0]["error"] == "ValueError: bad input"
+    assert "Unknown tool: missing" in results[1]["error"]
+    assert results[2]["error"].startswith("JSONDecodeError")
+
+
+def test_per_call_and_per_tool_timeouts(registry):
+    registry.register(schema("capped"), slow_async, timeout=0.05)
+    results = _run(registry.call_many([
+        {"name": "slow_async", "arguments": {"seconds": 1}, "timeout": 0.05},
+        {"name": "capped", "arguments": {"seconds": 1}},
+        {"name": "slow_async", "arguments": {"seconds": 0.01}},
+    ]))
+    assert [r["ok"] for r in results] == [False, False, True]
+    assert "timed out after 0.05s" in results[0]["error"]
+    assert results[1]["latency_ms"] < 500
+
+
+def test_tools_own_timeout_error_is_not_a_registry_timeout(registry):
+    async def upstream_timeout():
+        raise TimeoutError("upstream API timed out")
+
+    registry.register(schema("upstream"), upstream_timeout, timeout=5)
+    result = _run(registry.call("upstream"))
+    assert result["ok"] is False
+    assert result["error"] == "TimeoutError: upstream API timed out"
+    assert result["latency_ms"] < 1000
+
+
+def test_stats_records_latency(registry):
+    _run(registry.call_many([{"name": "slow_sync", "arguments": {"seconds": 0.01}}] * 3))
+    stats = registry.stats()["slow_sync"]
+    assert stats["calls"] == 3
+    assert 10 <= stats["p50_ms"] <= stats["max_ms"]
+
+
+def test_default_registry_dispatches_news_tools():
+    articles = [{"headline": "h", "url": "https://example.com/a"}]
+    registry = default_registry()
+    assert registry.names() == ["get_stock_news"]
+    with patch("news_tool.get_stock_news", return_value=articles):
+        registry = default_registry(mcp_client=object())
+    result = _run(registry.call("get_stock_news", {"ticker": "AAPL"}))
+    assert result == {"id": None, "name": "get_stock_news", "ok": True, "result": articles,
+                      "latency_ms": result["latency_ms"]}
+    assert registry.names() == ["get_stock_news", "add_news_to_notebooklm", "delete_fiscaliq_notebook"]
+    registry.close()
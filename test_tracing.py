@@ -0,0 +1,213 @@
+"""
+Tests for tracing.py and the spans emitted by news_tool.
+
+Run:
+    python -m pytest test_tracing.py -v
+"""
+
+import asyncio
+import io
+import json
+import os
+import pstats
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import tracing
+from tracing import InMemoryExporter, JsonLinesExporter, OtlpJsonExporter, configure_tracing, profiled, span, traced
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+@pytest.fixture
+def exporter():
+    e = configure_tracing(InMemoryExporter())
+    yield e
+    configure_tracing(None)
+
+
+def by_name(exporter):
+    return {s.name: s for s in exporter.spans}
+
+
+# ---------------------------------------------------------------------------
+# Spans
+# ---------------------------------------------------------------------------
+
+def test_disabled_tracing_is_noop():
+    configure_tracing(None)
+    with span("anything", a=1) as s:
+        s.set_attribute("b", 2)
+    assert not tracing.tracing_enabled()
+
+
+def test_nested_spans_share_trace(exporter):
+    with span("outer", ticker="AAPL"):
+        with span("inner") as inner:
+            inner.set_attribute("rows", 3)
+    spans = by_name(exporter)
+    assert [s.name for s in exporter.spans] == ["inner", "outer"]
+    assert spans["inner"].parent_id == spans["outer"].span_id
+    assert spans["inner"].trace_id == spans["outer"].trace_id
+    assert spans["outer"].parent_id is None
+    assert spans["inner"].attributes == {"rows": 3}
+    assert spans["outer"].duration_ms >= spans["inner"].duration_ms
+
+
+def test_error_recorded_and_reraised(exporter):
+    with pytest.raises(ValueError):
+        with span("failing"):
+            raise ValueError("boom")
+    assert exporter.spans[0].status == "error"
+    assert exporter.spans[0].error == "ValueError: boom"
+
+
+def test_async_tasks_nest_under_caller(exporter):
+    @traced("child")
+    async def child(n):
+        await asyncio.sleep(0.01 * n)
+
+    @traced("parent")
+    async def parent():
+        await asyncio.gather(child(1), child(2))
+
+    _run(parent())
+    parent_span = by_name(exporter)["parent"]
+    children = [s for s in exporter.spans if s.name == "child"]
+    assert len(children) == 2
+    assert all(c.parent_id == parent_span.span_id for c in children)
+
+
+def test_json_lines_exporter():
+    stream = io.StringIO()
+    configure_tracing(JsonLinesExporter(stream))
+    try:
+        with span("db.query", table="stocks"):
+            pass
+    finally:
+        configure_tracing(None)
+    record = json.loads(stream.getvalue())
+    assert record["name"] == "db.query"
+    assert record["attributes"] == {"table": "stocks"}
+    assert record["duration_ms"] >= 0
+
+
+def test_otlp_exporter_format():
+    stream = io.StringIO()
+    configure_tracing(OtlpJsonExporter(stream))
+    try:
+        with span("outer"):
+            with span("inner", count=2, ok=True, ratio=0.5, label="x"):
+                pass
+    finally:
+        configure_tracing(None)
+    inner, outer = [json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+                    for line in stream.getvalue().splitlines()]
+    assert inner["parentSpanId"] == outer["spanId"]
+    assert len(inner["traceId"]) == 32 and len(inner["spanId"]) == 16
+    assert int(inner["endTimeUnixNano"]) >= int(inner["startTimeUnixNano"])
+    assert {a["key"]: a["value"] for a in inner["attributes"]} == {
+        "count": {"intValue": "2"},
+        "ok": {"boolValue": True},
+        "ratio": {"doubleValue": 0.5},
+        "label": {"stringValue": "x"},
+    }
+
+
+# ---------------------------------------------------------------------------
+# news_tool instrumentation
+# ---------------------------------------------------------------------------
+
+def test_get_stock_news_spans(exporter):
+    import news_tool
+
+    resp = MagicMock(status_code=200, text="", headers={})
+    resp.json.return_value = {"status": "success", "results": [
+        {"title": "Apple Q4", "link": "https://example.com/a", "description": "", "pubDate": "", "source_id": "x"}
+    ]}
+    with patch.dict(os.environ, {"NEWSDATA_API_KEY": "k"}), patch("news_tool._HTTP_SESSION.get", return_value=resp):
+        news_tool.get_stock_news(ticker="AAPL", providers=["newsdata"], use_cache=False)
+
+    spans = by_name(exporter)
+    top = spans["news.get_stock_news"]
+    assert spans["news.resolve_inputs"].parent_id == top.span_id
+    http = spans["news.http"]
+    assert http.trace_id == top.trace_id
+    assert http.attributes["provider"] == "newsdata"
+    assert http.attributes["http.status_code"] == 200
+
+
+def test_mcp_call_spans(exporter):
+    import news_tool
+
+    news_tool.configure_notebook_id_cache()
+    news_tool.configure_source_ledger(":memory:")
+    news_tool.configure_summary_cache()
+    news_tool.configure_notebook_shards()
+    client = MagicMock()
+
+    async def call_tool(name, args):
+        return {"notebook_list": [], "notebook_create": {"id": "nb-1"}, "notebook_query": {"answer": "ok"}}.get(
+            name, {"status": "ok"})
+
+    client.call_tool = call_tool
+    articles = [{"headline": "h", "url": "https://example.com/a"}]
+    _run(news_tool.add_news_to_notebooklm(articles, "AAPL", "Apple Inc", client))
+
+    top = by_name(exporter)["notebooklm.add_news"]
+    tools = [s.attributes["tool"] for s in exporter.spans if s.name == "mcp.call_tool"]
+    assert tools == ["notebook_list", "notebook_create", "source_add", "notebook_query"]
+    assert all(s.trace_id == top.trace_id for s in exporter.spans)
+
+
+# ---------------------------------------------------------------------------
+# Profiling
+# ---------------------------------------------------------------------------
+
+def busy_loop(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(1000))
+
+
+def test_profiled_is_passthrough_without_env(monkeypatch):
+    monkeypatch.delenv("FISCALIQ_PROFILE", raising=False)
+    assert profiled(lambda: 42)() == 42
+
+
+def test_sampling_profile_writes_folded_stacks(monkeypatch, tmp_path):
+    path = tmp_path / "profile.folded"
+    monkeypatch.setenv("FISCALIQ_PROFILE", str(path))
+    monkeypatch.setenv("FISCALIQ_PROFILE_MODE", "sample")
+
+    @profiled
+    def main():
+        busy_loop(0.2)
+        return "done"
+
+    assert main() == "done"
+    lines = path.read_text().splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert any("busy_loop (test_tracing.py" in line for line in lines)
+
+
+def test_cprofile_mode_async_entry_point(monkeypatch, tmp_path):
+    path = tmp_path / "profile.pstats"
+    monkeypatch.setenv("FISCALIQ_PROFILE", str(path))
+    monkeypatch.setenv("FISCALIQ_PROFILE_MODE", "cprofile")
+
+    @profiled
+    async def main():
+        busy_loop(0.05)
+        await asyncio.sleep(0)
+        return 7
+
+    assert _run(main()) == 7
+    stats = pstats.Stats(str(path))
+    assert any(func[2] == "busy_loop" for func in stats.stats)
@@ -0,0 +1,177 @@
+import asyncio
+import functools
+import inspect
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+# ---------------------------------------------------------------------------
+# Tool registry / runtime
+# ---------------------------------------------------------------------------
+
+
+class ToolRegistry:
+    """
+    Maps tool schema names to Python callables and executes model tool calls.
+
+    Async tools run natively on the event loop; sync tools run in a shared
+    thread pool so they don't block it. call_many() runs a model's whole batch
+    of tool calls concurrently, each under its own timeout, and every call's
+    latency is recorded (see stats()).
+
+    A timed-out sync tool keeps running in its worker thread until it returns;
+    only its result is discarded.
+    """
+
+    def __init__(self, max_workers: int = 8, default_timeout: Optional[float] = 60):
+        self.default_timeout = default_timeout
+        self._tools: dict[str, dict] = {}
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool")
+        self._latencies: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        schema: dict,
+        func: Callable,
+        timeout: Optional[float] = None,
+        **bound_kwargs,
+    ) -> None:
+        """
+        Register func under schema["name"]. bound_kwargs are passed on every
+        call but are not part of the schema (e.g. mcp_client).
+        """
+        self._tools[schema["name"]] = {
+            "schema": schema,
+            "func": func,
+            "timeout": timeout,
+            "bound": bound_kwargs,
+            "is_async": inspect.iscoroutinefunction(func),
+        }
+
+    def names(self) -> list[str]:
+        return list(self._tools)
+
+    def schemas(self) -> list[dict]:
+        return [tool["schema"] for tool in self._tools.values()]
+
+    async def call(
+        self,
+        name: str,
+        arguments: Any = None,
+        call_id: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> dict:
+        """
+        Run one tool call. Never raises: returns
+        {"id", "name", "ok", "result" | "error", "latency_ms"}.
+        """
+        start = time.perf_counter()
+        outcome = {"id": call_id, "name": name}
+        try:
+            tool = self._tools.get(name)
+            if tool is None:
+                raise KeyError(f"Unknown tool: {name}")
+            if isinstance(arguments, str):
+                arguments = json.loads(arguments) if arguments.strip() else {}
+            kwargs = {**(arguments or {}), **tool["bound"]}
+            limit = timeout if timeout is not None else tool["timeout"]
+            if limit is None:
+                limit = self.default_timeout
+
+            if tool["is_async"]:
+                awaitable = tool["func"](**kwargs)
+            else:
+                loop = asyncio.get_running_loop()
+                awaitable = loop.run_in_executor(self._pool, functools.partial(tool["func"], **kwargs))
+            # asyncio.wait (not wait_for) so a TimeoutError raised by the tool
+            # itself is reported as that error, not as the registry's deadline.
+            task = asyncio.ensure_future(awaitable)
+            try:
+                done, _ = await asyncio.wait({task}, timeout=limit)
+            except asyncio.CancelledError:
+                task.cancel()
+                raise
+            if not done:
+                task.cancel()
+                outcome["ok"] = False
+                outcome["error"] = f"TimeoutError: {name} timed out after {limit}s"
+            else:
+                outcome["result"] = task.result()
+                outcome["ok"] = True
+        except Exception as e:
+            outcome["ok"] = False
+            outcome["error"] = f"{type(e).__name__}: {e}"
+
+        latency = time.perf_counter() - start
+        outcome["latency_ms"] = round(latency * 1000, 3)
+        with self._lock:
+            self._latencies.setdefault(name, []).append(latency)
+        return outcome
+
+    async def call_many(self, calls: list[dict]) -> list[dict]:
+        """
+        Run a batch of tool calls concurrently; results come back in input order.
+
+        Each call is a dict with "name" and "arguments" (a dict or a JSON
+        string, as in OpenAI tool calls) or "input" (as in Anthropic tool_use
+        blocks), plus an optional "id" and "timeout".
+        """
+        return await asyncio.gather(*(
+            self.call(
+                c.get("name"),
+                c.get("arguments", c.get("input")),
+                call_id=c.get("id"),
+                timeout=c.get("timeout"),
+            )
+            for c in calls
+        ))
+
+    def run_many(self, calls: list[dict]) -> list[dict]:
+        """Synchronous call_many for callers without an event loop."""
+        return asyncio.run(self.call_many(calls))
+
+    def stats(self) -> dict[str, dict]:
+        """Per-tool call count and latency (mean / p50 / p95 / max, milliseconds)."""
+        with self._lock:
+            latencies = {name: sorted(values) for name, values in self._latencies.items()}
+        out = {}
+        for name, values in latencies.items():
+            n = len(values)
+            out[name] = {
+                "calls": n,
+                "mean_ms": round(sum(values) / n * 1000, 3),
+                "p50_ms": round(values[(n - 1) // 2] * 1000, 3),
+                "p95_ms": round(values[min(n - 1, int(n * 0.95))] * 1000, 3),
+                "max_ms": round(values[-1] * 1000, 3),
+            }
+        return out
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def default_registry(mcp_client=None, **kwargs) -> ToolRegistry:
+    """
+    A registry with news_tool's tools. The NotebookLM tools are only
+    registered when an mcp_client is given (see mcp_client.StdioMcpClient).
+    """
+    import news_tool
+
+    registry = ToolRegistry(**kwargs)
+    registry.register(news_tool.GET_STOCK_NEWS_SCHEMA, news_tool.get_stock_news)
+    if mcp_client is not None:
+        registry.register(
+            news_tool.ADD_NEWS_TO_NOTEBOOKLM_SCHEMA,
+            news_tool.add_news_to_notebooklm,
+            timeout=600,
+            mcp_client=mcp_client,
+        )
+        registry.register(
+            news_tool.DELETE_FISCALIQ_NOTEBOOK_SCHEMA,
+            news_tool.delete_fiscaliq_notebook,
+            mcp_client=mcp_client,
+        )
+    return registry
@@ -0,0 +1,331 @@
+import contextvars
+import functools
+import inspect
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+# ---------------------------------------------------------------------------
+# Tracing spans
+# ---------------------------------------------------------------------------
+#
+# Off by default: span() costs one global check until an exporter is set,
+# either with configure_tracing() or the FISCALIQ_TRACE environment variable
+# (a file path; FISCALIQ_TRACE_FORMAT=otlp switches to OpenTelemetry JSON).
+
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "status", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: dict):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.status = "ok"
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        return None if self.end_ns is None else (self.end_ns - self.start_ns) / 1e6
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": self.duration_ms,
+            "attributes": self.attributes,
+            "status": self.status,
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    def set_attribute(self, key: str, value) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class InMemoryExporter:
+    """Keeps finished spans in a list (tests, ad-hoc inspection)."""
+
+    def __init__(self):
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def close(self) -> None:
+        pass
+
+
+class JsonLinesExporter:
+    """Appends one JSON object per finished span to a file (or any text stream)."""
+
+    def __init__(self, target):
+        self._owns = isinstance(target, str)
+        self._stream = open(target, "a", encoding="utf-8") if self._owns else target
+        self._lock = threading.Lock()
+
+    def _write(self, record: dict) -> None:
+        line = json.dumps(record, default=str)
+        with self._lock:
+            self._stream.write(line + "\n")
+            self._stream.flush()
+
+    def export(self, span: Span) -> None:
+        self._write(span.to_dict())
+
+    def close(self) -> None:
+        if self._owns:
+            self._stream.close()
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OtlpJsonExporter(JsonLinesExporter):
+    """
+    Writes each span as an OTLP/JSON ExportTraceServiceRequest line, which an
+    OpenTelemetry collector's file receiver (or otlp HTTP endpoint) accepts.
+    """
+
+    def __init__(self, target, service_name: str = "fiscaliq"):
+        super().__init__(target)
+        self.service_name = service_name
+
+    def export(self, span: Span) -> None:
+        otlp_span = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 1,
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in span.attributes.items()],
+            "status": {"code": 2, "message": span.error or ""} if span.status == "error" else {"code": 1},
+        }
+        if span.parent_id:
+            otlp_span["parentSpanId"] = span.parent_id
+        self._write({
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+                "scopeSpans": [{"scope": {"name": "fiscaliq.tracing"}, "spans": [otlp_span]}],
+            }]
+        })
+
+
+_EXPORTER = None
+_CURRENT: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("fiscaliq_span", default=None)
+
+
+def configure_tracing(exporter=None):
+    """Send finished spans to exporter (anything with export(span)); None turns tracing off."""
+    global _EXPORTER
+    previous, _EXPORTER = _EXPORTER, exporter
+    if previous is not None and previous is not exporter:
+        previous.close()
+    return exporter
+
+
+def configure_tracing_from_env() -> None:
+    path = os.getenv("FISCALIQ_TRACE")
+    if not path:
+        return
+    if os.getenv("FISCALIQ_TRACE_FORMAT", "").lower() == "otlp":
+        configure_tracing(OtlpJsonExporter(path))
+    else:
+        configure_tracing(JsonLinesExporter(path))
+
+
+def tracing_enabled() -> bool:
+    return _EXPORTER is not None
+
+
+def current_span() -> Optional[Span]:
+    return _CURRENT.get()
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    Time a block as a span nested under the current one (across awaits and
+    asyncio tasks). Exceptions mark the span as an error and propagate.
+    """
+    exporter = _EXPORTER
+    if exporter is None:
+        yield _NOOP_SPAN
+        return
+    parent = _CURRENT.get()
+    s = Span(name, parent.trace_id if parent else secrets.token_hex(16), parent.span_id if parent else None, attributes)
+    token = _CURRENT.set(s)
+    try:
+        yield s
+    except BaseException as e:
+        s.status = "error"
+        s.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        s.end_ns = time.time_ns()
+        _CURRENT.reset(token)
+        try:
+            exporter.export(s)
+        except Exception as e:
+            print(f"[tracing] Failed to export span {name}: {e}")
+
+
+def traced(name: Optional[str] = None):
+    """Decorator: run each call of a sync or async function inside span(name)."""
+    def decorate(func: Callable):
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorate
+
+
+# ---------------------------------------------------------------------------
+# Profiling
+# ---------------------------------------------------------------------------
+#
+# FISCALIQ_PROFILE=<path> runs an entry point wrapped by profiled() under a
+# profiler. FISCALIQ_PROFILE_MODE=sample (default) samples every thread's
+# stack and writes folded stacks ("a;b;c 42" lines) that flamegraph.pl,
+# speedscope and inferno render directly; FISCALIQ_PROFILE_MODE=cprofile
+# writes a pstats file (snakeviz, flameprof) instead.
+
+
+class SamplingProfiler:
+    """Samples the Python stacks of all other threads every `interval` seconds."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="fiscaliq-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def write_folded(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+@contextmanager
+def profile_session(path: str, mode: str = "sample"):
+    """Profile the enclosed block and write the report to path (see module notes for modes)."""
+    if mode == "cprofile":
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(path)
+            print(f"[tracing] cProfile stats written to {path}")
+        return
+
+    sampler = SamplingProfiler()
+    sampler.start()
+    try:
+        yield
+    finally:
+        sampler.stop()
+        sampler.write_folded(path)
+        print(f"[tracing] Folded stacks written to {path}")
+
+
+@contextmanager
+def _profile_from_env():
+    path = os.getenv("FISCALIQ_PROFILE")
+    if not path:
+        yield
+        return
+    with profile_session(path, os.getenv("FISCALIQ_PROFILE_MODE", "sample").lower()):
+        yield
+
+
+def profiled(func: Callable):
+    """
+    Decorator for entry points (main functions). Does nothing unless
+    FISCALIQ_PROFILE is set; then profiles each call and writes the report
+    to that path. Works on sync functions and coroutine functions.
+    """
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            with _profile_from_env():
+                return await func(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with _profile_from_env():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+configure_tracing_from_env()